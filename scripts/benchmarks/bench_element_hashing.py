@@ -0,0 +1,51 @@
+"""
+Micro-benchmark of the element hashing done by build_element_dict.
+
+    python -m scripts.benchmarks.bench_element_hashing [path/to/visible_elements_tree.json ...]
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Annotated, Callable, Optional
+
+import typer
+
+from scripts.benchmarks.element_trees import flatten_element_tree, load_or_generate_element_trees
+from skyvern.forge.sdk.api.crypto import calculate_sha256
+from skyvern.webeye.scraper.scraper import clean_element_before_hashing, hash_elements
+
+
+def legacy_hash_elements(elements: list[dict]) -> list[str]:
+    # the hashing before the single pass engine: deep copy, serialize and hash every element from scratch
+    return [calculate_sha256(json.dumps(clean_element_before_hashing(element), sort_keys=True)) for element in elements]
+
+
+def best_of(func: Callable[[list[dict]], list[str]], elements: list[dict], repeat: int) -> tuple[float, list[str]]:
+    best = float("inf")
+    result: list[str] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(elements)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(
+    paths: Annotated[Optional[list[Path]], typer.Argument()] = None,
+    repeat: int = 5,
+) -> None:
+    for name, element_tree in load_or_generate_element_trees(paths).items():
+        elements = flatten_element_tree(element_tree)
+        legacy_time, legacy_hashes = best_of(legacy_hash_elements, elements, repeat)
+        new_time, new_hashes = best_of(hash_elements, elements, repeat)
+        if legacy_hashes != new_hashes:
+            raise RuntimeError(f"hashes are different from the legacy hashing for {name}")
+        print(
+            f"{name}: {len(elements)} elements, legacy {legacy_time * 1000:.1f}ms, "
+            f"single pass {new_time * 1000:.1f}ms, speedup x{legacy_time / new_time:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,68 @@
+"""
+Micro-benchmark of interning the strings of the scraped elements: the memory held by the elements
+and the time of the element lookups done while trimming and hashing.
+
+    python -m scripts.benchmarks.bench_element_interning [path/to/visible_elements_tree.json ...]
+"""
+
+import copy
+import json
+import time
+from pathlib import Path
+from typing import Annotated, Optional
+
+import typer
+
+from scripts.benchmarks.element_trees import flatten_element_tree, load_or_generate_element_trees
+from skyvern.webeye.scraper.scraper import (
+    copy_element_tree,
+    estimate_memory_size,
+    hash_elements,
+    intern_element_strings,
+    trim_element_tree,
+)
+
+
+def decode_like_page(element_tree: list[dict]) -> list[dict]:
+    # the elements decoded from the page have a new string object for every key and every tag name
+    return json.loads(
+        json.dumps(element_tree),
+        object_pairs_hook=lambda pairs: {
+            "".join(list(key)): "".join(list(value)) if key == "tagName" else value for key, value in pairs
+        },
+    )
+
+
+def process(element_tree: list[dict], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        elements = flatten_element_tree(element_tree)
+        hash_elements(elements)
+        trim_element_tree(copy_element_tree(element_tree))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(
+    paths: Annotated[Optional[list[Path]], typer.Argument()] = None,
+    repeat: int = 5,
+) -> None:
+    for name, element_tree in load_or_generate_element_trees(paths).items():
+        decoded_tree = decode_like_page(element_tree)
+        interned_tree = copy.deepcopy(decoded_tree)
+        intern_element_strings(flatten_element_tree(interned_tree))
+
+        decoded_bytes, interned_bytes = (
+            estimate_memory_size(decoded_tree)[0],
+            estimate_memory_size(interned_tree)[0],
+        )
+        decoded_time, interned_time = process(decoded_tree, repeat), process(interned_tree, repeat)
+        print(
+            f"{name}: decoded {decoded_bytes / 1024 / 1024:.1f}MiB {decoded_time * 1000:.1f}ms, "
+            f"interned {interned_bytes / 1024 / 1024:.1f}MiB {interned_time * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
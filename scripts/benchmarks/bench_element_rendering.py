@@ -0,0 +1,85 @@
+"""
+Micro-benchmark of the HTML rendering done while building the prompt of a step:
+the trimmed tree, the economy tree and the 2/3 of the economy tree (see load_prompt_with_elements).
+
+    python -m scripts.benchmarks.bench_element_rendering [path/to/visible_elements_tree.json ...]
+"""
+
+import copy
+import time
+from pathlib import Path
+from typing import Annotated, Callable, Optional
+
+import typer
+
+from scripts.benchmarks.element_trees import load_or_generate_element_trees
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
+from skyvern.webeye.scraper.scraper import ElementHTMLRenderer, json_to_html, trim_element_tree
+
+
+def remove_svg(element: dict) -> dict | None:
+    # the economy tree before the copy-on-write processing: a deep copied tree without the svg elements
+    if element.get("tagName", "").lower() == "svg":
+        return None
+    element["children"] = [child for child in map(remove_svg, element.get("children", [])) if child]
+    return element
+
+
+def render_without_memo(element_tree: list[dict]) -> list[str]:
+    rendered = ["".join(json_to_html(element) for element in element_tree)]
+    economy_tree = [element for element in map(remove_svg, copy.deepcopy(element_tree)) if element]
+    for _ in range(2):
+        rendered.append("".join(json_to_html(element) for element in economy_tree))
+    return rendered
+
+
+def share_without_svg(element: dict) -> dict | None:
+    if element.get("tagName", "").lower() == "svg":
+        return None
+    children = element.get("children", [])
+    new_children = [child for child in map(share_without_svg, children) if child]
+    if len(new_children) != len(children) or any(new is not old for new, old in zip(new_children, children)):
+        return {**element, "children": new_children}
+    return element
+
+
+def render_with_memo(element_tree: list[dict]) -> list[str]:
+    renderer = ElementHTMLRenderer()
+    rendered = [renderer.render(element_tree)]
+    # the same shape as ScrapedPage._process_element_for_economy_tree, so the svg-free subtrees are shared
+    economy_tree = [element for element in map(share_without_svg, element_tree) if element]
+    for _ in range(2):
+        rendered.append(renderer.render(economy_tree))
+    return rendered
+
+
+def best_of(func: Callable[[list[dict]], list[str]], element_tree: list[dict], repeat: int) -> tuple[float, list[str]]:
+    best = float("inf")
+    result: list[str] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(element_tree)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(
+    paths: Annotated[Optional[list[Path]], typer.Argument()] = None,
+    repeat: int = 5,
+) -> None:
+    skyvern_context.set(SkyvernContext())
+    for name, element_tree in load_or_generate_element_trees(paths).items():
+        element_tree_trimmed = trim_element_tree(copy.deepcopy(element_tree))
+        legacy_time, legacy_html = best_of(render_without_memo, element_tree_trimmed, repeat)
+        new_time, new_html = best_of(render_with_memo, element_tree_trimmed, repeat)
+        if legacy_html != new_html:
+            raise RuntimeError(f"rendered html is different from the rendering without memo for {name}")
+        print(
+            f"{name}: {len(legacy_html[0])} chars, without memo {legacy_time * 1000:.1f}ms, "
+            f"memoized {new_time * 1000:.1f}ms, speedup x{legacy_time / new_time:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,65 @@
+"""
+Micro-benchmark of the element tree copies done by scrape_web_unsafe before the cleanup and the trimming,
+reporting the time, the peak allocation and the memory held by the elements and trees of a ScrapedPage.
+
+    python -m scripts.benchmarks.bench_element_tree_copy [path/to/visible_elements_tree.json ...]
+"""
+
+import copy
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Annotated, Callable, Optional
+
+import typer
+
+from scripts.benchmarks.element_trees import flatten_element_tree, load_or_generate_element_trees
+from skyvern.webeye.scraper.scraper import copy_element_tree, estimate_memory_size, trim_element_tree
+
+
+def cleanup(element_tree: list[dict]) -> list[dict]:
+    # the part of the cleanup done for every element: removing the rect
+    for element in flatten_element_tree(element_tree):
+        element.pop("rect", None)
+    return element_tree
+
+
+def build_trees(
+    copy_func: Callable[[list[dict]], list[dict]], element_tree: list[dict]
+) -> tuple[list[dict], list[dict]]:
+    cleaned_tree = cleanup(copy_func(element_tree))
+    return cleaned_tree, trim_element_tree(copy_func(cleaned_tree))
+
+
+def measure(copy_func: Callable[[list[dict]], list[dict]], element_tree: list[dict], repeat: int) -> str:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build_trees(copy_func, element_tree)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    cleaned_tree, trimmed_tree = build_trees(copy_func, element_tree)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    elements_bytes, tree_bytes, trimmed_bytes = estimate_memory_size(
+        flatten_element_tree(element_tree), cleaned_tree, trimmed_tree
+    )
+    return (
+        f"{best * 1000:.1f}ms, peak {peak / 1024 / 1024:.1f}MiB, elements {elements_bytes / 1024 / 1024:.1f}MiB "
+        f"+ element_tree {tree_bytes / 1024 / 1024:.1f}MiB + element_tree_trimmed {trimmed_bytes / 1024 / 1024:.1f}MiB"
+    )
+
+
+def main(
+    paths: Annotated[Optional[list[Path]], typer.Argument()] = None,
+    repeat: int = 5,
+) -> None:
+    for name, element_tree in load_or_generate_element_trees(paths).items():
+        print(f"{name} deepcopy: {measure(copy.deepcopy, element_tree, repeat)}")
+        print(f"{name} copy_element_tree: {measure(copy_element_tree, element_tree, repeat)}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
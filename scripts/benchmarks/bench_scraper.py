@@ -0,0 +1,288 @@
+"""
+Benchmark of scrape_website over a corpus of pages served from a local HTTP server to a headless Chromium.
+
+Reports the time of every scraping phase, the element and token counts and the peak Python memory of each page,
+the breakdown of the tree building time in domUtils.js (layout snapshot, visibility and interactability checks,
+element objects), and the share of the element tree building spent in getHoverStylesMap, on the first scraping of
+the document and on scraping it again with the cached hover styles map. Writes them to a JSON file, so the results
+can be diffed across commits.
+
+    python -m scripts.benchmarks.bench_scraper --output scraper_benchmark.json [--corpus path/to/saved/pages]
+
+The generated pages (see scraper_corpus.py) are always scraped. Saved .html/.mhtml pages in the --corpus directory
+are scraped as well.
+"""
+
+import asyncio
+import dataclasses
+import functools
+import inspect
+import json
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Annotated, Any, Callable, Optional
+from unittest import mock
+
+import typer
+from playwright.async_api import BrowserContext, Frame, Page, async_playwright
+
+from scripts.benchmarks.element_trees import flatten_element_tree
+from scripts.benchmarks.scraper_corpus import write_corpus
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
+from skyvern.utils.token_counter import count_tokens
+from skyvern.webeye.browser_factory import BrowserState
+from skyvern.webeye.scraper import scraper
+from skyvern.webeye.utils.page import ELEMENT_TREE_BUILD_TIMINGS, SkyvernFrame, add_dom_utils_init_script
+
+SAVED_PAGE_SUFFIXES = {".html", ".htm", ".mhtml", ".mht"}
+TREE_BUILD_PHASES = [
+    "layout_snapshot_ms",
+    "visibility_ms",
+    "interactability_ms",
+    "element_object_ms",
+    "total_ms",
+]
+
+
+class PhaseTimer:
+    """
+    Time the scraping phases by wrapping the functions scrape_web_unsafe calls.
+    Nested calls of the same phase (get_frame_text recursing into the child frames) are timed once.
+    """
+
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = defaultdict(float)
+        self._active: dict[str, int] = defaultdict(int)
+
+    def wrap(self, phase: str, func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if self._active[phase]:
+                    return await func(*args, **kwargs)
+                self._active[phase] += 1
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self.durations[phase] += time.perf_counter() - start
+                    self._active[phase] -= 1
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.durations[phase] += time.perf_counter() - start
+
+        return wrapper
+
+    def patch(self) -> ExitStack:
+        stack = ExitStack()
+        for phase, name in [
+            ("element_tree", "get_interactable_element_tree"),
+            ("trim", "trim_element_tree"),
+            ("hashing", "build_element_dict"),
+            ("frame_text", "get_frame_text"),
+        ]:
+            stack.enter_context(mock.patch.object(scraper, name, self.wrap(phase, getattr(scraper, name))))
+        stack.enter_context(
+            mock.patch.object(
+                SkyvernFrame,
+                "take_split_screenshots",
+                staticmethod(self.wrap("screenshots", SkyvernFrame.take_split_screenshots)),
+            )
+        )
+        stack.enter_context(
+            mock.patch.object(SkyvernFrame, "get_content", self.wrap("page_content", SkyvernFrame.get_content))
+        )
+        return stack
+
+    async def cleanup_element_tree(self, frame: Page | Frame, url: str, element_tree: list[dict]) -> list[dict]:
+        # the offline part of the agent cleanup: the svg and css shape conversions need the LLM
+        start = time.perf_counter()
+        for element in flatten_element_tree(element_tree):
+            element.pop("rect", None)
+        self.durations["cleanup"] += time.perf_counter() - start
+        return element_tree
+
+
+def serve_directory(directory: Path) -> ThreadingHTTPServer:
+    class Handler(SimpleHTTPRequestHandler):
+        extensions_map = {
+            **SimpleHTTPRequestHandler.extensions_map,
+            ".mhtml": "multipart/related",
+            ".mht": "multipart/related",
+        }
+
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, directory=str(directory), **kwargs)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def scrape(browser_state: BrowserState, url: str, timer: PhaseTimer) -> scraper.ScrapedPage:
+    with timer.patch():
+        return await scraper.scrape_website(
+            browser_state=browser_state,
+            url=url,
+            cleanup_element_tree=timer.cleanup_element_tree,
+            max_retries=0,
+        )
+
+
+async def hover_styles_duration(page: Page) -> float:
+    """
+    The total time getHoverStylesMap took in the documents of the page and its frames, in seconds.
+    """
+    duration_ms = 0.0
+    for frame in page.frames:
+        try:
+            duration_ms += await frame.evaluate(
+                "() => typeof DomUtils === 'undefined' ? 0 : DomUtils.hoverStylesMapStats.durationMs"
+            )
+        except Exception:
+            pass
+    return duration_ms / 1000
+
+
+def share(part: float, whole: float) -> float:
+    return round(part / whole, 3) if whole else 0.0
+
+
+async def benchmark_page(browser_state: BrowserState, page: Page, url: str, repeat: int) -> dict[str, Any]:
+    phase_runs: dict[str, list[float]] = defaultdict(list)
+    scraped_page = None
+    for _ in range(repeat):
+        await page.goto(url, wait_until="load")
+        timer = PhaseTimer()
+        tree_build_timings = dataclasses.replace(ELEMENT_TREE_BUILD_TIMINGS)
+        start = time.perf_counter()
+        scraped_page = await scrape(browser_state, url, timer)
+        timer.durations["total"] = time.perf_counter() - start
+        timer.durations["hover_styles"] = await hover_styles_duration(page)
+        # where the time of the tree building in domUtils.js goes, summed over the frames
+        for name in TREE_BUILD_PHASES:
+            spent_ms = getattr(ELEMENT_TREE_BUILD_TIMINGS, name) - getattr(tree_build_timings, name)
+            timer.durations[f"tree_build_{name.removesuffix('_ms')}"] = spent_ms / 1000
+
+        # scrape the same document again, the hover styles map is cached in the page until the stylesheets change
+        rescrape_timer = PhaseTimer()
+        await scrape(browser_state, url, rescrape_timer)
+        timer.durations["rescrape_element_tree"] = rescrape_timer.durations["element_tree"]
+        timer.durations["rescrape_hover_styles"] = await hover_styles_duration(page) - timer.durations["hover_styles"]
+        for phase, duration in timer.durations.items():
+            phase_runs[phase].append(duration * 1000)
+
+    # tracemalloc slows down the python code, so the memory is measured in a separate run
+    await page.goto(url, wait_until="load")
+    tracemalloc.start()
+    try:
+        await scrape(browser_state, url, PhaseTimer())
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert scraped_page is not None
+    element_tree_html = scraped_page.build_element_tree()
+    phases_ms = {phase: round(statistics.median(runs), 2) for phase, runs in sorted(phase_runs.items())}
+    return {
+        "phases_ms": phases_ms,
+        "hover_styles_share_of_element_tree": share(phases_ms["hover_styles"], phases_ms["element_tree"]),
+        "rescrape_hover_styles_share_of_element_tree": share(
+            phases_ms["rescrape_hover_styles"], phases_ms["rescrape_element_tree"]
+        ),
+        "element_count": len(scraped_page.elements),
+        "element_tree_html_length": len(element_tree_html),
+        "element_tree_token_count": count_tokens(element_tree_html),
+        "screenshot_count": len(scraped_page.screenshots),
+        "peak_python_memory_bytes": peak_memory,
+        "scraped_page_memory": scraped_page.estimate_memory_usage(),
+    }
+
+
+async def run_benchmark(
+    corpus_directory: Path, page_paths: list[str], repeat: int, browser_context: BrowserContext, pw: Any
+) -> dict[str, Any]:
+    server = serve_directory(corpus_directory)
+    results: dict[str, Any] = {}
+    try:
+        page = await browser_context.new_page()
+        browser_state = BrowserState(pw=pw, browser_context=browser_context, page=page)
+        for page_path in page_paths:
+            url = f"http://127.0.0.1:{server.server_address[1]}/{page_path}"
+            results[page_path] = await benchmark_page(browser_state, page, url, repeat)
+            print(f"{page_path}: {json.dumps(results[page_path]['phases_ms'])}")
+    finally:
+        server.shutdown()
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+async def main_async(corpus: Path | None, output: Path, repeat: int) -> None:
+    skyvern_context.set(SkyvernContext())
+    results: dict[str, Any] = {}
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=True)
+        browser_context = await browser.new_context(viewport={"width": 1920, "height": 1080})
+        await add_dom_utils_init_script(browser_context)
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                generated_pages = write_corpus(Path(directory))
+                results.update(await run_benchmark(Path(directory), generated_pages, repeat, browser_context, pw))
+
+            if corpus:
+                saved_pages = sorted(
+                    str(path.relative_to(corpus))
+                    for path in corpus.rglob("*")
+                    if path.suffix.lower() in SAVED_PAGE_SUFFIXES
+                )
+                results.update(await run_benchmark(corpus, saved_pages, repeat, browser_context, pw))
+        finally:
+            await browser.close()
+
+    report = {
+        "git_commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "repeat": repeat,
+        "pages": results,
+    }
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"results written to {output}")
+
+
+def main(
+    output: Annotated[Path, typer.Option()] = Path("scraper_benchmark.json"),
+    corpus: Annotated[Optional[Path], typer.Option(help="Directory of saved .html/.mhtml pages")] = None,
+    repeat: int = 3,
+) -> None:
+    asyncio.run(main_async(corpus, output, repeat))
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,159 @@
+"""
+Benchmark of the screenshot image pipeline on 1920x1080 multi-frame captures: merging the scrolling screenshots,
+resizing them for the CUA engines and encoding them in each output format, and how long the event loop is blocked.
+
+    python -m scripts.benchmarks.bench_screenshot_pipeline [--frames 10] [--repeat 3]
+"""
+
+import asyncio
+import functools
+import io
+import random
+import time
+from typing import Any, Callable
+
+import typer
+from PIL import Image, ImageDraw
+
+from skyvern.utils.image_resizer import (
+    DEFAULT_LOSSY_IMAGE_QUALITY,
+    ImageFormat,
+    Resolution,
+    get_resize_target_dimension,
+    resize_screenshots,
+)
+from skyvern.webeye.utils.page import _merge_images_by_position, _merge_screenshots
+
+VIEWPORT = Resolution(width=1920, height=1080)
+OVERLAP = 200
+
+
+def generate_page(frames: int) -> tuple[list[bytes], list[int]]:
+    # a page of text lines, inputs and images, so the compression ratio is close to a real page
+    rng = random.Random(0)
+    step = VIEWPORT["height"] - OVERLAP
+    page_height = VIEWPORT["height"] + step * (frames - 1)
+    page = Image.new("RGB", (VIEWPORT["width"], page_height), (255, 255, 255))
+    draw = ImageDraw.Draw(page)
+    y = 20
+    while y < page_height:
+        kind = rng.random()
+        if kind < 0.6:
+            for x in range(40, rng.randint(600, 1800), 9):
+                draw.text((x, y), rng.choice("abcdefghijklmnopqrstuvwxyz "), fill=(30, 30, 30))
+            y += 22
+        elif kind < 0.85:
+            draw.rectangle((40, y, 640, y + 36), outline=(120, 120, 120), width=1)
+            draw.text((50, y + 12), f"input {y}", fill=(90, 90, 90))
+            y += 56
+        else:
+            block = Image.effect_noise((rng.randint(200, 600), rng.randint(100, 300)), 60).convert("RGB")
+            page.paste(block, (rng.randint(40, 1200), y))
+            y += block.height + 20
+
+    screenshots: list[bytes] = []
+    positions = [step * index for index in range(frames)]
+    for position in positions:
+        buffer = io.BytesIO()
+        page.crop((0, position, VIEWPORT["width"], position + VIEWPORT["height"])).save(buffer, format="PNG")
+        screenshots.append(buffer.getvalue())
+    return screenshots, positions
+
+
+def legacy_merge(screenshots: list[bytes], positions: list[int]) -> bytes:
+    # take_scrolling_screenshot before the pipeline
+    images = []
+    for screenshot in screenshots:
+        with Image.open(io.BytesIO(screenshot)) as img:
+            img.load()
+            images.append(img)
+    buffer = io.BytesIO()
+    _merge_images_by_position(images, positions).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def legacy_resize(screenshots: list[bytes], target_dimension: Resolution) -> list[bytes]:
+    # resize_screenshots before the pipeline
+    new_screenshots = []
+    for screenshot in screenshots:
+        img = Image.open(io.BytesIO(screenshot))
+        resized_img = img.resize((target_dimension["width"], target_dimension["height"]), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        resized_img.save(buffer, format="PNG")
+        new_screenshots.append(buffer.getvalue())
+    return new_screenshots
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def output_size(result: bytes | list[bytes]) -> int:
+    return len(result) if isinstance(result, bytes) else sum(len(item) for item in result)
+
+
+async def max_loop_lag(func: Callable[[], Any], in_thread: bool) -> float:
+    """
+    The longest time the event loop couldn't run another task while func ran.
+    """
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0)
+            lags.append(time.perf_counter() - start)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    if in_thread:
+        await asyncio.to_thread(func)
+    else:
+        func()
+        await asyncio.sleep(0)
+    done.set()
+    await task
+    return max(lags, default=0.0)
+
+
+def main(frames: int = 10, repeat: int = 3, quality: int = DEFAULT_LOSSY_IMAGE_QUALITY) -> None:
+    screenshots, positions = generate_page(frames)
+    target_dimension = get_resize_target_dimension(VIEWPORT)
+    print(f"{frames} frames of {VIEWPORT['width']}x{VIEWPORT['height']}, resize target {target_dimension}")
+
+    cases: list[tuple[str, Callable[[], Any]]] = [
+        ("merge legacy png", lambda: legacy_merge(screenshots, positions)),
+        ("resize legacy png", lambda: legacy_resize(screenshots, target_dimension)),
+    ]
+    for image_format in ImageFormat:
+        cases.append(
+            (
+                f"merge {image_format}",
+                functools.partial(_merge_screenshots, screenshots, positions, image_format, quality),
+            )
+        )
+        cases.append(
+            (
+                f"resize {image_format}",
+                functools.partial(resize_screenshots, screenshots, target_dimension, image_format, quality),
+            )
+        )
+
+    for name, func in cases:
+        duration, result = best_of(func, repeat)
+        print(f"{name}: {duration * 1000:.1f}ms, {output_size(result) / 1024:.0f}KiB")
+
+    blocked = asyncio.run(max_loop_lag(lambda: legacy_merge(screenshots, positions), in_thread=False))
+    in_thread = asyncio.run(max_loop_lag(lambda: _merge_screenshots(screenshots, positions), in_thread=True))
+    print(f"event loop blocked by the merge: on the loop {blocked * 1000:.1f}ms, in a thread {in_thread * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,67 @@
+"""
+Micro-benchmark of the token counting of the rendered element trees, and calibration of the token estimate
+(ESTIMATED_CHARS_PER_TOKEN in skyvern/utils/token_counter.py).
+
+    python -m scripts.benchmarks.bench_token_counter [path/to/visible_elements_tree.json ...]
+"""
+
+import copy
+import time
+from pathlib import Path
+from typing import Annotated, Callable, Optional
+
+import tiktoken
+import typer
+
+from scripts.benchmarks.element_trees import load_or_generate_element_trees
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
+from skyvern.utils.token_counter import count_tokens, count_tokens_cached, estimate_tokens
+from skyvern.webeye.scraper.scraper import ElementHTMLRenderer, trim_element_tree
+
+
+def legacy_count_tokens(text: str) -> int:
+    # the token counting before the cached encoder
+    return len(tiktoken.encoding_for_model("gpt-4o").encode(text))
+
+
+def best_of(func: Callable[[str], int], text: str, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    result = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(
+    paths: Annotated[Optional[list[Path]], typer.Argument()] = None,
+    repeat: int = 5,
+) -> None:
+    skyvern_context.set(SkyvernContext())
+    total_chars = 0
+    total_tokens = 0
+    for name, element_tree in load_or_generate_element_trees(paths).items():
+        html = ElementHTMLRenderer().render(trim_element_tree(copy.deepcopy(element_tree)))
+        legacy_time, legacy_count = best_of(legacy_count_tokens, html, repeat)
+        new_time, new_count = best_of(count_tokens, html, repeat)
+        # the first call of best_of fills the cache
+        cached_time, _ = best_of(count_tokens_cached, html, repeat)
+        estimate_time, estimated_count = best_of(estimate_tokens, html, repeat)
+        if legacy_count != new_count:
+            raise RuntimeError(f"token count is different from the legacy count for {name}")
+
+        total_chars += len(html)
+        total_tokens += new_count
+        print(
+            f"{name}: {new_count} tokens, {len(html) / new_count:.2f} chars/token, "
+            f"estimate error {(estimated_count - new_count) / new_count:+.1%}, "
+            f"legacy {legacy_time * 1000:.1f}ms, count_tokens {new_time * 1000:.1f}ms, "
+            f"cached {cached_time * 1000:.3f}ms, estimate {estimate_time * 1000:.3f}ms"
+        )
+    print(f"overall: {total_chars / max(total_tokens, 1):.2f} chars/token")
+
+
+if __name__ == "__main__":
+    typer.run(main)
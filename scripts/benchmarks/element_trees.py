@@ -0,0 +1,76 @@
+"""
+Helpers to load the element trees used by the scraping micro-benchmarks.
+
+The recorded trees are the `visible_elements_tree` artifacts (ArtifactType.VISIBLE_ELEMENTS_TREE) saved for every step.
+When no recorded tree is given, a synthetic tree with a similar shape is generated.
+"""
+
+import json
+import random
+from pathlib import Path
+
+from skyvern.constants import SKYVERN_ID_ATTR
+
+
+def load_element_tree(path: Path) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def flatten_element_tree(element_tree: list[dict]) -> list[dict]:
+    """
+    Build the elements list from the tree, sharing the element objects with the tree as the scraper output does.
+    """
+    elements: list[dict] = []
+    queue = list(element_tree)
+    while queue:
+        element = queue.pop(0)
+        elements.append(element)
+        queue.extend(element.get("children", []))
+    return elements
+
+
+def generate_element_tree(num_roots: int = 50, max_depth: int = 8, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    counter = 0
+
+    def build(depth: int) -> dict:
+        nonlocal counter
+        counter += 1
+        element_id = f"A{counter:04d}"
+        tag_name = rng.choice(["div", "span", "a", "button", "input", "svg", "path", "td", "li"])
+        element = {
+            "id": element_id,
+            "frame": "main.frame",
+            "frame_index": 0,
+            "interactable": tag_name in ("a", "button", "input"),
+            "tagName": tag_name,
+            "attributes": {
+                SKYVERN_ID_ATTR: element_id,
+                "class": " ".join(rng.choice(["btn", "col-md-6", "nav-item", "icon", "active"]) for _ in range(3)),
+                "href": f"https://example.com/{'path/' * rng.randint(1, 20)}" if tag_name == "a" else "",
+                "aria-label": rng.choice(["", "Open menu", "Close", "Search"]),
+            },
+            "beforePseudoText": "",
+            "text": rng.choice(["", "Submit", "Lorem ipsum dolor sit amet", "$1,234.56", "Next page"]),
+            "afterPseudoText": "",
+            "children": [],
+            "purgeable": False,
+            "keepAllAttr": tag_name in ("svg", "path"),
+            "isSelectable": False,
+            "xpath": f"/html/body/div[{counter}]",
+        }
+        if depth < max_depth:
+            element["children"] = [build(depth + 1) for _ in range(rng.choice([0, 1, 1, 2, 3]))]
+        return element
+
+    return [build(0) for _ in range(num_roots)]
+
+
+def load_or_generate_element_trees(paths: list[Path] | None) -> dict[str, list[dict]]:
+    if paths:
+        return {str(path): load_element_tree(path) for path in paths}
+    return {
+        "synthetic-small": generate_element_tree(num_roots=20, max_depth=5),
+        "synthetic-large": generate_element_tree(num_roots=200, max_depth=10),
+    }
@@ -0,0 +1,120 @@
+"""
+Generated pages for the scraper benchmark, shaped like the pages that are slow to scrape in production:
+huge tables, many iframes, shadow DOM, infinite scroll, SVG-heavy icon sets and huge stylesheets.
+"""
+
+from pathlib import Path
+
+ICON_SVG = (
+    '<svg width="16" height="16" viewBox="0 0 16 16" aria-hidden="true">'
+    '<path d="M8 0a8 8 0 1 1 0 16A8 8 0 0 1 8 0zm0 3a1 1 0 0 0-1 1v3H4a1 1 0 0 0 0 2h3v3a1 1 0 0 0 2 0V9h3a1 1 0 '
+    '0 0 0-2H9V4a1 1 0 0 0-1-1z"/></svg>'
+)
+IFRAME_COUNT = 20
+
+
+def _page(title: str, body: str) -> str:
+    return f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{title}</title></head><body>{body}</body></html>"
+
+
+def huge_table(rows: int = 2000, columns: int = 8) -> str:
+    header = "".join(f"<th>Column {column}</th>" for column in range(columns))
+    body_rows = []
+    for row in range(rows):
+        cells = "".join(f"<td>row {row} cell {column}</td>" for column in range(columns - 2))
+        body_rows.append(
+            f"<tr>{cells}<td><input type='checkbox' name='select-{row}'></td>"
+            f"<td><a href='/details/{row}'>Details {row}</a></td></tr>"
+        )
+    return _page("huge table", f"<table><thead><tr>{header}</tr></thead><tbody>{''.join(body_rows)}</tbody></table>")
+
+
+def iframe_form(index: int) -> str:
+    return _page(
+        f"frame {index}",
+        f"<form><label for='name-{index}'>Name {index}</label><input id='name-{index}' name='name'>"
+        f"<select name='choice'><option>One</option><option>Two</option></select>"
+        f"<button type='submit'>Submit {index}</button></form>",
+    )
+
+
+def many_iframes(frames: int = IFRAME_COUNT) -> str:
+    iframes = "".join(
+        f"<iframe src='/frames/{index}.html' width='400' height='200' title='frame {index}'></iframe>"
+        for index in range(frames)
+    )
+    return _page("many iframes", f"<h1>Iframes</h1>{iframes}")
+
+
+def shadow_dom(hosts: int = 300) -> str:
+    script = """
+    customElements.define("shadow-card", class extends HTMLElement {
+      connectedCallback() {
+        const root = this.attachShadow({ mode: "open" });
+        const index = this.getAttribute("index");
+        root.innerHTML =
+          `<div><p>Card ${index}</p><input placeholder="Value ${index}"><button>Save ${index}</button></div>`;
+      }
+    });
+    """
+    cards = "".join(f"<shadow-card index='{index}'></shadow-card>" for index in range(hosts))
+    return _page("shadow dom", f"{cards}<script>{script}</script>")
+
+
+def infinite_scroll(initial_items: int = 200, batch: int = 50) -> str:
+    script = f"""
+    let count = 0;
+    const list = document.getElementById("feed");
+    function addItems(number) {{
+      for (let i = 0; i < number; i++, count++) {{
+        const item = document.createElement("li");
+        item.innerHTML = `<span>Item ${{count}}</span> <button>Like ${{count}}</button>`;
+        list.appendChild(item);
+      }}
+    }}
+    addItems({initial_items});
+    window.addEventListener("scroll", () => {{
+      if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 200) {{
+        addItems({batch});
+      }}
+    }});
+    """
+    return _page("infinite scroll", f"<ul id='feed'></ul><script>{script}</script>")
+
+
+def svg_icons(buttons: int = 1000) -> str:
+    toolbar = "".join(f"<button title='Action {index}'>{ICON_SVG}</button>" for index in range(buttons))
+    return _page("svg icons", f"<nav>{toolbar}</nav>")
+
+
+def css_heavy(rules: int = 20000, cards: int = 300) -> str:
+    # utility class frameworks ship tens of thousands of rules, a part of them with :hover variants
+    styles = "".join(
+        f".u-{index}{{margin:{index % 16}px}}.u-{index}:hover{{cursor:pointer;color:#{index % 4096:03x}}}"
+        if index % 10 == 0
+        else f".u-{index}{{margin:{index % 16}px;padding:{index % 8}px}}"
+        for index in range(rules)
+    )
+    body = "".join(f"<div class='card u-{index * 10}'><span>Card {index}</span></div>" for index in range(cards))
+    return _page("css heavy", f"<style>{styles}</style>{body}")
+
+
+def write_corpus(directory: Path) -> list[str]:
+    """
+    Write the generated pages into the directory.
+    :return: the paths of the pages to scrape, relative to the directory.
+    """
+    pages = {
+        "huge_table.html": huge_table(),
+        "many_iframes.html": many_iframes(),
+        "shadow_dom.html": shadow_dom(),
+        "infinite_scroll.html": infinite_scroll(),
+        "svg_icons.html": svg_icons(),
+        "css_heavy.html": css_heavy(),
+    }
+    (directory / "frames").mkdir(parents=True, exist_ok=True)
+    for index in range(IFRAME_COUNT):
+        (directory / "frames" / f"{index}.html").write_text(iframe_form(index), encoding="utf-8")
+    for name, content in pages.items():
+        (directory / name).write_text(content, encoding="utf-8")
+    return list(pages)
@@ -41,8 +41,38 @@ class Settings(BaseSettings):
     TEMP_PATH: str = "./temp"
     BROWSER_ACTION_TIMEOUT_MS: int = 5000
     BROWSER_SCREENSHOT_TIMEOUT_MS: int = 20000
+    # take the scrolling screenshots in one capture beyond the viewport, and slice it into viewport-sized screenshots.
+    # pages with virtualized lists or large fixed overlays still scroll and take a screenshot per viewport
+    BROWSER_SCREENSHOT_SINGLE_CAPTURE: bool = True
+    # draw the bounding boxes on the clean screenshots in python, instead of adding them to the DOM before capturing.
+    # the scrolling screenshots of the pages which can't be taken in one capture still draw them in the DOM
+    BROWSER_SCREENSHOT_DRAW_BOXES_IN_PYTHON: bool = True
+    # reuse the scraped page of the last step when the page fingerprint from domUtils.js is unchanged
+    BROWSER_SCRAPE_REUSE_UNCHANGED_PAGE: bool = True
     BROWSER_LOADING_TIMEOUT_MS: int = 90000
+    # the DOM is settled when the incremental observer sees no mutation in the quiet window, no finite animation is
+    # running and the new elements are parsed. the wait for it returns as soon as the page is stable, or at the timeout
+    BROWSER_DOM_SETTLE_QUIET_MS: int = 100
+    BROWSER_DOM_SETTLE_TIMEOUT_MS: int = 3000
+    # after every action, wait until the requests started by the action finished and the DOM is quiet, at most the
+    # timeout. when it's disabled, sleep for a random 0.5-1 second instead
+    BROWSER_ACTION_SETTLE_ENABLED: bool = True
+    BROWSER_ACTION_SETTLE_QUIET_MS: int = 200
+    BROWSER_ACTION_SETTLE_TIMEOUT_MS: int = 3000
+    # the requests in flight for longer than this (long polls, beacons, chat widget polls) don't block the settling
+    BROWSER_ACTION_SETTLE_MAX_REQUEST_MS: int = 1000
+    # the consecutive text inputs to plain text fields are filled in one page round trip instead of typing them one by
+    # one. the inputs that can't be filled that way (e.g. masked ones) are typed as usual
+    BROWSER_BATCH_INPUT_ENABLED: bool = True
     BROWSER_SCRAPING_BUILDING_ELEMENT_TREE_TIMEOUT_MS: int = 60 * 1000  # 1 minute
+    # max number of iframes scraped at the same time, and the max time to scrape a single iframe
+    BROWSER_SCRAPING_FRAME_CONCURRENCY: int = 5
+    BROWSER_SCRAPING_FRAME_TIMEOUT_MS: int = 30 * 1000  # 30 seconds
+    # how domUtils.js gets into the frames. options: "context", "frame"
+    # "context": register it once as a browser context init script, and only re-inject it when the version sentinel
+    #            in the frame is missing (e.g. the page was opened before the init script was registered)
+    # "frame": evaluate the whole script every time a SkyvernFrame is created
+    DOM_UTILS_INJECTION_MODE: str = "context"
     OPTION_LOADING_TIMEOUT_MS: int = 600000
     MAX_STEPS_PER_RUN: int = 10
     MAX_STEPS_PER_TASK_V2: int = 25
@@ -86,6 +116,16 @@ class Settings(BaseSettings):
     # Artifact storage settings
     ARTIFACT_STORAGE_PATH: str = f"{SKYVERN_DIR}/artifacts"
     GENERATE_PRESIGNED_URLS: bool = False
+    # the artifacts captured after the actions are stored in the background, at most ARTIFACT_CAPTURE_CONCURRENCY at the
+    # same time. when ARTIFACT_CAPTURE_MAX_PENDING captures are pending, the droppable ones are dropped and the others
+    # wait for room. when it's disabled, they're stored before the next action runs
+    ARTIFACT_CAPTURE_BACKGROUND_ENABLED: bool = True
+    ARTIFACT_CAPTURE_MAX_PENDING: int = 20
+    ARTIFACT_CAPTURE_CONCURRENCY: int = 2
+    # the video recording is uploaded in chunks: the bytes appended since the last upload are uploaded after the actions
+    # (S3 multipart upload parts, appended to the file in the local storage) and it's completed at the cleanup. when
+    # it's disabled, the whole recording is uploaded again after every action
+    ARTIFACT_RECORDING_CHUNKED_UPLOAD_ENABLED: bool = True
     AWS_S3_BUCKET_ARTIFACTS: str = "skyvern-artifacts"
     AWS_S3_BUCKET_SCREENSHOTS: str = "skyvern-screenshots"
     AWS_S3_BUCKET_BROWSER_SESSIONS: str = "skyvern-browser-sessions"
@@ -165,6 +205,11 @@ class Settings(BaseSettings):
     LLM_CONFIG_TEMPERATURE: float = 0
     LLM_CONFIG_SUPPORT_VISION: bool = True  # Whether the model supports vision
     LLM_CONFIG_ADD_ASSISTANT_PREFIX: bool = False  # Whether to add assistant prefix
+    # The default image policy of the screenshots sent to the LLMs, see LLMImagePolicy
+    LLM_CONFIG_IMAGE_MAX_EDGE: int | None = None  # Downscale the screenshots whose longer edge is larger
+    LLM_CONFIG_IMAGE_FORMAT: str = "png"  # png, jpeg or webp
+    LLM_CONFIG_IMAGE_QUALITY: int = 80  # The quality of jpeg and webp
+    LLM_CONFIG_IMAGE_GRAYSCALE: bool = False
     # LLM PROVIDER SPECIFIC
     ENABLE_OPENAI: bool = False
     ENABLE_ANTHROPIC: bool = False
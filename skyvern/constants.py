@@ -8,6 +8,7 @@ REPO_ROOT_DIR = SKYVERN_DIR.parent
 
 INPUT_TEXT_TIMEOUT = 120000  # 2 minutes
 PAGE_CONTENT_TIMEOUT = 300  # 5 mins
+DOM_FINGERPRINT_TIMEOUT = 5  # 5 seconds
 BROWSER_CLOSE_TIMEOUT = 180  # 3 minute
 BROWSER_DOWNLOAD_MAX_WAIT_TIME = 120  # 2 minute
 BROWSER_DOWNLOAD_TIMEOUT = 600  # 10 minute
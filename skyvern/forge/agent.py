@@ -1,10 +1,12 @@
 import asyncio
 import base64
+import functools
 import json
 import os
 import random
 import re
 import string
+import time
 from asyncio.exceptions import CancelledError
 from dataclasses import dataclass
 from datetime import UTC, datetime
@@ -80,6 +82,7 @@ from skyvern.forge.sdk.artifact.models import ArtifactType
 from skyvern.forge.sdk.core import skyvern_context
 from skyvern.forge.sdk.core.security import generate_skyvern_webhook_signature
 from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
+from skyvern.forge.sdk.core.step_profiler import finish_step_profiler, profile_phase, start_step_profiler
 from skyvern.forge.sdk.db.enums import TaskType
 from skyvern.forge.sdk.log_artifacts import save_step_logs, save_task_logs
 from skyvern.forge.sdk.models import SpeculativeLLMMetadata, Step, StepStatus
@@ -116,7 +119,7 @@ from skyvern.webeye.actions.actions import (
     TerminateAction,
     WebAction,
 )
-from skyvern.webeye.actions.handler import ActionHandler
+from skyvern.webeye.actions.handler import ActionHandler, fill_input_text_actions_in_batch
 from skyvern.webeye.actions.models import DetailedAgentStepOutput
 from skyvern.webeye.actions.parse_actions import (
     parse_actions,
@@ -126,8 +129,15 @@ from skyvern.webeye.actions.parse_actions import (
 )
 from skyvern.webeye.actions.responses import ActionResult, ActionSuccess
 from skyvern.webeye.browser_factory import BrowserState
-from skyvern.webeye.scraper.scraper import ElementTreeFormat, ScrapedPage, scrape_website
-from skyvern.webeye.utils.page import SkyvernFrame
+from skyvern.webeye.scraper.scraper import (
+    SCRAPED_PAGE_REUSE_STATS,
+    ElementTreeFormat,
+    ScrapedPage,
+    get_page_fingerprint,
+    scrape_website,
+)
+from skyvern.webeye.utils.page import PageContentSnapshot, SkyvernFrame
+from skyvern.webeye.utils.page_settle import wait_for_page_settled
 
 LOG = structlog.get_logger()
 
@@ -1115,11 +1125,13 @@ class ForgeAgent:
             context = skyvern_context.current()
             if context:
                 context.step_id = step.step_id
+            start_step_profiler(step.step_id)
 
             step = await self.update_step(step=step, status=StepStatus.running)
-            await app.AGENT_FUNCTION.prepare_step_execution(
-                organization=organization, task=task, step=step, browser_state=browser_state
-            )
+            with profile_phase("prepare_step"):
+                await app.AGENT_FUNCTION.prepare_step_execution(
+                    organization=organization, task=task, step=step, browser_state=browser_state
+                )
 
             speculative_plan: SpeculativePlan | None = None
             reuse_speculative_llm_response = False
@@ -1153,34 +1165,37 @@ class ForgeAgent:
             actions: list[Action]
 
             if engine == RunEngine.openai_cua:
-                actions, new_cua_response = await self._generate_cua_actions(
-                    task=task,
-                    step=step,
-                    scraped_page=scraped_page,
-                    previous_response=cua_response,
-                    engine=engine,
-                )
+                with profile_phase("llm"):
+                    actions, new_cua_response = await self._generate_cua_actions(
+                        task=task,
+                        step=step,
+                        scraped_page=scraped_page,
+                        previous_response=cua_response,
+                        engine=engine,
+                    )
                 detailed_agent_step_output.cua_response = new_cua_response
             elif engine == RunEngine.anthropic_cua:
                 assert llm_caller is not None
-                actions = await self._generate_anthropic_actions(
-                    task=task,
-                    step=step,
-                    scraped_page=scraped_page,
-                    llm_caller=llm_caller,
-                )
+                with profile_phase("llm"):
+                    actions = await self._generate_anthropic_actions(
+                        task=task,
+                        step=step,
+                        scraped_page=scraped_page,
+                        llm_caller=llm_caller,
+                    )
             elif engine == RunEngine.ui_tars and not await app.EXPERIMENTATION_PROVIDER.is_feature_enabled_cached(
                 "DISABLE_UI_TARS_CUA",
                 task.workflow_run_id or task.task_id,
                 properties={"organization_id": task.organization_id},
             ):
                 assert llm_caller is not None
-                actions = await self._generate_ui_tars_actions(
-                    task=task,
-                    step=step,
-                    scraped_page=scraped_page,
-                    llm_caller=llm_caller,
-                )
+                with profile_phase("llm"):
+                    actions = await self._generate_ui_tars_actions(
+                        task=task,
+                        step=step,
+                        scraped_page=scraped_page,
+                        llm_caller=llm_caller,
+                    )
 
             else:
                 if not task.navigation_goal and not isinstance(task_block, ValidationBlock):
@@ -1202,12 +1217,13 @@ class ForgeAgent:
                             context.use_prompt_caching = True
 
                     if not reuse_speculative_llm_response:
-                        json_response = await llm_api_handler(
-                            prompt=extract_action_prompt,
-                            prompt_name="extract-actions",
-                            step=step,
-                            screenshots=scraped_page.screenshots,
-                        )
+                        with profile_phase("llm"):
+                            json_response = await llm_api_handler(
+                                prompt=extract_action_prompt,
+                                prompt_name="extract-actions",
+                                step=step,
+                                screenshots=scraped_page.screenshots,
+                            )
                     else:
                         LOG.debug(
                             "Using speculative extract-actions response",
@@ -1328,6 +1344,9 @@ class ForgeAgent:
                 element_id_to_action_index[action.element_id] = action_idx
 
             element_id_to_last_action: dict[str, int] = dict()
+            # action index -> whether it's filled, for the actions of the current batch input
+            batch_input_filled: dict[int, bool] = {}
+            batch_input_started_at = time.monotonic()
             for action_idx, action_node in enumerate(action_linked_list):
                 context = skyvern_context.ensure_context()
                 if context.refresh_working_page:
@@ -1408,38 +1427,69 @@ class ForgeAgent:
                         "is_retry": step.retry_index > 0,
                     }
 
-                results = await ActionHandler.handle_action(
-                    scraped_page=scraped_page,
-                    task=task,
-                    step=step,
-                    page=current_page,
-                    action=action,
-                )
-                await app.AGENT_FUNCTION.post_action_execution(action)
-                detailed_agent_step_output.actions_and_results[action_idx] = (
-                    action,
-                    results,
-                )
-
-                # Determine wait time between actions
-                wait_time = random.uniform(0.5, 1.0)
-
-                # For multi-field TOTP sequences, use zero delay between all digits for fast execution
-                if action.action_type == ActionType.INPUT_TEXT and self._is_multi_field_totp_sequence(actions):
-                    current_text = action.text if hasattr(action, "text") else None
+                if (
+                    settings.BROWSER_BATCH_INPUT_ENABLED
+                    and action.action_type == ActionType.INPUT_TEXT
+                    and action_idx not in batch_input_filled
+                ):
+                    with profile_phase("batch_input"):
+                        batch_input_started_at = time.monotonic()
+                        batch_input_filled = await fill_input_text_actions_in_batch(
+                            actions, action_idx, current_page, scraped_page, task, step
+                        )
 
-                    if current_text and len(current_text) == 1 and current_text.isdigit():
-                        # Zero delay between all TOTP digits for fast execution
-                        wait_time = 0.0
-                        LOG.debug(
-                            "TOTP: zero delay for digit",
-                            task_id=task.task_id,
-                            action_idx=action_idx,
-                            digit=current_text,
+                with profile_phase(f"action_{action_idx}:{action.action_type}"):
+                    action_started_at = time.monotonic()
+                    if batch_input_filled.get(action_idx):
+                        results = await ActionHandler.handle_batch_filled_action(task, action)
+                    else:
+                        results = await ActionHandler.handle_action(
+                            scraped_page=scraped_page,
+                            task=task,
+                            step=step,
+                            page=current_page,
+                            action=action,
                         )
+                    await app.AGENT_FUNCTION.post_action_execution(action)
+                    detailed_agent_step_output.actions_and_results[action_idx] = (
+                        action,
+                        results,
+                    )
 
-                await asyncio.sleep(wait_time)
-                await self.record_artifacts_after_action(task, step, browser_state, engine)
+                    # Wait for the page to settle between actions
+                    skip_wait = False
+                    # the inputs of a batch are filled at once, the page is waited for after the last one
+                    is_batch_input_in_progress = batch_input_filled.get(action_idx, False) and any(
+                        filled for idx, filled in batch_input_filled.items() if idx > action_idx
+                    )
+                    if is_batch_input_in_progress:
+                        skip_wait = True
+
+                    # For multi-field TOTP sequences, use zero delay between all digits for fast execution
+                    if action.action_type == ActionType.INPUT_TEXT and self._is_multi_field_totp_sequence(actions):
+                        current_text = action.text if hasattr(action, "text") else None
+
+                        if current_text and len(current_text) == 1 and current_text.isdigit():
+                            # Zero delay between all TOTP digits for fast execution
+                            skip_wait = True
+                            LOG.debug(
+                                "TOTP: zero delay for digit",
+                                task_id=task.task_id,
+                                action_idx=action_idx,
+                                digit=current_text,
+                            )
+
+                    with profile_phase("wait"):
+                        if skip_wait:
+                            pass
+                        elif not settings.BROWSER_ACTION_SETTLE_ENABLED:
+                            await asyncio.sleep(random.uniform(0.5, 1.0))
+                        elif working_page := await browser_state.get_working_page():
+                            # the requests sent by the inputs filled in batch are waited for as well
+                            since = batch_input_started_at if batch_input_filled.get(action_idx) else action_started_at
+                            await wait_for_page_settled(working_page, since=since)
+                    if not is_batch_input_in_progress:
+                        await self.record_artifacts_after_action(task, step, browser_state, engine)
                 for result in results:
                     result.step_retry_number = step.retry_index
                     result.step_order = step.order
@@ -1573,13 +1623,14 @@ class ForgeAgent:
                 if not disable_user_goal_check and not enable_parallel_verification:
                     # Standard synchronous verification
                     working_page = await browser_state.must_get_working_page()
-                    complete_action = await self.check_user_goal_complete(
-                        page=working_page,
-                        scraped_page=scraped_page,
-                        task=task,
-                        step=step,
-                        task_block=task_block,
-                    )
+                    with profile_phase("verify_user_goal"):
+                        complete_action = await self.check_user_goal_complete(
+                            page=working_page,
+                            scraped_page=scraped_page,
+                            task=task,
+                            step=step,
+                            task_block=task_block,
+                        )
                     if complete_action is not None:
                         LOG.info("User goal achieved, executing complete action")
                         complete_action.organization_id = task.organization_id
@@ -1588,11 +1639,12 @@ class ForgeAgent:
                         complete_action.step_id = step.step_id
                         complete_action.step_order = step.order
                         complete_action.action_order = len(detailed_agent_step_output.actions_and_results)
-                        complete_results = await ActionHandler.handle_action(
-                            scraped_page, task, step, working_page, complete_action
-                        )
-                        detailed_agent_step_output.actions_and_results.append((complete_action, complete_results))
-                        await self.record_artifacts_after_action(task, step, browser_state, engine)
+                        with profile_phase(f"action_{complete_action.action_order}:{complete_action.action_type}"):
+                            complete_results = await ActionHandler.handle_action(
+                                scraped_page, task, step, working_page, complete_action
+                            )
+                            detailed_agent_step_output.actions_and_results.append((complete_action, complete_results))
+                            await self.record_artifacts_after_action(task, step, browser_state, engine)
                 elif not disable_user_goal_check and enable_parallel_verification:
                     # Parallel verification enabled - defer check to handle_completed_step
                     LOG.info(
@@ -1614,10 +1666,11 @@ class ForgeAgent:
                 assert refreshed_task is not None
                 task = refreshed_task
                 extract_action = await self.create_extract_action(task, step, scraped_page)
-                extract_results = await ActionHandler.handle_action(
-                    scraped_page, task, step, working_page, extract_action
-                )
-                await app.AGENT_FUNCTION.post_action_execution(extract_action)
+                with profile_phase("extract_data"):
+                    extract_results = await ActionHandler.handle_action(
+                        scraped_page, task, step, working_page, extract_action
+                    )
+                    await app.AGENT_FUNCTION.post_action_execution(extract_action)
                 detailed_agent_step_output.actions_and_results.append((extract_action, extract_results))
 
             # If no action errors return the agent state and output
@@ -1992,6 +2045,29 @@ class ForgeAgent:
 
         return draw_boxes
 
+    async def _should_scrape_incrementally(self, task: Task, scrape_type: ScrapeType) -> bool:
+        """
+        Check PostHog feature flag to determine if the page should be scraped incrementally, which only rebuilds the DOM
+        subtrees mutated since the last step. Only the normal scrape is incremental, the retry ones rebuild everything.
+        """
+        if scrape_type != ScrapeType.NORMAL:
+            return False
+
+        try:
+            distinct_id = task.workflow_run_id if task.workflow_run_id else task.task_id
+            return await app.EXPERIMENTATION_PROVIDER.is_feature_enabled_cached(
+                "ENABLE_INCREMENTAL_SCRAPE",
+                distinct_id,
+                properties={"organization_id": task.organization_id},
+            )
+        except Exception:
+            LOG.warning(
+                "Failed to check ENABLE_INCREMENTAL_SCRAPE feature flag, using full scrape",
+                task_id=task.task_id,
+                exc_info=True,
+            )
+            return False
+
     async def _speculate_next_step_plan(
         self,
         task: Task,
@@ -2359,6 +2435,24 @@ class ForgeAgent:
             )
             return None
 
+    @staticmethod
+    async def _create_html_artifact(
+        task: Task, step: Step, artifact_type: ArtifactType, html_snapshot: PageContentSnapshot
+    ) -> None:
+        """
+        Store the html artifact, unless the html is the same as the last html artifact of the task.
+        """
+        context = skyvern_context.ensure_context()
+        if context.last_html_artifact_hashes.get(task.task_id) == html_snapshot.content_hash:
+            LOG.debug("The html is unchanged since the last html artifact, skip it", artifact_type=artifact_type)
+            return
+        await app.ARTIFACT_MANAGER.create_artifact(
+            step=step,
+            artifact_type=artifact_type,
+            data=html_snapshot.content.encode(),
+        )
+        context.last_html_artifact_hashes[task.task_id] = html_snapshot.content_hash
+
     async def record_artifacts_after_action(
         self,
         task: Task,
@@ -2378,49 +2472,69 @@ class ForgeAgent:
         if engine in CUA_ENGINES:
             scrolling_number = 0
 
-        try:
-            screenshot = await browser_state.take_post_action_screenshot(
-                scrolling_number=scrolling_number,
-                use_playwright_fullpage=await app.EXPERIMENTATION_PROVIDER.is_feature_enabled_cached(
-                    "ENABLE_PLAYWRIGHT_FULLPAGE",
-                    task.workflow_run_id or task.task_id,
-                    properties={"organization_id": task.organization_id},
-                ),
-            )
-            await app.ARTIFACT_MANAGER.create_artifact(
-                step=step,
-                artifact_type=ArtifactType.SCREENSHOT_ACTION,
-                data=screenshot,
-            )
-        except Exception:
-            LOG.error(
-                "Failed to record screenshot after action",
-                exc_info=True,
-            )
+        # only the page state is captured here, the artifacts are stored in the background
+        with profile_phase("record_artifacts"):
+            try:
+                with profile_phase("screenshot"):
+                    screenshot = await browser_state.take_post_action_screenshot(
+                        scrolling_number=scrolling_number,
+                        use_playwright_fullpage=await app.EXPERIMENTATION_PROVIDER.is_feature_enabled_cached(
+                            "ENABLE_PLAYWRIGHT_FULLPAGE",
+                            task.workflow_run_id or task.task_id,
+                            properties={"organization_id": task.organization_id},
+                        ),
+                    )
+                await app.ARTIFACT_MANAGER.submit_capture(
+                    task.task_id,
+                    "screenshot_action",
+                    functools.partial(
+                        app.ARTIFACT_MANAGER.create_artifact,
+                        step=step,
+                        artifact_type=ArtifactType.SCREENSHOT_ACTION,
+                        data=screenshot,
+                    ),
+                )
+            except Exception:
+                LOG.error(
+                    "Failed to record screenshot after action",
+                    exc_info=True,
+                )
 
-        try:
-            skyvern_frame = await SkyvernFrame.create_instance(frame=working_page)
-            html = await skyvern_frame.get_content()
-            await app.ARTIFACT_MANAGER.create_artifact(
-                step=step,
-                artifact_type=ArtifactType.HTML_ACTION,
-                data=html.encode(),
-            )
-        except Exception:
-            LOG.exception("Failed to record html after action")
+            try:
+                with profile_phase("html"):
+                    skyvern_frame = await SkyvernFrame.create_instance(frame=working_page)
+                    html_snapshot = await skyvern_frame.get_content_snapshot()
+                # the next scraping stores the html of the page as well, it can be dropped
+                await app.ARTIFACT_MANAGER.submit_capture(
+                    task.task_id,
+                    "html_action",
+                    functools.partial(self._create_html_artifact, task, step, ArtifactType.HTML_ACTION, html_snapshot),
+                    droppable=True,
+                )
+            except Exception:
+                LOG.exception("Failed to record html after action")
 
-        try:
-            video_artifacts = await app.BROWSER_MANAGER.get_video_artifacts(
-                task_id=task.task_id, browser_state=browser_state
-            )
-            for video_artifact in video_artifacts:
-                await app.ARTIFACT_MANAGER.update_artifact_data(
-                    artifact_id=video_artifact.video_artifact_id,
-                    organization_id=task.organization_id,
-                    data=video_artifact.video_data,
+            try:
+                # the video is read when the job runs, only the latest pending upload is needed
+                await app.ARTIFACT_MANAGER.submit_capture(
+                    task.task_id,
+                    "video",
+                    functools.partial(self._upload_video_artifacts, task, browser_state),
+                    coalesce_key=f"{task.task_id}:video",
                 )
-        except Exception:
-            LOG.exception("Failed to record video after action")
+            except Exception:
+                LOG.exception("Failed to record video after action")
+
+    @staticmethod
+    async def _upload_video_artifacts(task: Task, browser_state: BrowserState) -> None:
+        video_artifacts = await app.BROWSER_MANAGER.get_video_artifacts(
+            task_id=task.task_id, browser_state=browser_state, load_data=False
+        )
+        for video_artifact in video_artifacts:
+            await app.ARTIFACT_MANAGER.update_recording_artifact(
+                video_artifact=video_artifact,
+                organization_id=task.organization_id,
+            )
 
     async def initialize_execution_state(
         self,
@@ -2444,7 +2558,10 @@ class ForgeAgent:
         # Initialize video artifact for the task here, afterwards it'll only get updated
         if browser_state and browser_state.browser_artifacts:
             video_artifacts = await app.BROWSER_MANAGER.get_video_artifacts(
-                task_id=task.task_id, browser_state=browser_state
+                task_id=task.task_id,
+                browser_state=browser_state,
+                # the chunked upload uploads the recording from the start, it's not stored here
+                load_data=not settings.ARTIFACT_RECORDING_CHUNKED_UPLOAD_ENABLED,
             )
             for idx, video_artifact in enumerate(video_artifacts):
                 if video_artifact.video_artifact_id:
@@ -2497,7 +2614,26 @@ class ForgeAgent:
         # Check PostHog feature flag to skip screenshot annotations
         draw_boxes = await self._should_skip_screenshot_annotations(task, draw_boxes)
 
-        return await scrape_website(
+        # the screenshots of the CUA engines are the whole input, they're always taken again
+        context = skyvern_context.current()
+        reuse_unchanged_page = (
+            settings.BROWSER_SCRAPE_REUSE_UNCHANGED_PAGE
+            and context is not None
+            and scrape_type == ScrapeType.NORMAL
+            and engine not in CUA_ENGINES
+        )
+        # the cleanup of the element tree is built for the step, it only skips the SVG conversion on the first attempt
+        # with the speed optimizations, so the pages cleaned up the same way are reused
+        skip_svg_conversion = bool(context and context.enable_speed_optimizations and step.retry_index == 0)
+        scrape_options = (max_screenshot_number, draw_boxes, scroll, skip_svg_conversion)
+        if reuse_unchanged_page:
+            scraped_page = await self._get_unchanged_scraped_page(task, browser_state, scrape_options)
+            if scraped_page is not None:
+                return scraped_page
+
+        if reuse_unchanged_page:
+            SCRAPED_PAGE_REUSE_STATS.scraped += 1
+        scraped_page = await scrape_website(
             browser_state,
             task.url,
             app.AGENT_FUNCTION.cleanup_element_tree_factory(task=task, step=step),
@@ -2505,7 +2641,71 @@ class ForgeAgent:
             max_screenshot_number=max_screenshot_number,
             draw_boxes=draw_boxes,
             scroll=scroll,
+            incremental=await self._should_scrape_incrementally(task, scrape_type),
         )
+        if reuse_unchanged_page:
+            await self._remember_scraped_page(task, browser_state, scrape_options, scraped_page)
+        return scraped_page
+
+    @staticmethod
+    async def _get_unchanged_scraped_page(
+        task: Task, browser_state: BrowserState, scrape_options: tuple[int, bool, bool, bool]
+    ) -> ScrapedPage | None:
+        """
+        Get the last scraped page of the task when the page fingerprint is the same as right after it was scraped.
+        Failed actions, waits and retries often end on the same page, the whole scraping is skipped for them.
+        The element tree of the reused page was cleaned up by the cleanup function of the step which scraped it. The
+        only step-specific part of it, skipping the SVG conversion, is part of the scrape options.
+        """
+        context = skyvern_context.ensure_context()
+        last_scraped_page = context.last_scraped_page
+        if (
+            not last_scraped_page
+            or last_scraped_page["task_id"] != task.task_id
+            or last_scraped_page["scrape_options"] != scrape_options
+        ):
+            return None
+
+        page = await browser_state.get_working_page()
+        if page is None or page is not last_scraped_page["page"]:
+            return None
+
+        if await get_page_fingerprint(page) != last_scraped_page["fingerprint"]:
+            return None
+
+        SCRAPED_PAGE_REUSE_STATS.reused += 1
+        scraped_page: ScrapedPage = last_scraped_page["scraped_page"]
+        LOG.info(
+            "The page is unchanged since the last scraping, reuse the scraped page",
+            task_id=task.task_id,
+            url=scraped_page.url,
+            num_elements=len(scraped_page.elements),
+            reused_count=SCRAPED_PAGE_REUSE_STATS.reused,
+            scraped_count=SCRAPED_PAGE_REUSE_STATS.scraped,
+        )
+        return scraped_page
+
+    @staticmethod
+    async def _remember_scraped_page(
+        task: Task, browser_state: BrowserState, scrape_options: tuple[int, bool, bool, bool], scraped_page: ScrapedPage
+    ) -> None:
+        context = skyvern_context.ensure_context()
+        # only keep the last one, the scraped page of a big page takes a lot of memory
+        context.last_scraped_page = None
+        page = await browser_state.get_working_page()
+        if page is None:
+            return
+        # the fingerprint is None when the page changed during the scraping, the scraped page is outdated already
+        fingerprint = await get_page_fingerprint(page)
+        if fingerprint is None:
+            return
+        context.last_scraped_page = {
+            "task_id": task.task_id,
+            "scrape_options": scrape_options,
+            "page": page,
+            "fingerprint": fingerprint,
+            "scraped_page": scraped_page,
+        }
 
     async def build_and_record_step_prompt(
         self,
@@ -2574,13 +2774,14 @@ class ForgeAgent:
             use_caching = False
             for idx, scrape_type in enumerate(SCRAPE_TYPE_ORDER):
                 try:
-                    scraped_page = await self._scrape_with_type(
-                        task=task,
-                        step=step,
-                        browser_state=browser_state,
-                        scrape_type=scrape_type,
-                        engine=engine,
-                    )
+                    with profile_phase(f"scrape:{scrape_type}"):
+                        scraped_page = await self._scrape_with_type(
+                            task=task,
+                            step=step,
+                            browser_state=browser_state,
+                            scrape_type=scrape_type,
+                            engine=engine,
+                        )
                     break
                 except (FailedToTakeScreenshot, ScrapingFailed) as e:
                     if idx < len(SCRAPE_TYPE_ORDER) - 1:
@@ -2595,11 +2796,10 @@ class ForgeAgent:
         use_caching = False
 
         if persist_artifacts:
-            await app.ARTIFACT_MANAGER.create_artifact(
-                step=step,
-                artifact_type=ArtifactType.HTML_SCRAPE,
-                data=scraped_page.html.encode(),
-            )
+            with profile_phase("record_artifacts"):
+                html_snapshot = await scraped_page.get_html_snapshot()
+                if html_snapshot is not None:
+                    await self._create_html_artifact(task, step, ArtifactType.HTML_SCRAPE, html_snapshot)
         LOG.info(
             "Scraped website",
             step_order=step.order,
@@ -2630,69 +2830,73 @@ class ForgeAgent:
         # Use the speed optimization decision from context (set before scraping)
         enable_speed_optimizations = context.enable_speed_optimizations if context else False
 
-        if not enable_speed_optimizations:
-            # Optimization disabled - use regular tree always
-            element_tree_in_prompt = scraped_page.build_element_tree(element_tree_format)
-        elif step.retry_index == 0:
-            # First attempt - use economy tree (fast, no SVG conversion)
-            # Note: SVG conversion was already skipped in cleanup_element_tree_func
-            # based on the same context.enable_speed_optimizations value
-            element_tree_in_prompt = scraped_page.build_economy_elements_tree(element_tree_format)
-            LOG.info(
-                "Speed optimization: Using economy element tree (skipping SVGs)",
-                step_order=step.order,
-                step_retry=step.retry_index,
-                task_id=task.task_id,
-                workflow_run_id=task.workflow_run_id,
-            )
-        else:
-            # Retry 1+ - use regular tree (SVGs will be loaded from existing 4-week cache)
-            element_tree_in_prompt = scraped_page.build_element_tree(element_tree_format)
-            LOG.info(
-                "Speed optimization: Using regular tree on retry (SVGs from global cache)",
-                step_order=step.order,
-                step_retry=step.retry_index,
-                task_id=task.task_id,
-                workflow_run_id=task.workflow_run_id,
-            )
+        with profile_phase("render_element_tree"):
+            if not enable_speed_optimizations:
+                # Optimization disabled - use regular tree always
+                element_tree_in_prompt = scraped_page.build_element_tree(element_tree_format)
+            elif step.retry_index == 0:
+                # First attempt - use economy tree (fast, no SVG conversion)
+                # Note: SVG conversion was already skipped in cleanup_element_tree_func
+                # based on the same context.enable_speed_optimizations value
+                element_tree_in_prompt = scraped_page.build_economy_elements_tree(element_tree_format)
+                LOG.info(
+                    "Speed optimization: Using economy element tree (skipping SVGs)",
+                    step_order=step.order,
+                    step_retry=step.retry_index,
+                    task_id=task.task_id,
+                    workflow_run_id=task.workflow_run_id,
+                )
+            else:
+                # Retry 1+ - use regular tree (SVGs will be loaded from existing 4-week cache)
+                element_tree_in_prompt = scraped_page.build_element_tree(element_tree_format)
+                LOG.info(
+                    "Speed optimization: Using regular tree on retry (SVGs from global cache)",
+                    step_order=step.order,
+                    step_retry=step.retry_index,
+                    task_id=task.task_id,
+                    workflow_run_id=task.workflow_run_id,
+                )
         extract_action_prompt = ""
         if engine not in CUA_ENGINES:
-            extract_action_prompt, use_caching = await self._build_extract_action_prompt(
-                task,
-                step,
-                browser_state,
-                scraped_page,
-                verification_code_check=bool(task.totp_verification_url or task.totp_identifier),
-                expire_verification_code=True,
-            )
+            with profile_phase("build_prompt"):
+                extract_action_prompt, use_caching = await self._build_extract_action_prompt(
+                    task,
+                    step,
+                    browser_state,
+                    scraped_page,
+                    verification_code_check=bool(task.totp_verification_url or task.totp_identifier),
+                    expire_verification_code=True,
+                )
 
         if persist_artifacts:
-            await app.ARTIFACT_MANAGER.create_artifact(
-                step=step,
-                artifact_type=ArtifactType.VISIBLE_ELEMENTS_ID_CSS_MAP,
-                data=json.dumps(scraped_page.id_to_css_dict, indent=2).encode(),
-            )
-            await app.ARTIFACT_MANAGER.create_artifact(
-                step=step,
-                artifact_type=ArtifactType.VISIBLE_ELEMENTS_ID_FRAME_MAP,
-                data=json.dumps(scraped_page.id_to_frame_dict, indent=2).encode(),
-            )
-            await app.ARTIFACT_MANAGER.create_artifact(
-                step=step,
-                artifact_type=ArtifactType.VISIBLE_ELEMENTS_TREE,
-                data=json.dumps(scraped_page.element_tree, indent=2).encode(),
-            )
-            await app.ARTIFACT_MANAGER.create_artifact(
-                step=step,
-                artifact_type=ArtifactType.VISIBLE_ELEMENTS_TREE_TRIMMED,
-                data=json.dumps(scraped_page.element_tree_trimmed, indent=2).encode(),
-            )
-            await app.ARTIFACT_MANAGER.create_artifact(
-                step=step,
-                artifact_type=ArtifactType.VISIBLE_ELEMENTS_TREE_IN_PROMPT,
-                data=element_tree_in_prompt.encode(),
-            )
+            with profile_phase("record_artifacts"):
+                await app.ARTIFACT_MANAGER.create_artifact(
+                    step=step,
+                    artifact_type=ArtifactType.VISIBLE_ELEMENTS_ID_CSS_MAP,
+                    data=json.dumps(scraped_page.id_to_css_dict, indent=2).encode(),
+                )
+                await app.ARTIFACT_MANAGER.create_artifact(
+                    step=step,
+                    artifact_type=ArtifactType.VISIBLE_ELEMENTS_ID_FRAME_MAP,
+                    data=json.dumps(scraped_page.id_to_frame_dict, indent=2).encode(),
+                )
+                await app.ARTIFACT_MANAGER.create_artifact(
+                    step=step,
+                    artifact_type=ArtifactType.VISIBLE_ELEMENTS_TREE,
+                    data=json.dumps(scraped_page.element_tree, indent=2).encode(),
+                )
+                await app.ARTIFACT_MANAGER.create_artifact(
+                    step=step,
+                    artifact_type=ArtifactType.VISIBLE_ELEMENTS_TREE_TRIMMED,
+                    data=json.dumps(scraped_page.element_tree_trimmed, indent=2).encode(),
+                )
+                await app.ARTIFACT_MANAGER.create_artifact(
+                    step=step,
+                    artifact_type=ArtifactType.VISIBLE_ELEMENTS_TREE_IN_PROMPT,
+                    data=element_tree_in_prompt.encode(),
+                )
 
+        scraped_page.clear_rendered_html()
         return scraped_page, extract_action_prompt, use_caching
 
     async def _create_vertex_cache_for_task(
@@ -2829,7 +3033,7 @@ class ForgeAgent:
         current_url = (
             await SkyvernFrame.evaluate(frame=page, expression="() => document.location.href") if page else starting_url
         )
-        final_navigation_payload = self._build_navigation_payload(
+        final_navigation_payload = await self._build_navigation_payload(
             task, expire_verification_code=expire_verification_code, step=step, scraped_page=scraped_page
         )
         navigation_payload_str = json.dumps(final_navigation_payload)
@@ -2983,7 +3187,7 @@ class ForgeAgent:
 
         return full_prompt, use_caching
 
-    def _should_process_totp(self, scraped_page: ScrapedPage | None) -> bool:
+    async def _should_process_totp(self, scraped_page: ScrapedPage | None) -> bool:
         """Detect TOTP pages by checking for multiple input fields or verification keywords."""
         if not scraped_page:
             return False
@@ -3015,7 +3219,8 @@ class ForgeAgent:
                     return True
 
             # Check for TOTP-related keywords in page content
-            page_text = scraped_page.html.lower() if scraped_page.html else ""
+            html = await scraped_page.get_html()
+            page_text = html.lower() if html else ""
             totp_keywords = [
                 "verification code",
                 "authentication code",
@@ -3092,7 +3297,7 @@ class ForgeAgent:
 
         return is_multi_field_totp
 
-    def _build_navigation_payload(
+    async def _build_navigation_payload(
         self,
         task: Task,
         expire_verification_code: bool = False,
@@ -3125,7 +3330,7 @@ class ForgeAgent:
             task.workflow_run_id
             and step
             and isinstance(final_navigation_payload, dict)
-            and self._should_process_totp(scraped_page)
+            and await self._should_process_totp(scraped_page)
         ):
             workflow_run_context = app.WORKFLOW_CONTEXT_MANAGER.get_workflow_run_context(task.workflow_run_id)
 
@@ -3234,6 +3439,8 @@ class ForgeAgent:
             )
             raise TaskNotFound(task_id=task.task_id) from e
         task = refreshed_task
+        # the captures after the last actions must not overwrite the final artifacts of the task
+        await app.ARTIFACT_MANAGER.flush_captures([task.task_id])
 
         # Caches expire based on TTL (1 hour) or can be cleaned up via scheduled job
         # This allows multiple tasks with the same llm_key to share the same cache
@@ -3518,13 +3725,13 @@ class ForgeAgent:
         if browser_state:
             # Update recording artifact after closing the browser, so we can get an accurate recording
             video_artifacts = await app.BROWSER_MANAGER.get_video_artifacts(
-                task_id=task.task_id, browser_state=browser_state
+                task_id=task.task_id, browser_state=browser_state, load_data=False
             )
             for video_artifact in video_artifacts:
-                await app.ARTIFACT_MANAGER.update_artifact_data(
-                    artifact_id=video_artifact.video_artifact_id,
+                await app.ARTIFACT_MANAGER.update_recording_artifact(
+                    video_artifact=video_artifact,
                     organization_id=task.organization_id,
-                    data=video_artifact.video_data,
+                    final=True,
                 )
 
             har_data = await app.BROWSER_MANAGER.get_har_data(task_id=task.task_id, browser_state=browser_state)
@@ -3586,14 +3793,23 @@ class ForgeAgent:
             diff=update_comparison,
         )
 
+        profile = finish_step_profiler(step.step_id) if status is not None and status.is_terminal() else None
+
         # Track step duration when step is completed or failed
         if status in [StepStatus.completed, StepStatus.failed]:
             duration_seconds = (datetime.now(UTC) - step.created_at.replace(tzinfo=UTC)).total_seconds()
+            phase_durations_ms: dict[str, float] = {}
+            if profile:
+                for phase in profile.phases:
+                    if len(phase.path) == 1:
+                        name = phase.path[0]
+                        phase_durations_ms[name] = phase_durations_ms.get(name, 0) + phase.duration_ms
             LOG.info(
                 "Step duration metrics",
                 duration_seconds=duration_seconds,
                 step_status=status,
                 organization_id=step.organization_id,
+                phase_durations_ms={name: round(duration_ms) for name, duration_ms in phase_durations_ms.items()},
             )
 
         await save_step_logs(step.step_id)
@@ -3602,6 +3818,7 @@ class ForgeAgent:
             task_id=step.task_id,
             step_id=step.step_id,
             organization_id=step.organization_id,
+            profile=profile,
             **updates,
         )
 
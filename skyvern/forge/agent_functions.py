@@ -434,7 +434,8 @@ async def _convert_css_shape_to_string(
     if css_shape != INVALID_SHAPE:
         # refresh the cache expiration
         await app.CACHE.set(shape_key, css_shape)
-        element["attributes"]["shape-description"] = css_shape
+        # the attributes are shared with the scraped elements (copy_element_tree), replace them instead of updating
+        element["attributes"] = {**element["attributes"], "shape-description": css_shape}
     return None
 
 
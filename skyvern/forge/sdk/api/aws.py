@@ -196,6 +196,60 @@ class AsyncAWSClient:
             if raise_exception:
                 raise e
 
+    async def create_multipart_upload(
+        self,
+        uri: str,
+        storage_class: S3StorageClass = S3StorageClass.STANDARD,
+        tags: dict[str, str] | None = None,
+    ) -> str:
+        # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/create_multipart_upload.html
+        if storage_class not in S3StorageClass:
+            raise ValueError(f"Invalid storage class: {storage_class}. Must be one of {list(S3StorageClass)}")
+        async with self._s3_client() as client:
+            parsed_uri = S3Uri(uri)
+            extra_args = {"Tagging": self._create_tag_string(tags)} if tags else {}
+            response = await client.create_multipart_upload(
+                Bucket=parsed_uri.bucket,
+                Key=parsed_uri.key,
+                StorageClass=str(storage_class),
+                **extra_args,
+            )
+            return response["UploadId"]
+
+    async def upload_part(self, uri: str, upload_id: str, part_number: int, data: bytes) -> str:
+        # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/upload_part.html
+        async with self._s3_client() as client:
+            parsed_uri = S3Uri(uri)
+            response = await client.upload_part(
+                Body=data,
+                Bucket=parsed_uri.bucket,
+                Key=parsed_uri.key,
+                PartNumber=part_number,
+                UploadId=upload_id,
+            )
+            return response["ETag"]
+
+    async def complete_multipart_upload(self, uri: str, upload_id: str, parts: list[dict[str, Any]]) -> None:
+        # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/complete_multipart_upload.html
+        completed_parts: list[Any] = sorted(parts, key=lambda part: part["PartNumber"])
+        async with self._s3_client() as client:
+            parsed_uri = S3Uri(uri)
+            await client.complete_multipart_upload(
+                Bucket=parsed_uri.bucket,
+                Key=parsed_uri.key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": completed_parts},
+            )
+
+    async def abort_multipart_upload(self, uri: str, upload_id: str) -> None:
+        # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/abort_multipart_upload.html
+        try:
+            async with self._s3_client() as client:
+                parsed_uri = S3Uri(uri)
+                await client.abort_multipart_upload(Bucket=parsed_uri.bucket, Key=parsed_uri.key, UploadId=upload_id)
+        except Exception:
+            LOG.exception("S3 abort multipart upload failed", uri=uri, upload_id=upload_id)
+
     async def download_file(self, uri: str, log_exception: bool = True) -> bytes | None:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/get_object.html
         try:
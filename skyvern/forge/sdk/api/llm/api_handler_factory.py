@@ -24,16 +24,18 @@ from skyvern.forge.sdk.api.llm.exceptions import (
     LLMProviderError,
     LLMProviderErrorRetryableTask,
 )
+from skyvern.forge.sdk.api.llm.image_policy import apply_image_policy
 from skyvern.forge.sdk.api.llm.models import LLMAPIHandler, LLMConfig, LLMRouterConfig, dummy_llm_api_handler
 from skyvern.forge.sdk.api.llm.ui_tars_response import UITarsResponse
 from skyvern.forge.sdk.api.llm.utils import llm_messages_builder, llm_messages_builder_with_history, parse_api_response
 from skyvern.forge.sdk.artifact.models import ArtifactType
 from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.step_profiler import profile_phase
 from skyvern.forge.sdk.models import SpeculativeLLMMetadata, Step
 from skyvern.forge.sdk.schemas.ai_suggestions import AISuggestion
 from skyvern.forge.sdk.schemas.task_v2 import TaskV2, Thought
 from skyvern.forge.sdk.trace import TraceManager
-from skyvern.utils.image_resizer import Resolution, get_resize_target_dimension, resize_screenshots
+from skyvern.utils.image_resizer import Resolution, get_resize_target_dimension, resize_screenshots_async
 
 LOG = structlog.get_logger()
 
@@ -46,6 +48,9 @@ class LLMCallStats(BaseModel):
     reasoning_tokens: int | None = None
     cached_tokens: int | None = None
     llm_cost: float | None = None
+    # saved by the image policy of the llm config, see apply_image_policy
+    image_bytes_saved: int | None = None
+    image_tokens_saved: int | None = None
 
 
 class LLMAPIHandlerFactory:
@@ -327,8 +332,11 @@ class LLMAPIHandlerFactory:
                     task_v2=task_v2,
                     thought=thought,
                 )
+            encoded_screenshots = await apply_image_policy(screenshots, llm_config.image_policy, main_model_group)
             # Build messages and apply caching in one step
-            messages = await llm_messages_builder(prompt, screenshots, llm_config.add_assistant_prefix)
+            messages = await llm_messages_builder(
+                prompt, encoded_screenshots.screenshots, llm_config.add_assistant_prefix
+            )
 
             # Inject context caching system message when available
             try:
@@ -397,9 +405,10 @@ class LLMAPIHandlerFactory:
                 )
             model_used = main_model_group
             try:
-                response = await router.acompletion(
-                    model=main_model_group, messages=messages, timeout=settings.LLM_CONFIG_TIMEOUT, **parameters
-                )
+                with profile_phase("request"):
+                    response = await router.acompletion(
+                        model=main_model_group, messages=messages, timeout=settings.LLM_CONFIG_TIMEOUT, **parameters
+                    )
                 response_model = response.model or main_model_group
                 model_used = response_model
                 if not LLMAPIHandlerFactory._models_equivalent(response_model, main_model_group):
@@ -555,6 +564,8 @@ class LLMAPIHandlerFactory:
                 reasoning_tokens=reasoning_tokens if reasoning_tokens > 0 else None,
                 cached_tokens=cached_tokens if cached_tokens > 0 else None,
                 llm_cost=llm_cost if llm_cost > 0 else None,
+                image_bytes_saved=encoded_screenshots.bytes_saved or None,
+                image_tokens_saved=encoded_screenshots.image_tokens_saved or None,
             )
 
             if step and is_speculative_step:
@@ -661,7 +672,10 @@ class LLMAPIHandlerFactory:
 
             model_name = llm_config.model_name
 
-            messages = await llm_messages_builder(prompt, screenshots, llm_config.add_assistant_prefix)
+            encoded_screenshots = await apply_image_policy(screenshots, llm_config.image_policy, model_name)
+            messages = await llm_messages_builder(
+                prompt, encoded_screenshots.screenshots, llm_config.add_assistant_prefix
+            )
 
             # Inject context caching system message when available
             try:
@@ -736,13 +750,14 @@ class LLMAPIHandlerFactory:
                 # TODO (kerem): add a timeout to this call
                 # TODO (kerem): add a retry mechanism to this call (acompletion_with_retries)
                 # TODO (kerem): use litellm fallbacks? https://litellm.vercel.app/docs/tutorials/fallbacks#how-does-completion_with_fallbacks-work
-                response = await litellm.acompletion(
-                    model=model_name,
-                    messages=messages,
-                    timeout=settings.LLM_CONFIG_TIMEOUT,
-                    drop_params=True,  # Drop unsupported parameters gracefully
-                    **active_parameters,
-                )
+                with profile_phase("request"):
+                    response = await litellm.acompletion(
+                        model=model_name,
+                        messages=messages,
+                        timeout=settings.LLM_CONFIG_TIMEOUT,
+                        drop_params=True,  # Drop unsupported parameters gracefully
+                        **active_parameters,
+                    )
             except litellm.exceptions.APIError as e:
                 raise LLMProviderErrorRetryableTask(llm_key) from e
             except litellm.exceptions.ContextWindowExceededError as e:
@@ -885,6 +900,8 @@ class LLMAPIHandlerFactory:
                 reasoning_tokens=reasoning_tokens if reasoning_tokens > 0 else None,
                 cached_tokens=cached_tokens if cached_tokens > 0 else None,
                 llm_cost=llm_cost if llm_cost > 0 else None,
+                image_bytes_saved=encoded_screenshots.bytes_saved or None,
+                image_tokens_saved=encoded_screenshots.image_tokens_saved or None,
             )
 
             return parsed_response
@@ -1025,7 +1042,7 @@ class LLMCaller:
                         tool["display_height_px"] = target_dimension["height"]
                     if "display_width_px" in tool:
                         tool["display_width_px"] = target_dimension["width"]
-            screenshots = resize_screenshots(screenshots, target_dimension)
+            screenshots = await resize_screenshots_async(screenshots, target_dimension)
 
         llm_prompt_value = prompt or ""
         if prompt and step and not is_speculative_step:
@@ -1042,6 +1059,13 @@ class LLMCaller:
         if not self.llm_config.supports_vision:
             screenshots = None
 
+        image_policy = self.llm_config.image_policy
+        if self.screenshot_scaling_enabled:
+            # the screenshots are already scaled to the dimension the CUA tool coordinates are based on
+            image_policy = dataclasses.replace(image_policy, max_edge=None)
+        encoded_screenshots = await apply_image_policy(screenshots, image_policy, self.llm_config.model_name)
+        screenshots = encoded_screenshots.screenshots
+
         message_pattern = "openai"
         if "ANTHROPIC" in self.llm_key:
             message_pattern = "anthropic"
@@ -1078,12 +1102,13 @@ class LLMCaller:
             )
         t_llm_request = time.perf_counter()
         try:
-            response = await self._dispatch_llm_call(
-                messages=messages,
-                tools=tools,
-                timeout=settings.LLM_CONFIG_TIMEOUT,
-                **active_parameters,
-            )
+            with profile_phase("request"):
+                response = await self._dispatch_llm_call(
+                    messages=messages,
+                    tools=tools,
+                    timeout=settings.LLM_CONFIG_TIMEOUT,
+                    **active_parameters,
+                )
             if use_message_history:
                 # only update message_history when the request is successful
                 self.message_history = messages
@@ -1121,6 +1146,8 @@ class LLMCaller:
             )
 
         call_stats = await self.get_call_stats(response)
+        call_stats.image_bytes_saved = encoded_screenshots.bytes_saved or None
+        call_stats.image_tokens_saved = encoded_screenshots.image_tokens_saved or None
         if step and not is_speculative_step:
             await app.DATABASE.update_step(
                 task_id=step.task_id,
@@ -1162,6 +1189,8 @@ class LLMCaller:
             reasoning_tokens=call_stats.reasoning_tokens if call_stats and call_stats.reasoning_tokens else None,
             cached_tokens=call_stats.cached_tokens if call_stats and call_stats.cached_tokens else None,
             llm_cost=call_stats.llm_cost if call_stats and call_stats.llm_cost else None,
+            image_bytes_saved=call_stats.image_bytes_saved,
+            image_tokens_saved=call_stats.image_tokens_saved,
         )
 
         # Raw response is used for CUA engine LLM calls.
@@ -0,0 +1,131 @@
+import asyncio
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import BytesIO
+
+import structlog
+from PIL import Image
+
+from skyvern.forge.sdk.api.llm.models import LLMImagePolicy
+from skyvern.utils.image_resizer import RESIZE_REDUCING_GAP, encode_image
+
+LOG = structlog.get_logger()
+
+# the screenshots of a step are sent to several prompts, retried and sent again by the speculative steps.
+# the cache keeps the encoded screenshots of the recent steps
+ENCODED_SCREENSHOTS_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class EncodedScreenshot:
+    data: bytes
+    original_size: tuple[int, int]
+    size: tuple[int, int]
+    original_bytes: int
+
+
+@dataclass
+class EncodedScreenshots:
+    screenshots: list[bytes] | None
+    bytes_saved: int = 0
+    image_tokens_saved: int = 0
+
+
+_encoded_screenshots_cache: OrderedDict[tuple[bytes, LLMImagePolicy], EncodedScreenshot] = OrderedDict()
+_encoded_screenshots_cache_lock = threading.Lock()
+
+
+def estimate_image_tokens(size: tuple[int, int], model_name: str) -> int:
+    """
+    Estimate the input tokens of an image by the published formulas of the providers.
+    Claude models: width * height / 750. Other models: the OpenAI high detail tiles, 170 tokens per 512px tile + 85.
+    """
+    width, height = size
+    if "claude" in model_name or "anthropic" in model_name:
+        # the images over ~1.15 megapixels are downscaled by the api, to about 1600 tokens
+        return min(math.ceil(width * height / 750), 1600)
+
+    # fit in 2048x2048, then the shorter side is scaled down to 768
+    scale = min(1.0, 2048 / max(width, height))
+    if min(width, height) * scale > 768:
+        scale = 768 / min(width, height)
+    tiles = math.ceil(width * scale / 512) * math.ceil(height * scale / 512)
+    return 170 * tiles + 85
+
+
+def encode_screenshot(screenshot: bytes, policy: LLMImagePolicy) -> EncodedScreenshot:
+    """
+    Encode the screenshot by the policy. CPU bound, run it in a thread.
+    """
+    with Image.open(BytesIO(screenshot)) as img:
+        original_size = img.size
+        img.load()
+        encoded_img: Image.Image = img
+        if policy.grayscale:
+            encoded_img = encoded_img.convert("L")
+        if policy.max_edge and max(original_size) > policy.max_edge:
+            scale = policy.max_edge / max(original_size)
+            size = (max(1, round(original_size[0] * scale)), max(1, round(original_size[1] * scale)))
+            encoded_img = encoded_img.resize(size, Image.Resampling.LANCZOS, reducing_gap=RESIZE_REDUCING_GAP)
+        data = encode_image(encoded_img, image_format=policy.image_format, quality=policy.quality)
+        size = encoded_img.size
+
+    if size == original_size and len(data) >= len(screenshot):
+        # encoding made it larger without downscaling it, send the original
+        data = screenshot
+    return EncodedScreenshot(data=data, original_size=original_size, size=size, original_bytes=len(screenshot))
+
+
+def _encode_screenshots(screenshots: list[bytes], policy: LLMImagePolicy) -> list[EncodedScreenshot]:
+    return [encode_screenshot(screenshot, policy) for screenshot in screenshots]
+
+
+async def apply_image_policy(
+    screenshots: list[bytes] | None, policy: LLMImagePolicy, model_name: str
+) -> EncodedScreenshots:
+    """
+    Encode the screenshots sent to the LLM by the image policy of the LLM config.
+    The encoded screenshots are cached by the content hash, so the retries and the speculative calls don't encode
+    the same screenshots again.
+    """
+    if policy.is_noop() or not screenshots:
+        return EncodedScreenshots(screenshots=screenshots)
+
+    keys = [(hashlib.sha256(screenshot).digest(), policy) for screenshot in screenshots]
+    encoded: dict[int, EncodedScreenshot] = {}
+    with _encoded_screenshots_cache_lock:
+        for index, key in enumerate(keys):
+            cached = _encoded_screenshots_cache.get(key)
+            if cached is not None:
+                _encoded_screenshots_cache.move_to_end(key)
+                encoded[index] = cached
+
+    missing = [index for index in range(len(screenshots)) if index not in encoded]
+    if missing:
+        encoded_screenshots = await asyncio.to_thread(
+            _encode_screenshots, [screenshots[index] for index in missing], policy
+        )
+        with _encoded_screenshots_cache_lock:
+            for index, encoded_screenshot in zip(missing, encoded_screenshots):
+                encoded[index] = encoded_screenshot
+                _encoded_screenshots_cache[keys[index]] = encoded_screenshot
+                if len(_encoded_screenshots_cache) > ENCODED_SCREENSHOTS_CACHE_SIZE:
+                    _encoded_screenshots_cache.popitem(last=False)
+
+    result = EncodedScreenshots(screenshots=[encoded[index].data for index in range(len(screenshots))])
+    for encoded_screenshot in encoded.values():
+        result.bytes_saved += encoded_screenshot.original_bytes - len(encoded_screenshot.data)
+        original_tokens = estimate_image_tokens(encoded_screenshot.original_size, model_name)
+        result.image_tokens_saved += original_tokens - estimate_image_tokens(encoded_screenshot.size, model_name)
+    LOG.debug(
+        "Applied the image policy to the screenshots",
+        policy=policy,
+        num_screenshots=len(screenshots),
+        num_encoded=len(missing),
+        bytes_saved=result.bytes_saved,
+        image_tokens_saved=result.image_tokens_saved,
+    )
+    return result
@@ -1,13 +1,16 @@
 from dataclasses import dataclass, field
 from typing import Any, Awaitable, Literal, Optional, Protocol, TypedDict
 
+import structlog
 from litellm import AllowedFailsPolicy
 
 from skyvern.forge.sdk.models import Step
 from skyvern.forge.sdk.schemas.ai_suggestions import AISuggestion
 from skyvern.forge.sdk.schemas.task_v2 import TaskV2, Thought
 from skyvern.forge.sdk.settings_manager import SettingsManager
-from skyvern.utils.image_resizer import Resolution
+from skyvern.utils.image_resizer import ImageFormat, Resolution
+
+LOG = structlog.get_logger()
 
 
 class LiteLLMParams(TypedDict, total=False):
@@ -20,6 +23,34 @@ class LiteLLMParams(TypedDict, total=False):
     thinking: dict[str, Any] | None
 
 
+def get_default_llm_image_format() -> ImageFormat:
+    try:
+        return ImageFormat(SettingsManager.get_settings().LLM_CONFIG_IMAGE_FORMAT.lower())
+    except ValueError:
+        LOG.warning(
+            "Unknown LLM image format, fallback to png",
+            image_format=SettingsManager.get_settings().LLM_CONFIG_IMAGE_FORMAT,
+        )
+        return ImageFormat.PNG
+
+
+@dataclass(frozen=True)
+class LLMImagePolicy:
+    """
+    How the screenshots are encoded before they are sent to the LLM. The screenshot artifacts are not affected.
+    """
+
+    # downscale the screenshots whose longer edge is larger than this, in pixels
+    max_edge: int | None = SettingsManager.get_settings().LLM_CONFIG_IMAGE_MAX_EDGE
+    image_format: ImageFormat = field(default_factory=get_default_llm_image_format)
+    # only applies to the lossy formats
+    quality: int = SettingsManager.get_settings().LLM_CONFIG_IMAGE_QUALITY
+    grayscale: bool = SettingsManager.get_settings().LLM_CONFIG_IMAGE_GRAYSCALE
+
+    def is_noop(self) -> bool:
+        return self.max_edge is None and self.image_format == ImageFormat.PNG and not self.grayscale
+
+
 @dataclass(frozen=True)
 class LLMConfigBase:
     model_name: str
@@ -44,6 +75,7 @@ class LLMConfig(LLMConfigBase):
     max_completion_tokens: int | None = None
     temperature: float | None = SettingsManager.get_settings().LLM_CONFIG_TEMPERATURE
     reasoning_effort: str | None = None
+    image_policy: LLMImagePolicy = field(default_factory=LLMImagePolicy)
 
 
 @dataclass(frozen=True)
@@ -83,6 +115,7 @@ class LLMRouterConfig(LLMConfigBase):
     max_completion_tokens: int | None = None
     reasoning_effort: str | None = None
     temperature: float | None = SettingsManager.get_settings().LLM_CONFIG_TEMPERATURE
+    image_policy: LLMImagePolicy = field(default_factory=LLMImagePolicy)
 
 
 class LLMAPIHandler(Protocol):
@@ -11,6 +11,7 @@ import structlog
 from skyvern.constants import MAX_IMAGE_MESSAGES
 from skyvern.forge.sdk.api.llm import commentjson
 from skyvern.forge.sdk.api.llm.exceptions import EmptyLLMResponseError, InvalidLLMResponseFormat, InvalidLLMResponseType
+from skyvern.utils.image_resizer import get_image_media_type
 
 LOG = structlog.get_logger()
 
@@ -31,12 +32,13 @@ async def llm_messages_builder(
     if screenshots:
         for screenshot in screenshots:
             encoded_image = base64.b64encode(screenshot).decode("utf-8")
+            media_type = get_image_media_type(screenshot)
             if message_pattern == "anthropic":
                 message = {
                     "type": "image",
                     "source": {
                         "type": "base64",
-                        "media_type": "image/png",
+                        "media_type": media_type,
                         "data": encoded_image,
                     },
                 }
@@ -44,7 +46,7 @@ async def llm_messages_builder(
                 message = {
                     "type": "image_url",
                     "image_url": {
-                        "url": f"data:image/png;base64,{encoded_image}",
+                        "url": f"data:{media_type};base64,{encoded_image}",
                     },
                 }
             messages.append(message)
@@ -79,13 +81,14 @@ async def llm_messages_builder_with_history(
     if screenshots:
         for screenshot in screenshots:
             encoded_image = base64.b64encode(screenshot).decode("utf-8")
+            media_type = get_image_media_type(screenshot)
             message: dict[str, Any]
             if message_pattern == "anthropic":
                 message = {
                     "type": "image",
                     "source": {
                         "type": "base64",
-                        "media_type": "image/png",
+                        "media_type": media_type,
                         "data": encoded_image,
                     },
                 }
@@ -93,7 +96,7 @@ async def llm_messages_builder_with_history(
                 message = {
                     "type": "image_url",
                     "image_url": {
-                        "url": f"data:image/png;base64,{encoded_image}",
+                        "url": f"data:{media_type};base64,{encoded_image}",
                     },
                 }
             current_user_messages.append(message)
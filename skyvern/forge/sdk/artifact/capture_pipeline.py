@@ -0,0 +1,127 @@
+"""
+Run the artifact captures after the actions in the background, so the agent doesn't wait for them.
+
+The caller takes what can't wait (e.g. the screenshot of the page) and submits the rest (storing, uploading) as a job.
+At most `concurrency` jobs run at the same time and at most `max_pending` jobs are pending. When it's saturated, the
+droppable jobs are dropped, the others wait for room. The pending job with the same coalesce key is replaced by the
+newer one instead of running both. The other jobs of a flush key run one by one in the submission order, so e.g. the
+screenshots of the actions are stored in the order of the actions.
+"""
+
+import asyncio
+import functools
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+import structlog
+
+from skyvern.forge.sdk.core.step_profiler import profile_phase
+
+LOG = structlog.get_logger(__name__)
+
+# the result of the job is dropped, e.g. the artifact id returned by create_artifact
+CaptureJob = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class ArtifactCaptureStats:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    # the submits that waited for room in the saturated pipeline
+    throttled: int = 0
+
+
+class ArtifactCapturePipeline:
+    def __init__(self, max_pending: int, concurrency: int) -> None:
+        self.max_pending = max_pending
+        self.stats = ArtifactCaptureStats()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._pending_count = 0
+        self._room_available = asyncio.Event()
+        # flush key (task_id) -> the pending jobs
+        self._aio_tasks: dict[str, set[asyncio.Task[None]]] = defaultdict(set)
+        # coalesce key -> the latest job, it's run by the pending aio task of the key
+        self._coalesced_jobs: dict[str, CaptureJob] = {}
+        # flush key -> the aio task of the last submitted job which isn't coalesced, the next one runs after it
+        self._lane_tails: dict[str, asyncio.Task[None]] = {}
+
+    async def submit(
+        self,
+        flush_key: str,
+        name: str,
+        job: CaptureJob,
+        coalesce_key: str | None = None,
+        droppable: bool = False,
+    ) -> None:
+        self.stats.submitted += 1
+        if coalesce_key is not None and coalesce_key in self._coalesced_jobs:
+            self._coalesced_jobs[coalesce_key] = job
+            self.stats.coalesced += 1
+            return
+
+        if self._pending_count >= self.max_pending:
+            if droppable:
+                self.stats.dropped += 1
+                LOG.warning(
+                    "The artifact capture pipeline is saturated, drop the capture",
+                    capture_name=name,
+                    pending_count=self._pending_count,
+                    stats=self.stats,
+                )
+                return
+            self.stats.throttled += 1
+            with profile_phase("artifact_capture_backpressure"):
+                while self._pending_count >= self.max_pending:
+                    self._room_available.clear()
+                    await self._room_available.wait()
+
+        previous: asyncio.Task[None] | None = None
+        if coalesce_key is not None:
+            self._coalesced_jobs[coalesce_key] = job
+        else:
+            previous = self._lane_tails.get(flush_key)
+        self._pending_count += 1
+        # the aio task copies the contextvars, the job sees the same skyvern context as the caller
+        aio_task = asyncio.create_task(self._run(name, job, coalesce_key, previous))
+        aio_tasks = self._aio_tasks[flush_key]
+        aio_tasks.add(aio_task)
+        aio_task.add_done_callback(aio_tasks.discard)
+        if coalesce_key is None:
+            self._lane_tails[flush_key] = aio_task
+            aio_task.add_done_callback(functools.partial(self._release_lane, flush_key))
+
+    def _release_lane(self, flush_key: str, aio_task: asyncio.Task[None]) -> None:
+        if self._lane_tails.get(flush_key) is aio_task:
+            del self._lane_tails[flush_key]
+
+    async def _run(
+        self, name: str, job: CaptureJob, coalesce_key: str | None, previous: asyncio.Task[None] | None
+    ) -> None:
+        try:
+            if previous is not None:
+                await asyncio.wait([previous])
+            async with self._semaphore:
+                if coalesce_key is not None:
+                    job = self._coalesced_jobs.pop(coalesce_key, job)
+                await job()
+            self.stats.completed += 1
+        except Exception:
+            self.stats.failed += 1
+            LOG.exception("Failed to capture the artifact in the background", capture_name=name)
+        finally:
+            self._pending_count -= 1
+            self._room_available.set()
+
+    async def flush(self, flush_keys: list[str]) -> None:
+        """
+        Wait for the pending jobs of the keys, e.g. before the final artifacts of a task are stored.
+        """
+        aio_tasks = [aio_task for flush_key in flush_keys for aio_task in self._aio_tasks.pop(flush_key, set())]
+        if not aio_tasks:
+            return
+        await asyncio.gather(*aio_tasks, return_exceptions=True)
+        LOG.info("Flushed the artifact captures", flush_keys=flush_keys, num_jobs=len(aio_tasks), stats=self.stats)
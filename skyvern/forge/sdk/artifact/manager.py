@@ -1,17 +1,26 @@
 import asyncio
+import os
 import time
 from collections import defaultdict
+from typing import TYPE_CHECKING
 
 import structlog
 
+from skyvern.config import settings
 from skyvern.forge import app
+from skyvern.forge.sdk.artifact.capture_pipeline import ArtifactCapturePipeline, CaptureJob
 from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType, LogEntityType
+from skyvern.forge.sdk.artifact.storage.base import ChunkedArtifactUpload
 from skyvern.forge.sdk.core import skyvern_context
 from skyvern.forge.sdk.db.id import generate_artifact_id
 from skyvern.forge.sdk.models import Step
 from skyvern.forge.sdk.schemas.ai_suggestions import AISuggestion
 from skyvern.forge.sdk.schemas.task_v2 import TaskV2, Thought
 from skyvern.forge.sdk.schemas.workflow_runs import WorkflowRunBlock
+from skyvern.forge.sdk.settings_manager import SettingsManager
+
+if TYPE_CHECKING:
+    from skyvern.webeye.browser_factory import VideoArtifact
 
 LOG = structlog.get_logger(__name__)
 
@@ -19,6 +28,8 @@ LOG = structlog.get_logger(__name__)
 class ArtifactManager:
     # task_id -> list of aio_tasks for uploading artifacts
     upload_aiotasks_map: dict[str, list[asyncio.Task[None]]] = defaultdict(list)
+    # created on the first capture, so the limits come from the current settings
+    capture_pipeline: ArtifactCapturePipeline | None = None
 
     async def _create_artifact(
         self,
@@ -353,6 +364,83 @@ class ArtifactManager:
             raise ValueError(f"{primary_key} is required to update artifact data.")
         self.upload_aiotasks_map[artifact[primary_key]].append(aio_task)
 
+    async def update_recording_artifact(
+        self,
+        video_artifact: "VideoArtifact",
+        organization_id: str | None,
+        final: bool = False,
+        primary_key: str = "task_id",
+    ) -> None:
+        """
+        Upload the video recording, it's still being written until the final call. With the chunked upload, only the
+        bytes appended since the last call are uploaded and the final call completes the upload in the background.
+        Otherwise the whole recording is uploaded every time.
+        """
+        artifact_id = video_artifact.video_artifact_id
+        path = video_artifact.video_path
+        if not artifact_id or not organization_id or not path or not os.path.exists(path):
+            return
+        if not settings.ARTIFACT_RECORDING_CHUNKED_UPLOAD_ENABLED:
+            with open(path, "rb") as f:
+                data = f.read()
+            await self.update_artifact_data(
+                artifact_id=artifact_id,
+                organization_id=organization_id,
+                data=data,
+                primary_key=primary_key,
+            )
+            return
+
+        upload = video_artifact.chunked_upload
+        if upload is None:
+            artifact = await app.DATABASE.get_artifact_by_id(artifact_id, organization_id)
+            if not artifact:
+                return
+            upload = ChunkedArtifactUpload(artifact=artifact, path=path)
+            video_artifact.chunked_upload = upload
+        if upload.finished:
+            return
+
+        if not final:
+            async with upload.lock:
+                if not upload.finished:
+                    await app.STORAGE.append_artifact_chunks(upload)
+            return
+
+        if not upload.artifact[primary_key]:
+            raise ValueError(f"{primary_key} is required to update artifact data.")
+
+        async def complete() -> None:
+            async with upload.lock:
+                if upload.finished:
+                    return
+                upload.finished = True
+                await app.STORAGE.complete_chunked_artifact(upload)
+
+        # Fire and forget
+        aio_task = asyncio.create_task(complete())
+        self.upload_aiotasks_map[upload.artifact[primary_key]].append(aio_task)
+
+    async def abort_recording_uploads(self, video_artifacts: list["VideoArtifact"]) -> None:
+        """
+        Abort the chunked uploads of the recordings which won't be completed, e.g. the browser state is cleaned up
+        without the final upload.
+        """
+        for video_artifact in video_artifacts:
+            upload = video_artifact.chunked_upload
+            if upload is None:
+                continue
+            async with upload.lock:
+                if upload.finished:
+                    continue
+                upload.finished = True
+                try:
+                    await app.STORAGE.abort_chunked_artifact(upload)
+                except Exception:
+                    LOG.exception(
+                        "Failed to abort the chunked upload of the recording", artifact_id=upload.artifact.artifact_id
+                    )
+
     async def retrieve_artifact(self, artifact: Artifact) -> bytes | None:
         return await app.STORAGE.retrieve_artifact(artifact)
 
@@ -362,10 +450,50 @@ class ArtifactManager:
     async def get_share_links(self, artifacts: list[Artifact]) -> list[str] | None:
         return await app.STORAGE.get_share_links(artifacts)
 
+    async def submit_capture(
+        self,
+        task_id: str,
+        name: str,
+        job: CaptureJob,
+        coalesce_key: str | None = None,
+        droppable: bool = False,
+    ) -> None:
+        """
+        Run the artifact capture job of the task in the background, or right away when the background capture is
+        disabled. The pending jobs of the task are waited by flush_captures and wait_for_upload_aiotasks.
+        """
+        if not SettingsManager.get_settings().ARTIFACT_CAPTURE_BACKGROUND_ENABLED:
+            await job()
+            return
+        await self._get_capture_pipeline().submit(task_id, name, job, coalesce_key=coalesce_key, droppable=droppable)
+
+    @staticmethod
+    def _get_capture_pipeline() -> ArtifactCapturePipeline:
+        if ArtifactManager.capture_pipeline is None:
+            ArtifactManager.capture_pipeline = ArtifactCapturePipeline(
+                max_pending=SettingsManager.get_settings().ARTIFACT_CAPTURE_MAX_PENDING,
+                concurrency=SettingsManager.get_settings().ARTIFACT_CAPTURE_CONCURRENCY,
+            )
+        return ArtifactManager.capture_pipeline
+
+    async def flush_captures(self, task_ids: list[str]) -> None:
+        if ArtifactManager.capture_pipeline is None:
+            return
+        try:
+            async with asyncio.timeout(30):
+                await ArtifactManager.capture_pipeline.flush(task_ids)
+        except asyncio.TimeoutError:
+            LOG.error(
+                f"Timeout (30s) while flushing the artifact captures for task_ids={task_ids}",
+                task_ids=task_ids,
+            )
+
     async def wait_for_upload_aiotasks(self, primary_keys: list[str]) -> None:
         try:
             st = time.time()
             async with asyncio.timeout(30):
+                # the captures create the artifacts and their upload aio tasks
+                await self.flush_captures(primary_keys)
                 await asyncio.gather(
                     *[
                         aio_task
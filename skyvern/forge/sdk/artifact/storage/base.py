@@ -1,5 +1,7 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import BinaryIO
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO
 
 from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType, LogEntityType
 from skyvern.forge.sdk.models import Step
@@ -36,6 +38,28 @@ FILE_EXTENTSION_MAP: dict[ArtifactType, str] = {
     ArtifactType.VISIBLE_ELEMENTS_ID_XPATH_MAP: "json",
 }
 
+# the recorder rewrites the header of the video (e.g. the duration of the webm) when the recording is closed, so the
+# head of the file is uploaded again at the completion of a chunked upload. it's also the size of the S3 upload parts
+CHUNKED_UPLOAD_HEAD_SIZE = 5 * 1024 * 1024
+
+
+@dataclass
+class ChunkedArtifactUpload:
+    """
+    The chunked upload of an artifact from a file that's still being written, e.g. the video recording.
+    """
+
+    artifact: Artifact
+    path: str
+    # the bytes of the file before the offset are uploaded
+    offset: int = 0
+    # the S3 multipart upload
+    upload_id: str | None = None
+    parts: list[dict[str, Any]] = field(default_factory=list)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # completed or aborted, nothing is uploaded afterwards
+    finished: bool = False
+
 
 class BaseStorage(ABC):
     @abstractmethod
@@ -107,6 +131,18 @@ class BaseStorage(ABC):
     async def store_artifact_from_path(self, artifact: Artifact, path: str) -> None:
         pass
 
+    @abstractmethod
+    async def append_artifact_chunks(self, upload: ChunkedArtifactUpload) -> None:
+        """Upload the bytes appended to the file since the last call."""
+
+    @abstractmethod
+    async def complete_chunked_artifact(self, upload: ChunkedArtifactUpload) -> None:
+        """Upload the rest of the file after it's closed, the artifact is complete afterwards."""
+
+    @abstractmethod
+    async def abort_chunked_artifact(self, upload: ChunkedArtifactUpload) -> None:
+        """Drop the uploaded chunks of an artifact which won't be completed."""
+
     @abstractmethod
     async def save_streaming_file(self, organization_id: str, file_name: str) -> None:
         pass
@@ -14,7 +14,12 @@ from skyvern.forge.sdk.api.files import (
     parse_uri_to_path,
 )
 from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType, LogEntityType
-from skyvern.forge.sdk.artifact.storage.base import FILE_EXTENTSION_MAP, BaseStorage
+from skyvern.forge.sdk.artifact.storage.base import (
+    CHUNKED_UPLOAD_HEAD_SIZE,
+    FILE_EXTENTSION_MAP,
+    BaseStorage,
+    ChunkedArtifactUpload,
+)
 from skyvern.forge.sdk.models import Step
 from skyvern.forge.sdk.schemas.ai_suggestions import AISuggestion
 from skyvern.forge.sdk.schemas.files import FileInfo
@@ -146,6 +151,45 @@ class LocalStorage(BaseStorage):
                 artifact=artifact,
             )
 
+    async def append_artifact_chunks(self, upload: ChunkedArtifactUpload) -> None:
+        file_path = None
+        try:
+            file_path = Path(parse_uri_to_path(upload.artifact.uri))
+            if WINDOWS:
+                file_path = file_path.with_name(_windows_safe_filename(file_path.name))
+            self._create_directories_if_not_exists(file_path)
+            with open(upload.path, "rb") as src, open(file_path, "r+b" if upload.offset else "wb") as dst:
+                src.seek(upload.offset)
+                dst.seek(upload.offset)
+                shutil.copyfileobj(src, dst)
+                upload.offset = dst.tell()
+        except Exception:
+            LOG.exception(
+                "Failed to append the artifact chunks locally.",
+                file_path=file_path,
+                artifact=upload.artifact,
+            )
+
+    async def complete_chunked_artifact(self, upload: ChunkedArtifactUpload) -> None:
+        await self.append_artifact_chunks(upload)
+        file_path = None
+        try:
+            file_path = Path(parse_uri_to_path(upload.artifact.uri))
+            if WINDOWS:
+                file_path = file_path.with_name(_windows_safe_filename(file_path.name))
+            with open(upload.path, "rb") as src, open(file_path, "r+b") as dst:
+                dst.write(src.read(CHUNKED_UPLOAD_HEAD_SIZE))
+        except Exception:
+            LOG.exception(
+                "Failed to complete the chunked artifact locally.",
+                file_path=file_path,
+                artifact=upload.artifact,
+            )
+
+    async def abort_chunked_artifact(self, upload: ChunkedArtifactUpload) -> None:
+        # the appended file is kept, it's the recording up to the last append
+        pass
+
     async def retrieve_artifact(self, artifact: Artifact) -> bytes | None:
         file_path = None
         try:
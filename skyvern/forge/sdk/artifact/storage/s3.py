@@ -18,7 +18,12 @@ from skyvern.forge.sdk.api.files import (
     unzip_files,
 )
 from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType, LogEntityType
-from skyvern.forge.sdk.artifact.storage.base import FILE_EXTENTSION_MAP, BaseStorage
+from skyvern.forge.sdk.artifact.storage.base import (
+    CHUNKED_UPLOAD_HEAD_SIZE,
+    FILE_EXTENTSION_MAP,
+    BaseStorage,
+    ChunkedArtifactUpload,
+)
 from skyvern.forge.sdk.models import Step
 from skyvern.forge.sdk.schemas.ai_suggestions import AISuggestion
 from skyvern.forge.sdk.schemas.files import FileInfo
@@ -143,6 +148,58 @@ class S3Storage(BaseStorage):
         )
         await self.async_client.upload_file_from_path(artifact.uri, path, storage_class=sc, tags=tags)
 
+    async def append_artifact_chunks(self, upload: ChunkedArtifactUpload) -> None:
+        # the head of the file is the first part, it's uploaded at the completion. the other parts are uploaded once
+        # they're full, S3 requires all the parts but the last one to be at least 5MB
+        upload.offset = max(upload.offset, CHUNKED_UPLOAD_HEAD_SIZE)
+        with open(upload.path, "rb") as f:
+            f.seek(upload.offset)
+            while len(data := f.read(CHUNKED_UPLOAD_HEAD_SIZE)) == CHUNKED_UPLOAD_HEAD_SIZE:
+                await self._upload_artifact_part(upload, data)
+
+    async def complete_chunked_artifact(self, upload: ChunkedArtifactUpload) -> None:
+        if upload.upload_id is None:
+            # the file is smaller than the first two parts
+            await self.store_artifact_from_path(upload.artifact, upload.path)
+            return
+
+        try:
+            with open(upload.path, "rb") as f:
+                f.seek(upload.offset)
+                while data := f.read(CHUNKED_UPLOAD_HEAD_SIZE):
+                    await self._upload_artifact_part(upload, data)
+                f.seek(0)
+                head = f.read(CHUNKED_UPLOAD_HEAD_SIZE)
+            etag = await self.async_client.upload_part(upload.artifact.uri, upload.upload_id, 1, head)
+            upload.parts.append({"PartNumber": 1, "ETag": etag})
+            await self.async_client.complete_multipart_upload(upload.artifact.uri, upload.upload_id, upload.parts)
+        except Exception:
+            LOG.exception(
+                "Failed to complete the multipart upload, uploading the whole file",
+                artifact_id=upload.artifact.artifact_id,
+                uri=upload.artifact.uri,
+            )
+            await self.async_client.abort_multipart_upload(upload.artifact.uri, upload.upload_id)
+            await self.store_artifact_from_path(upload.artifact, upload.path)
+
+    async def abort_chunked_artifact(self, upload: ChunkedArtifactUpload) -> None:
+        # the parts of an unfinished multipart upload are kept and billed until it's aborted
+        if upload.upload_id is not None:
+            await self.async_client.abort_multipart_upload(upload.artifact.uri, upload.upload_id)
+
+    async def _upload_artifact_part(self, upload: ChunkedArtifactUpload, data: bytes) -> None:
+        if upload.upload_id is None:
+            sc = await self._get_storage_class_for_org(upload.artifact.organization_id)
+            tags = await self._get_tags_for_org(upload.artifact.organization_id)
+            upload.upload_id = await self.async_client.create_multipart_upload(
+                upload.artifact.uri, storage_class=sc, tags=tags
+            )
+        # the first part is the head of the file
+        part_number = len(upload.parts) + 2
+        etag = await self.async_client.upload_part(upload.artifact.uri, upload.upload_id, part_number, data)
+        upload.parts.append({"PartNumber": part_number, "ETag": etag})
+        upload.offset += len(data)
+
     async def save_streaming_file(self, organization_id: str, file_name: str) -> None:
         from_path = f"{get_skyvern_temp_dir()}/{organization_id}/{file_name}"
         to_path = f"s3://{settings.AWS_S3_BUCKET_SCREENSHOTS}/{settings.ENV}/{organization_id}/{file_name}"
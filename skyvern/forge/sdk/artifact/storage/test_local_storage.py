@@ -1,8 +1,12 @@
+from datetime import datetime
+from pathlib import Path
+
 import pytest
 from freezegun import freeze_time
 
 from skyvern.config import settings
-from skyvern.forge.sdk.artifact.models import ArtifactType, LogEntityType
+from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType, LogEntityType
+from skyvern.forge.sdk.artifact.storage.base import ChunkedArtifactUpload
 from skyvern.forge.sdk.artifact.storage.local import LocalStorage
 from skyvern.forge.sdk.artifact.storage.test_helpers import (
     create_fake_for_ai_suggestion,
@@ -105,3 +109,36 @@ class TestLocalStorageBuildURIs:
             uri
             == f"file://{local_storage.artifact_path}/{settings.ENV}/{TEST_ORGANIZATION_ID}/ai_suggestions/{TEST_AI_SUGGESTION_ID}/2025-06-09T12:00:00_artifact123_screenshot_llm.png"
         )
+
+
+@pytest.mark.asyncio
+async def test_chunked_upload_appends_and_rewrites_the_head(tmp_path: Path) -> None:
+    local_storage = LocalStorage(artifact_path=str(tmp_path / "artifacts"))
+    artifact = Artifact(
+        artifact_id="artifact123",
+        artifact_type=ArtifactType.RECORDING,
+        uri=f"file://{tmp_path}/artifacts/recording.webm",
+        organization_id=TEST_ORGANIZATION_ID,
+        created_at=datetime.utcnow(),
+        modified_at=datetime.utcnow(),
+    )
+    recording = tmp_path / "recording.webm"
+    recording.write_bytes(b"head" + b"a" * 10)
+    upload = ChunkedArtifactUpload(artifact=artifact, path=str(recording))
+
+    await local_storage.append_artifact_chunks(upload)
+    assert upload.offset == 14
+    with open(recording, "ab") as f:
+        f.write(b"b" * 10)
+    await local_storage.append_artifact_chunks(upload)
+    assert upload.offset == 24
+    stored = tmp_path / "artifacts" / "recording.webm"
+    assert stored.read_bytes() == b"head" + b"a" * 10 + b"b" * 10
+
+    # the recorder rewrites the header when the recording is closed
+    with open(recording, "r+b") as f:
+        f.write(b"HEAD")
+    with open(recording, "ab") as f:
+        f.write(b"cues")
+    await local_storage.complete_chunked_artifact(upload)
+    assert stored.read_bytes() == recording.read_bytes()
@@ -11,6 +11,7 @@ from types_boto3_s3.client import S3Client
 from skyvern.config import settings
 from skyvern.forge.sdk.api.aws import S3StorageClass, S3Uri, tag_set_to_dict
 from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType, LogEntityType
+from skyvern.forge.sdk.artifact.storage.base import CHUNKED_UPLOAD_HEAD_SIZE, ChunkedArtifactUpload
 from skyvern.forge.sdk.artifact.storage.s3 import S3Storage
 from skyvern.forge.sdk.artifact.storage.test_helpers import (
     create_fake_for_ai_suggestion,
@@ -221,3 +222,50 @@ class TestS3StorageStore:
         await s3_storage.store_artifact(artifact, test_data)
         _assert_object_content(boto3_test_client, artifact.uri, test_data)
         _assert_object_meta(boto3_test_client, artifact.uri)
+
+    async def test_chunked_upload(self, s3_storage: S3Storage, boto3_test_client: S3Client, tmp_path: Path) -> None:
+        artifact = self._create_artifact_for_ai_suggestion(s3_storage, ArtifactType.RECORDING, TEST_AI_SUGGESTION_ID)
+        recording = tmp_path / "recording.webm"
+        recording.write_bytes(b"h" * CHUNKED_UPLOAD_HEAD_SIZE + b"a" * (CHUNKED_UPLOAD_HEAD_SIZE + 10))
+        upload = ChunkedArtifactUpload(artifact=artifact, path=str(recording))
+
+        await s3_storage.append_artifact_chunks(upload)
+        # the head and the partial part are uploaded at the completion
+        assert upload.upload_id is not None
+        assert [part["PartNumber"] for part in upload.parts] == [2]
+        assert upload.offset == 2 * CHUNKED_UPLOAD_HEAD_SIZE
+
+        # the recorder rewrites the header when the recording is closed
+        with open(recording, "r+b") as f:
+            f.write(b"HEAD")
+        await s3_storage.complete_chunked_artifact(upload)
+        _assert_object_content(boto3_test_client, artifact.uri, recording.read_bytes())
+        _assert_object_meta(boto3_test_client, artifact.uri)
+
+    async def test_chunked_upload_of_a_small_file(
+        self, s3_storage: S3Storage, boto3_test_client: S3Client, tmp_path: Path
+    ) -> None:
+        artifact = self._create_artifact_for_ai_suggestion(s3_storage, ArtifactType.RECORDING, TEST_AI_SUGGESTION_ID)
+        recording = tmp_path / "recording.webm"
+        recording.write_bytes(b"small recording")
+        upload = ChunkedArtifactUpload(artifact=artifact, path=str(recording))
+
+        await s3_storage.append_artifact_chunks(upload)
+        assert upload.upload_id is None
+        await s3_storage.complete_chunked_artifact(upload)
+        _assert_object_content(boto3_test_client, artifact.uri, b"small recording")
+
+    async def test_abort_chunked_upload(
+        self, s3_storage: S3Storage, boto3_test_client: S3Client, tmp_path: Path
+    ) -> None:
+        artifact = self._create_artifact_for_ai_suggestion(s3_storage, ArtifactType.RECORDING, TEST_AI_SUGGESTION_ID)
+        recording = tmp_path / "recording.webm"
+        recording.write_bytes(b"h" * CHUNKED_UPLOAD_HEAD_SIZE + b"a" * (CHUNKED_UPLOAD_HEAD_SIZE + 10))
+        upload = ChunkedArtifactUpload(artifact=artifact, path=str(recording))
+
+        await s3_storage.append_artifact_chunks(upload)
+        assert upload.upload_id is not None
+        await s3_storage.abort_chunked_artifact(upload)
+
+        response = boto3_test_client.list_multipart_uploads(Bucket=TEST_BUCKET, Prefix=S3Uri(artifact.uri).key)
+        assert response.get("Uploads", []) == []
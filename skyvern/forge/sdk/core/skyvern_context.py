@@ -1,10 +1,13 @@
 from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from zoneinfo import ZoneInfo
 
 from playwright.async_api import Frame, Page
 
+if TYPE_CHECKING:
+    from skyvern.forge.sdk.core.step_profiler import StepProfiler
+
 
 @dataclass
 class SkyvernContext:
@@ -23,6 +26,8 @@ class SkyvernContext:
     tz_info: ZoneInfo | None = None
     run_id: str | None = None
     totp_codes: dict[str, str | None] = field(default_factory=dict)
+    # the content hash of the last html artifact of every task, the unchanged html isn't stored again
+    last_html_artifact_hashes: dict[str, str] = field(default_factory=dict)
     log: list[dict] = field(default_factory=list)
     hashed_href_map: dict[str, str] = field(default_factory=dict)
     refresh_working_page: bool = False
@@ -62,7 +67,12 @@ class SkyvernContext:
     # parallel verification optimization
     # stores pre-scraped data for next step to avoid re-scraping
     next_step_pre_scraped_data: dict[str, Any] | None = None
+    # the last scraped page of a task and the page fingerprint after it was scraped,
+    # the next step reuses it when the page fingerprint is unchanged
+    last_scraped_page: dict[str, Any] | None = None
     speculative_plans: dict[str, Any] = field(default_factory=dict)
+    # the wall time of the phases of the running step
+    step_profiler: "StepProfiler | None" = None
 
     """
     Example output value:
@@ -0,0 +1,113 @@
+"""
+Wall time of the phases of an agent step.
+
+The agent starts a StepProfiler at the beginning of every step and keeps it in the skyvern context. The phases are
+recorded with profile_phase anywhere down the call stack and they nest by the call stack, including the asyncio tasks
+started inside a phase. The profile is stored with the step when it finishes.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.models import Step, StepPhaseTiming, StepProfile
+
+_current_phase_path: ContextVar[tuple[str, ...]] = ContextVar("Step profiler phase path", default=())
+
+
+class StepProfiler:
+    def __init__(self, step_id: str) -> None:
+        self.step_id = step_id
+        self._started_at = time.perf_counter()
+        self._phases: list[StepPhaseTiming] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        path = (*_current_phase_path.get(), name)
+        token = _current_phase_path.set(path)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            _current_phase_path.reset(token)
+            self._phases.append(
+                StepPhaseTiming(
+                    path=list(path),
+                    start_ms=(start - self._started_at) * 1000,
+                    duration_ms=(end - start) * 1000,
+                )
+            )
+
+    def finish(self) -> StepProfile:
+        phases = sorted(self._phases, key=lambda phase: phase.start_ms)
+        return StepProfile(duration_ms=(time.perf_counter() - self._started_at) * 1000, phases=phases)
+
+
+def start_step_profiler(step_id: str) -> StepProfiler | None:
+    context = skyvern_context.current()
+    if context is None:
+        return None
+    context.step_profiler = StepProfiler(step_id)
+    _current_phase_path.set(())
+    return context.step_profiler
+
+
+def finish_step_profiler(step_id: str) -> StepProfile | None:
+    """
+    Stop profiling the step and get its profile, None when the step wasn't profiled.
+    """
+    context = skyvern_context.current()
+    if context is None or context.step_profiler is None or context.step_profiler.step_id != step_id:
+        return None
+    profiler = context.step_profiler
+    context.step_profiler = None
+    return profiler.finish()
+
+
+@contextmanager
+def profile_phase(name: str) -> Iterator[None]:
+    """
+    Record the wall time of the block as a phase of the step being profiled, it does nothing out of a step.
+    """
+    context = skyvern_context.current()
+    if context is None or context.step_profiler is None:
+        yield
+        return
+    with context.step_profiler.phase(name):
+        yield
+
+
+def to_collapsed_stacks(steps: list[Step], root_frame: str | None = None) -> str:
+    """
+    Convert the profiles of the steps to the collapsed stack format of flamegraph.pl, speedscope and inferno, one
+    "frame;frame;frame <self time in ms>" line per phase. Every step is a root frame, or a child of root_frame.
+    """
+    lines: list[str] = []
+    for step in steps:
+        if step.profile is None:
+            continue
+        step_frame = f"step_{step.order}_retry_{step.retry_index}"
+        if root_frame:
+            step_frame = f"{_collapsed_frame_name(root_frame)};{step_frame}"
+        # the phases run several times in a step (e.g. the actions) are merged by their path
+        total_ms: dict[tuple[str, ...], float] = {(): step.profile.duration_ms}
+        children_ms: dict[tuple[str, ...], float] = {}
+        for phase in step.profile.phases:
+            path = tuple(phase.path)
+            total_ms[path] = total_ms.get(path, 0) + phase.duration_ms
+            children_ms[path[:-1]] = children_ms.get(path[:-1], 0) + phase.duration_ms
+
+        for path, duration_ms in total_ms.items():
+            # the concurrent children can take longer than their parent, the self time isn't negative
+            self_ms = max(round(duration_ms - children_ms.get(path, 0)), 0)
+            frames = [step_frame, *(_collapsed_frame_name(name) for name in path)]
+            lines.append(f"{';'.join(frames)} {self_ms}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _collapsed_frame_name(name: str) -> str:
+    # ";" separates the frames and the last space separates the value
+    return name.replace(";", ":").replace(" ", "_")
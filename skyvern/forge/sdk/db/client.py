@@ -77,7 +77,7 @@ from skyvern.forge.sdk.db.utils import (
 from skyvern.forge.sdk.encrypt import encryptor
 from skyvern.forge.sdk.encrypt.base import EncryptMethod
 from skyvern.forge.sdk.log_artifacts import save_workflow_run_logs
-from skyvern.forge.sdk.models import Step, StepStatus
+from skyvern.forge.sdk.models import Step, StepProfile, StepStatus
 from skyvern.forge.sdk.schemas.ai_suggestions import AISuggestion
 from skyvern.forge.sdk.schemas.browser_profiles import BrowserProfile
 from skyvern.forge.sdk.schemas.credentials import Credential, CredentialType, CredentialVaultType
@@ -566,6 +566,7 @@ class AgentDB:
         incremental_output_tokens: int | None = None,
         incremental_reasoning_tokens: int | None = None,
         incremental_cached_tokens: int | None = None,
+        profile: StepProfile | None = None,
     ) -> Step:
         try:
             async with self.Session() as session:
@@ -598,6 +599,8 @@ class AgentDB:
                         step.reasoning_token_count = incremental_reasoning_tokens + (step.reasoning_token_count or 0)
                     if incremental_cached_tokens is not None:
                         step.cached_token_count = incremental_cached_tokens + (step.cached_token_count or 0)
+                    if profile is not None:
+                        step.profile = profile.model_dump()
 
                     await session.commit()
                     updated_step = await self.get_step(step_id, organization_id)
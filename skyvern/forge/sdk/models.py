@@ -55,6 +55,19 @@ class SpeculativeLLMMetadata(BaseModel):
     llm_cost: float | None = None
 
 
+class StepPhaseTiming(BaseModel):
+    # the names of the phase and its parent phases, outermost first, e.g. ["scrape", "build_element_tree"]
+    path: list[str]
+    # the offset from the start of the step
+    start_ms: float
+    duration_ms: float
+
+
+class StepProfile(BaseModel):
+    duration_ms: float
+    phases: list[StepPhaseTiming] = []
+
+
 class Step(BaseModel):
     created_at: datetime
     modified_at: datetime
@@ -74,6 +87,7 @@ class Step(BaseModel):
     is_speculative: bool = False
     speculative_original_status: StepStatus | None = None
     speculative_llm_metadata: SpeculativeLLMMetadata | None = None
+    profile: StepProfile | None = None
 
     def validate_update(
         self,
@@ -17,7 +17,7 @@ from fastapi import (
     UploadFile,
 )
 from fastapi import status as http_status
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
 from skyvern import analytics
 from skyvern._version import __version__
@@ -31,6 +31,7 @@ from skyvern.forge.sdk.core import skyvern_context
 from skyvern.forge.sdk.core.curl_converter import curl_to_http_request_block_params
 from skyvern.forge.sdk.core.permissions.permission_checker_factory import PermissionCheckerFactory
 from skyvern.forge.sdk.core.security import generate_skyvern_signature
+from skyvern.forge.sdk.core.step_profiler import to_collapsed_stacks
 from skyvern.forge.sdk.db.enums import OrganizationAuthTokenType
 from skyvern.forge.sdk.executor.factory import AsyncExecutorFactory
 from skyvern.forge.sdk.models import Step
@@ -1357,6 +1358,52 @@ async def retry_run_webhook(
     await run_service.retry_run_webhook(run_id, organization_id=current_org.organization_id, api_key=x_api_key)
 
 
+@base_router.get(
+    "/runs/{run_id}/profile",
+    tags=["Agent"],
+    response_class=PlainTextResponse,
+    openapi_extra={
+        "x-fern-sdk-method-name": "get_run_profile",
+    },
+    description="Get the wall time of the step phases of a run in the collapsed stack format of flamegraph tools. "
+    "The profile of every step is also returned with the steps.",
+    summary="Get run profile",
+    responses={
+        200: {"description": "Successfully retrieved run profile"},
+        404: {"description": "Run not found"},
+    },
+)
+@base_router.get("/runs/{run_id}/profile/", response_class=PlainTextResponse, include_in_schema=False)
+async def get_run_profile(
+    run_id: str = Path(..., description="The id of the task run or the workflow run.", examples=["tsk_123", "wr_123"]),
+    current_org: Organization = Depends(org_auth_service.get_current_org),
+) -> PlainTextResponse:
+    analytics.capture("skyvern-oss-run-profile-get")
+    run = await app.DATABASE.get_run(run_id, organization_id=current_org.organization_id)
+    if not run:
+        raise HTTPException(
+            status_code=http_status.HTTP_404_NOT_FOUND,
+            detail=f"Run not found {run_id}",
+        )
+
+    if run.task_run_type == RunType.task_v2:
+        task_v2 = await app.DATABASE.get_task_v2(task_v2_id=run_id, organization_id=current_org.organization_id)
+        workflow_run_id = task_v2.workflow_run_id if task_v2 else None
+    elif run.task_run_type == RunType.workflow_run:
+        workflow_run_id = run_id
+    else:
+        steps = await app.DATABASE.get_task_steps(run_id, organization_id=current_org.organization_id)
+        return PlainTextResponse(to_collapsed_stacks(steps))
+
+    # the tasks of a workflow run are the root frames
+    stacks: list[str] = []
+    tasks = await app.DATABASE.get_tasks_by_workflow_run_id(workflow_run_id) if workflow_run_id else []
+    for task in tasks:
+        steps = await app.DATABASE.get_task_steps(task.task_id, organization_id=current_org.organization_id)
+        stacks.append(to_collapsed_stacks(steps, root_frame=task.task_id))
+    return PlainTextResponse("".join(stacks))
+
+
 @base_router.get(
     "/runs/{run_id}/timeline",
     tags=["Agent", "Workflows"],
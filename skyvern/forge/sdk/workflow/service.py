@@ -2277,6 +2277,8 @@ class WorkflowService:
         close_browser_on_completion = (
             close_browser_on_completion and browser_session_id is None and not workflow_run.browser_address
         )
+        # the captures after the last actions must not overwrite the final artifacts of the workflow run
+        await app.ARTIFACT_MANAGER.flush_captures(all_workflow_task_ids)
         browser_state = await app.BROWSER_MANAGER.cleanup_for_workflow_run(
             workflow_run.workflow_run_id,
             all_workflow_task_ids,
@@ -2444,12 +2446,13 @@ class WorkflowService:
             workflow_id=workflow.workflow_id,
             workflow_run_id=workflow_run.workflow_run_id,
             browser_state=browser_state,
+            load_data=False,
         )
         for video_artifact in video_artifacts:
-            await app.ARTIFACT_MANAGER.update_artifact_data(
-                artifact_id=video_artifact.video_artifact_id,
+            await app.ARTIFACT_MANAGER.update_recording_artifact(
+                video_artifact=video_artifact,
                 organization_id=workflow_run.organization_id,
-                data=video_artifact.video_data,
+                final=True,
             )
 
     async def persist_har_data(
@@ -6,11 +6,14 @@ from pydantic import BaseModel
 from skyvern.constants import DEFAULT_MAX_TOKENS
 from skyvern.errors.errors import UserDefinedError
 from skyvern.forge.sdk.prompting import PromptEngine
-from skyvern.utils.token_counter import count_tokens
+from skyvern.utils.token_counter import count_tokens, count_tokens_cached, exceeds_token_limit
 from skyvern.webeye.scraper.scraper import ElementTreeBuilder
 
 LOG = structlog.get_logger()
 
+# how many times the economy tree is pruned again when the prompt is still over the max tokens
+ECONOMY_TREE_MAX_PRUNING_ATTEMPTS = 3
+
 
 class CheckPhoneNumberFormatResponse(BaseModel):
     page_info: str
@@ -50,36 +53,55 @@ def load_prompt_with_elements(
         elements=elements,
         **kwargs,
     )
-    token_count = count_tokens(prompt)
-    if token_count > DEFAULT_MAX_TOKENS and element_tree_builder.support_economy_elements_tree():
-        # get rid of all the secondary elements like SVG, etc
-        economy_elements_tree = element_tree_builder.build_economy_elements_tree(
-            html_need_skyvern_attrs=html_need_skyvern_attrs
+    if not element_tree_builder.support_economy_elements_tree() or not exceeds_token_limit(prompt, DEFAULT_MAX_TOKENS):
+        return prompt
+
+    # instead of rendering and counting the economy tree and its truncated version, turn the token budget left for the
+    # elements into a length budget, and build the economy tree within it in a single pass
+    prompt_token_count_without_elements = count_tokens(prompt_engine.load_prompt(template_name, elements="", **kwargs))
+    elements_token_budget = DEFAULT_MAX_TOKENS - prompt_token_count_without_elements
+    if elements_token_budget <= 0:
+        LOG.warning(
+            "Prompt is longer than the max tokens without the elements. Going to drop the elements.",
+            template_name=template_name,
+            prompt_token_count_without_elements=prompt_token_count_without_elements,
+            max_tokens=DEFAULT_MAX_TOKENS,
+        )
+        elements_token_budget = 0
+    # the elements are cached by the text, so their count is reused by the other prompts built with the same elements
+    elements_token_count = count_tokens_cached(elements)
+    tokens_per_char = max(elements_token_count, 1) / max(len(elements), 1)
+    max_length = int(elements_token_budget / tokens_per_char)
+    economy_elements_tree = ""
+    for attempt in range(ECONOMY_TREE_MAX_PRUNING_ATTEMPTS):
+        economy_elements_tree = element_tree_builder.build_economy_elements_tree_within_budget(
+            max_length=max_length,
+            html_need_skyvern_attrs=html_need_skyvern_attrs,
         )
-        prompt = prompt_engine.load_prompt(template_name, elements=economy_elements_tree, **kwargs)
-        economy_token_count = count_tokens(prompt)
+        economy_token_count = count_tokens_cached(economy_elements_tree)
+        LOG.warning(
+            "Prompt is longer than the max tokens. Going to use the economy elements tree within the token budget.",
+            template_name=template_name,
+            attempt=attempt,
+            token_count=prompt_token_count_without_elements + elements_token_count,
+            economy_token_count=prompt_token_count_without_elements + economy_token_count,
+            elements_length=len(elements),
+            economy_elements_length=len(economy_elements_tree),
+            max_tokens=DEFAULT_MAX_TOKENS,
+        )
+        if economy_token_count <= elements_token_budget or not economy_elements_tree:
+            break
+        # the kept elements have more tokens per character than the whole tree, prune again with their own ratio
+        tokens_per_char = max(tokens_per_char, economy_token_count / len(economy_elements_tree))
+        max_length = min(int(elements_token_budget / tokens_per_char), int(len(economy_elements_tree) * 0.9))
+
+    prompt = prompt_engine.load_prompt(template_name, elements=economy_elements_tree, **kwargs)
+    token_count = count_tokens_cached(prompt)
+    if token_count > DEFAULT_MAX_TOKENS:
         LOG.warning(
-            "Prompt is longer than the max tokens. Going to use the economy elements tree.",
+            "Prompt is still longer than the max tokens with the economy elements tree.",
             template_name=template_name,
             token_count=token_count,
-            economy_token_count=economy_token_count,
             max_tokens=DEFAULT_MAX_TOKENS,
         )
-        if economy_token_count > DEFAULT_MAX_TOKENS:
-            # !!! HACK alert
-            # dump the last 1/3 of the html context and keep the first 2/3 of the html context
-            economy_elements_tree_dumped = element_tree_builder.build_economy_elements_tree(
-                html_need_skyvern_attrs=html_need_skyvern_attrs,
-                percent_to_keep=2 / 3,
-            )
-            prompt = prompt_engine.load_prompt(template_name, elements=economy_elements_tree_dumped, **kwargs)
-            token_count_after_dump = count_tokens(prompt)
-            LOG.warning(
-                "Prompt is still longer than the max tokens. Will only keep the first 2/3 of the html context.",
-                template_name=template_name,
-                token_count=token_count,
-                economy_token_count=economy_token_count,
-                token_count_after_dump=token_count_after_dump,
-                max_tokens=DEFAULT_MAX_TOKENS,
-            )
     return prompt
@@ -1,5 +1,86 @@
+import asyncio
+import functools
+import threading
+from collections import OrderedDict
+
 import tiktoken
 
+TOKEN_COUNTING_MODEL = "gpt-4o"
+# average characters per token of the scraped HTML and the prompts, used by the estimates.
+# scripts/benchmarks/bench_token_counter.py measures it on the recorded pages
+ESTIMATED_CHARS_PER_TOKEN = 3.5
+# texts longer than this are encoded in a thread by the async functions, so they don't block the event loop
+ASYNC_COUNT_TOKENS_MIN_LENGTH = 50_000
+FRAGMENT_TOKENS_CACHE_SIZE = 1024
+
+
+@functools.cache
+def get_encoding() -> tiktoken.Encoding:
+    return tiktoken.encoding_for_model(TOKEN_COUNTING_MODEL)
+
 
 def count_tokens(text: str) -> int:
-    return len(tiktoken.encoding_for_model("gpt-4o").encode(text))
+    # the special tokens are counted as plain text, the page content can include them
+    return len(get_encoding().encode_ordinary(text))
+
+
+# keyed by the hash and the length of the text instead of the text, so the cache doesn't keep the big texts alive
+_fragment_tokens_cache: OrderedDict[tuple[int, int], int] = OrderedDict()
+_fragment_tokens_cache_lock = threading.Lock()
+
+
+def count_tokens_cached(text: str) -> int:
+    """
+    The same as count_tokens, cached by the text. For the texts counted repeatedly, like the element tree of a page
+    which is put into several prompts of a step.
+    """
+    key = (hash(text), len(text))
+    with _fragment_tokens_cache_lock:
+        token_count = _fragment_tokens_cache.get(key)
+        if token_count is not None:
+            _fragment_tokens_cache.move_to_end(key)
+            return token_count
+
+    token_count = count_tokens(text)
+    with _fragment_tokens_cache_lock:
+        _fragment_tokens_cache[key] = token_count
+        if len(_fragment_tokens_cache) > FRAGMENT_TOKENS_CACHE_SIZE:
+            _fragment_tokens_cache.popitem(last=False)
+    return token_count
+
+
+def estimate_tokens(text: str) -> int:
+    return int(len(text) / ESTIMATED_CHARS_PER_TOKEN)
+
+
+def _max_tokens_bound(text: str) -> int:
+    """
+    The most tokens the text can be encoded into. A token is at least one byte of the UTF-8 encoded text, so unlike the
+    estimate, it holds for the dense texts as well (e.g. CJK or base64, about one char per token).
+    """
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def exceeds_token_limit(text: str, max_tokens: int) -> bool:
+    """
+    Whether the text has more than max_tokens tokens. The text is only encoded when it's long enough to possibly
+    exceed max_tokens.
+    """
+    if _max_tokens_bound(text) <= max_tokens:
+        return False
+    return count_tokens_cached(text) > max_tokens
+
+
+async def count_tokens_async(text: str) -> int:
+    if len(text) < ASYNC_COUNT_TOKENS_MIN_LENGTH:
+        return count_tokens(text)
+    # tiktoken releases the GIL while encoding
+    return await asyncio.to_thread(count_tokens, text)
+
+
+async def exceeds_token_limit_async(text: str, max_tokens: int) -> bool:
+    if _max_tokens_bound(text) <= max_tokens:
+        return False
+    if len(text) < ASYNC_COUNT_TOKENS_MIN_LENGTH:
+        return count_tokens_cached(text) > max_tokens
+    return await asyncio.to_thread(count_tokens_cached, text) > max_tokens
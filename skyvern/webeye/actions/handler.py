@@ -7,7 +7,7 @@ import urllib.parse
 import uuid
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Awaitable, Callable, List
+from typing import Any, Awaitable, Callable, List, TypeGuard
 
 import pyotp
 import structlog
@@ -106,11 +106,13 @@ from skyvern.webeye.scraper.scraper import (
     ElementTreeFormat,
     IncrementalScrapePage,
     ScrapedPage,
+    copy_element_tree,
     hash_element,
     json_to_html,
     trim_element_tree,
 )
 from skyvern.webeye.utils.dom import COMMON_INPUT_TAGS, DomUtil, InteractiveElement, SkyvernElement
+from skyvern.webeye.utils.locator_cache import mark_dom_changed
 from skyvern.webeye.utils.page import SkyvernFrame
 
 LOG = structlog.get_logger()
@@ -527,6 +529,25 @@ class ActionHandler:
 
             await app.DATABASE.create_action(action=action)
 
+    @staticmethod
+    async def handle_batch_filled_action(task: Task, action: Action) -> list[ActionResult]:
+        """
+        The input text action was filled by fill_input_text_actions_in_batch, it's only recorded like _handle_action
+        records a successful action.
+        """
+        LOG.info("Handling action filled in batch", action=action)
+        action.status = ActionStatus.completed
+        llm_caller = LLMCallerManager.get_llm_caller(task.task_id)
+        if llm_caller and action.tool_call_id:
+            tool_call_result = {
+                "type": "tool_result",
+                "tool_use_id": action.tool_call_id,
+                "content": "Tool executed successfully",
+            }
+            llm_caller.add_tool_result(tool_call_result)
+        await app.DATABASE.create_action(action=action)
+        return [ActionSuccess()]
+
     @staticmethod
     async def _handle_action(
         scraped_page: ScrapedPage,
@@ -536,6 +557,8 @@ class ActionHandler:
         action: Action,
     ) -> list[ActionResult]:
         LOG.info("Handling action", action=action)
+        # the previous actions might have changed the DOM, the elements are checked in the page again
+        mark_dom_changed(page)
         actions_result: list[ActionResult] = []
         llm_caller = LLMCallerManager.get_llm_caller(task.task_id)
         try:
@@ -759,9 +782,9 @@ async def handle_click_action(
             try:
                 if has_onclick_attr:
                     LOG.info(
-                        "The element has onclick attribute, waiting for 1 second to load new elements", action=action
+                        "The element has onclick attribute, waiting up to 1 second to load new elements", action=action
                     )
-                    await skyvern_frame.safe_wait_for_animation_end(before_wait_sec=1)
+                    await incremental_scraped.wait_for_dom_settled(change_timeout_sec=1)
 
                 if sequential_click_result := await handle_sequential_click_for_dropdown(
                     action=action,
@@ -1189,10 +1212,10 @@ async def handle_input_text_action(
 
         wait_sec = 0
         if has_onclick_attr:
-            LOG.info("The element has onclick attribute, waiting for 1 second to load new elements", action=action)
+            LOG.info("The element has onclick attribute, waiting up to 1 second to load new elements", action=action)
             wait_sec = 1
 
-        await skyvern_frame.safe_wait_for_animation_end(before_wait_sec=wait_sec)
+        await incremental_scraped.wait_for_dom_settled(change_timeout_sec=wait_sec)
         incremental_element = await incremental_scraped.get_incremental_element_tree(
             clean_and_remove_element_tree_factory(
                 task=task, step=step, check_filter_funcs=[check_existed_but_not_option_element_in_dom_factory(dom)]
@@ -1492,6 +1515,112 @@ async def handle_input_text_action(
             await skyvern_element.press_key("Tab")
 
 
+# the input types taking the text as it is, the others need the format checks (e.g. tel, date) or the select logic
+BATCH_INPUT_TYPES = {"text", "email", "url", "password"}
+# the attributes of the inputs that react to the typing, e.g. open a dropdown
+BATCH_INPUT_EXCLUDED_ATTRS = ["list", "aria-autocomplete", "aria-haspopup", "aria-expanded", "onclick", "data-x-bind"]
+BATCH_INPUT_EXCLUDED_ROLES = {"combobox", "searchbox", "spinbutton"}
+
+
+def is_batch_input_action(action: Action, scraped_page: ScrapedPage) -> TypeGuard[InputTextAction]:
+    """
+    Whether the action inputs text to a plain text input of the main frame, which needs neither the auto completion
+    nor the format checks nor the TOTP handling of handle_input_text_action.
+    """
+    if not isinstance(action, InputTextAction) or not action.element_id or not action.text:
+        return False
+    if action.totp_timing_info:
+        return False
+    if action.text in (BitwardenConstants.TOTP, OnePasswordConstants.TOTP, AzureVaultConstants.TOTP):
+        return False
+    if scraped_page.id_to_frame_dict.get(action.element_id) != "main.frame":
+        return False
+    if action.element_id not in scraped_page.id_to_css_dict:
+        return False
+
+    element = scraped_page.id_to_element_dict.get(action.element_id)
+    if not element or element.get("isSelectable", False):
+        return False
+    attributes: dict = element.get("attributes", {})
+    tag_name = element.get("tagName", "")
+    if tag_name == InteractiveElement.INPUT:
+        if str(attributes.get("type") or "text").lower() not in BATCH_INPUT_TYPES:
+            return False
+        # maxlength=6 or maxlength=1 usually means it's an OTP input field
+        if str(attributes.get("maxlength")) in ["1", "6"]:
+            return False
+    elif tag_name != "textarea":
+        return False
+
+    if any(attr in attributes for attr in BATCH_INPUT_EXCLUDED_ATTRS):
+        return False
+    if str(attributes.get("role", "")).lower() in BATCH_INPUT_EXCLUDED_ROLES:
+        return False
+    class_name = str(attributes.get("class", "")).lower()
+    if "autocomplete" in class_name or "blinking-cursor" in class_name:
+        return False
+    return True
+
+
+async def fill_input_text_actions_in_batch(
+    all_actions: list[Action],
+    start_idx: int,
+    page: Page,
+    scraped_page: ScrapedPage,
+    task: Task,
+    step: Step,
+) -> dict[int, bool]:
+    """
+    Fill the consecutive plain text inputs starting at the action of start_idx in one page round trip.
+    :return: the action index -> whether it's filled, for the actions in the batch. The inputs are filled in order up
+        to the first one which can't be filled, it and the ones after it go through handle_input_text_action like the
+        others. Empty when there's no batch of at least two actions.
+    """
+    # the batch skips the handler, so the setup and the teardown of the input text actions would be skipped as well
+    if (
+        ActionType.INPUT_TEXT in ActionHandler._setup_action_types
+        or ActionType.INPUT_TEXT in ActionHandler._teardown_action_types
+    ):
+        return {}
+
+    batch: dict[int, InputTextAction] = {}
+    element_ids: set[str] = set()
+    for action_idx in range(start_idx, len(all_actions)):
+        action = all_actions[action_idx]
+        if not is_batch_input_action(action, scraped_page) or action.element_id in element_ids:
+            break
+        if check_for_invalid_web_action(action, page, scraped_page, task, step):
+            break
+        # the secrets are resolved and masked by handle_input_text_action
+        if await get_actual_value_of_parameter_if_secret(task, action.text) != action.text:
+            break
+        batch[action_idx] = action
+        element_ids.add(action.element_id)
+
+    if len(batch) < 2:
+        return {}
+
+    inputs = [
+        {"id": action.element_id, "css": scraped_page.id_to_css_dict[action.element_id], "text": action.text}
+        for action in batch.values()
+    ]
+    try:
+        skyvern_frame = await SkyvernFrame.create_instance(frame=page)
+        filled_ids = await skyvern_frame.fill_inputs_in_batch(inputs)
+    except Exception:
+        LOG.warning("Failed to fill the inputs in batch, filling them one by one", exc_info=True)
+        filled_ids = set()
+
+    filled = {action_idx: action.element_id in filled_ids for action_idx, action in batch.items()}
+    LOG.info(
+        "Filled the inputs in batch",
+        num_inputs=len(batch),
+        num_filled=len(filled_ids),
+        not_filled_element_ids=[action.element_id for action in batch.values() if action.element_id not in filled_ids],
+    )
+    return filled
+
+
 @TraceManager.traced_async(ignore_inputs=["scraped_page", "page"])
 async def handle_upload_file_action(
     action: actions.UploadFileAction,
@@ -1804,7 +1933,7 @@ async def handle_select_option_action(
 
         await skyvern_element.click(page=page, dom=dom, timeout=timeout)
         # wait for options to load
-        await skyvern_frame.safe_wait_for_animation_end(before_wait_sec=0.5)
+        await incremental_scraped.wait_for_dom_settled(change_timeout_sec=0.5)
 
         incremental_element = await incremental_scraped.get_incremental_element_tree(
             clean_and_remove_element_tree_factory(
@@ -1820,7 +1949,7 @@ async def handle_select_option_action(
             await skyvern_element.scroll_into_view()
             await skyvern_element.press_key("ArrowDown")
             # wait for options to load
-            await skyvern_frame.safe_wait_for_animation_end(before_wait_sec=0.5)
+            await incremental_scraped.wait_for_dom_settled(change_timeout_sec=0.5)
             incremental_element = await incremental_scraped.get_incremental_element_tree(
                 clean_and_remove_element_tree_factory(
                     task=task, step=step, check_filter_funcs=[check_existed_but_not_option_element_in_dom_factory(dom)]
@@ -2468,7 +2597,7 @@ async def choose_auto_completion_dropdown(
     try:
         await skyvern_element.press_fill(text)
         # wait for new elemnts to load
-        await skyvern_frame.safe_wait_for_animation_end(before_wait_sec=1)
+        await incremental_scraped.wait_for_dom_settled(change_timeout_sec=1)
         incremental_element = await incremental_scraped.get_incremental_element_tree(
             clean_and_remove_element_tree_factory(
                 task=task, step=step, check_filter_funcs=[check_existed_but_not_option_element_in_dom_factory(dom)]
@@ -2855,7 +2984,7 @@ async def sequentially_select_from_dropdown(
             selected_time=i + 1,
         )
         # wait to load new options
-        await skyvern_frame.safe_wait_for_animation_end(before_wait_sec=0.5)
+        await incremental_scraped.wait_for_dom_settled(change_timeout_sec=0.5)
 
         check_filter_funcs.append(
             check_disappeared_element_id_in_incremental_factory(incremental_scraped=incremental_scraped)
@@ -3544,7 +3673,7 @@ async def scroll_down_to_load_all_options(
         await page.mouse.wheel(0, -1e-5)
         await page.mouse.wheel(0, 1e-5)
         # wait for while to load new options
-        await skyvern_frame.safe_wait_for_animation_end(before_wait_sec=0.5)
+        await incremental_scraped.wait_for_dom_settled(change_timeout_sec=0.5)
 
         current_num = await incremental_scraped.get_incremental_elements_num()
         LOG.info(
@@ -3880,8 +4009,8 @@ async def _get_input_or_select_context(
                     frame=skyvern_element.get_frame_id(),
                 )
                 clean_up_func = app.AGENT_FUNCTION.cleanup_element_tree_factory(step=step)
-                element_tree = await clean_up_func(skyvern_element.get_frame(), "", copy.deepcopy(element_tree))
-                element_tree_trimmed = trim_element_tree(copy.deepcopy(element_tree))
+                element_tree = await clean_up_func(skyvern_element.get_frame(), "", copy_element_tree(element_tree))
+                element_tree_trimmed = trim_element_tree(copy_element_tree(element_tree))
                 element_tree_builder = ScrapedPage(
                     elements=elements,
                     element_tree=element_tree,
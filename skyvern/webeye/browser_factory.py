@@ -34,9 +34,11 @@ from skyvern.exceptions import (
     UnknownErrorWhileCreatingBrowserContext,
 )
 from skyvern.forge.sdk.api.files import get_download_dir, make_temp_directory
+from skyvern.forge.sdk.artifact.storage.base import ChunkedArtifactUpload
 from skyvern.forge.sdk.core.skyvern_context import current, ensure_context
 from skyvern.schemas.runs import ProxyLocation, get_tzinfo_from_proxy
-from skyvern.webeye.utils.page import ScreenshotMode, SkyvernFrame
+from skyvern.webeye.utils.page import ScreenshotMode, SkyvernFrame, add_dom_utils_init_script
+from skyvern.webeye.utils.page_settle import track_page_network
 
 LOG = structlog.get_logger()
 
@@ -286,6 +288,9 @@ class BrowserContextFactory:
             if settings.BROWSER_LOGS_ENABLED:
                 set_browser_console_log(browser_context=browser_context, browser_artifacts=browser_artifacts)
             set_download_file_listener(browser_context=browser_context, **kwargs)
+            await add_dom_utils_init_script(browser_context)
+            # track the requests of the pages from the start, the waits after the actions need them
+            browser_context.on("page", track_page_network)
 
             proxy_location: ProxyLocation | None = kwargs.get("proxy_location")
             if proxy_location is not None:
@@ -309,6 +314,16 @@ class VideoArtifact(BaseModel):
     video_path: str | None = None
     video_artifact_id: str | None = None
     video_data: bytes = b""
+    # the chunked upload of the recording, it lives as long as the browser state
+    _chunked_upload: ChunkedArtifactUpload | None = PrivateAttr(default=None)
+
+    @property
+    def chunked_upload(self) -> ChunkedArtifactUpload | None:
+        return self._chunked_upload
+
+    @chunked_upload.setter
+    def chunked_upload(self, upload: ChunkedArtifactUpload | None) -> None:
+        self._chunked_upload = upload
 
 
 class BrowserArtifacts(BaseModel):
@@ -250,6 +250,7 @@ class BrowserManager:
         task_id: str = "",
         workflow_id: str = "",
         workflow_run_id: str = "",
+        load_data: bool = True,
     ) -> list[VideoArtifact]:
         if len(browser_state.browser_artifacts.video_artifacts) == 0:
             LOG.warning(
@@ -260,6 +261,10 @@ class BrowserManager:
             )
             return []
 
+        if not load_data:
+            # the recordings are uploaded from their paths
+            return browser_state.browser_artifacts.video_artifacts
+
         for i, video_artifact in enumerate(browser_state.browser_artifacts.video_artifacts):
             path = video_artifact.video_path
             if path and os.path.exists(path=path):
@@ -311,6 +316,8 @@ class BrowserManager:
         LOG.info("Closing BrowserManager")
         for browser_state in cls.pages.values():
             await browser_state.close()
+            # the recordings of these browser states won't get their final upload
+            await app.ARTIFACT_MANAGER.abort_recording_uploads(browser_state.browser_artifacts.video_artifacts)
         cls.pages = dict()
         LOG.info("BrowserManger is closed")
 
@@ -378,6 +385,8 @@ class BrowserManager:
                     task_id=task_id,
                     workflow_run_id=workflow_run_id,
                 )
+            # a recording upload which the task block didn't complete won't be completed anymore
+            await app.ARTIFACT_MANAGER.abort_recording_uploads(task_browser_state.browser_artifacts.video_artifacts)
         LOG.info("Workflow run is cleaned up")
 
         if browser_session_id:
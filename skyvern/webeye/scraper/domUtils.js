@@ -94,6 +94,14 @@ class Rect {
 class DomUtils {
   static elementListCache = [];
   static visibleClientRectCache = new WeakMap();
+  // the height of the visible area when it's larger than the viewport, e.g. a capture beyond the viewport
+  static visibleAreaHeight = null;
+  // the time getHoverStylesMap takes in this document, read by the scraper benchmark
+  static hoverStylesMapStats = { calls: 0, cacheHits: 0, durationMs: 0 };
+  // the styles and geometry of the elements during a tree building, see takeLayoutSnapshot
+  static layoutSnapshot = null;
+  // where the tree building time goes, taken by takeTreeBuildTimings
+  static treeBuildTimings = newTreeBuildTimings();
   //
   // Bounds the rect by the current viewport dimensions. If the rect is offscreen or has a height or
   // width < 3 then null is returned instead of a rect.
@@ -105,8 +113,9 @@ class DomUtils {
       rect.right,
       rect.bottom,
     );
+    const visibleHeight = DomUtils.visibleAreaHeight ?? window.innerHeight;
     if (
-      boundedRect.top >= window.innerHeight - 4 ||
+      boundedRect.top >= visibleHeight - 4 ||
       boundedRect.left >= window.innerWidth - 4
     ) {
       return null;
@@ -367,6 +376,82 @@ function getElementComputedStyle(element, pseudo) {
     : undefined;
 }
 
+// the computed style properties the visibility and interactability checks read
+const LAYOUT_STYLE_PROPERTIES = [
+  "display",
+  "visibility",
+  "clip",
+  "pointerEvents",
+  "cursor",
+];
+// the elements beyond it are checked with live reads, the tree building stops at 15000 elements anyway
+const MAX_LAYOUT_SNAPSHOT_ELEMENTS = 100000;
+
+function newTreeBuildTimings() {
+  return {
+    builds: 0,
+    elements: 0,
+    hover_styles_ms: 0,
+    layout_snapshot_ms: 0,
+    visibility_ms: 0,
+    interactability_ms: 0,
+    element_object_ms: 0,
+    total_ms: 0,
+  };
+}
+
+// return the tree building timings since the last call, and reset them
+function takeTreeBuildTimings() {
+  const timings = DomUtils.treeBuildTimings;
+  DomUtils.treeBuildTimings = newTreeBuildTimings();
+  return timings;
+}
+
+// read the computed style and the geometry of all the elements under the starter (shadow DOMs included) in one go.
+// without any DOM write in between, the browser does a single style and layout pass for all the reads, instead of
+// the visibility and interactability checks forcing it again and again across thousands of elements.
+// IntersectionObserver isn't used: its callbacks are asynchronous and the visibility isn't about the viewport.
+function takeLayoutSnapshot(starter) {
+  const snapshot = new Map();
+  const checkVisibilitySupported =
+    !!Element.prototype.checkVisibility &&
+    browserNameForWorkarounds !== "webkit";
+  const stack = [starter];
+  while (stack.length > 0 && snapshot.size < MAX_LAYOUT_SNAPSHOT_ELEMENTS) {
+    const element = stack.pop();
+    if (element.tagName?.toLowerCase() === "head") {
+      continue;
+    }
+    const computedStyle = getElementComputedStyle(element);
+    let style = undefined;
+    if (computedStyle) {
+      style = {};
+      for (const property of LAYOUT_STYLE_PROPERTIES) {
+        style[property] = computedStyle[property];
+      }
+    }
+    snapshot.set(element, {
+      style,
+      rect: element.getBoundingClientRect(),
+      checkVisibility: checkVisibilitySupported
+        ? element.checkVisibility()
+        : null,
+      visible: undefined,
+    });
+    if (element.shadowRoot) {
+      stack.push(...element.shadowRoot.children);
+    }
+    stack.push(...element.children);
+  }
+  return snapshot;
+}
+
+// the computed style properties of LAYOUT_STYLE_PROPERTIES, from the layout snapshot during a tree building
+function getLayoutStyle(element) {
+  const layout = DomUtils.layoutSnapshot?.get(element);
+  return layout ? layout.style : getElementComputedStyle(element);
+}
+
 // from playwright: https://github.com/microsoft/playwright/blob/1b65f26f0287c0352e76673bc5f85bc36c934b55/packages/playwright-core/src/server/injected/domUtils.ts#L76-L98
 function isElementStyleVisibilityVisible(element, style) {
   style = style ?? getElementComputedStyle(element);
@@ -377,7 +462,10 @@ function isElementStyleVisibilityVisible(element, style) {
   // All the browser implement it, but WebKit has a bug which prevents us from using it:
   // https://bugs.webkit.org/show_bug.cgi?id=264733
   // @ts-ignore
-  if (
+  const layout = DomUtils.layoutSnapshot?.get(element);
+  if (layout && layout.checkVisibility !== null) {
+    if (!layout.checkVisibility) return false;
+  } else if (
     Element.prototype.checkVisibility &&
     browserNameForWorkarounds !== "webkit"
   ) {
@@ -414,6 +502,18 @@ function hasASPClientControl() {
 // from playwright: https://github.com/microsoft/playwright/blob/1b65f26f0287c0352e76673bc5f85bc36c934b55/packages/playwright-core/src/server/injected/domUtils.ts#L100-L119
 // NOTE: According this logic, some elements with aria-hidden won't be considered as invisible. And the result shows they are indeed interactable.
 function isElementVisible(element) {
+  // the visibility only depends on the layout snapshot during a tree building, it's checked once per element
+  const layout = DomUtils.layoutSnapshot?.get(element);
+  if (!layout) {
+    return computeElementVisible(element);
+  }
+  if (layout.visible === undefined) {
+    layout.visible = computeElementVisible(element);
+  }
+  return layout.visible;
+}
+
+function computeElementVisible(element) {
   // TODO: This is a hack to not check visibility for option elements
   // because they are not visible by default. We check their parent instead for visibility.
   if (
@@ -432,7 +532,7 @@ function isElementVisible(element) {
     return false;
   }
 
-  const style = getElementComputedStyle(element);
+  const style = getLayoutStyle(element);
   if (!style) return true;
   if (style.display === "contents") {
     // display:contents is not rendered itself, but its child nodes are.
@@ -448,7 +548,9 @@ function isElementVisible(element) {
     return false;
   }
   if (!isElementStyleVisibilityVisible(element, style)) return false;
-  const rect = element.getBoundingClientRect();
+  const rect =
+    DomUtils.layoutSnapshot?.get(element)?.rect ??
+    element.getBoundingClientRect();
   if (rect.width <= 0 || rect.height <= 0) {
     return false;
   }
@@ -614,7 +716,7 @@ function getBlockElementUniqueID(element) {
 }
 
 function isHidden(element) {
-  const style = getElementComputedStyle(element);
+  const style = getLayoutStyle(element);
   if (style?.display === "none") {
     return true;
   }
@@ -745,7 +847,7 @@ function isDOMNodeRepresentDiv(element) {
 function isHoverPointerElement(element, hoverStylesMap) {
   const tagName = element.tagName.toLowerCase();
   const elementClassName = element.className.toString();
-  const elementCursor = getElementComputedStyle(element)?.cursor;
+  const elementCursor = getLayoutStyle(element)?.cursor;
   if (elementCursor === "pointer") {
     return true;
   }
@@ -822,7 +924,7 @@ function isInteractable(element, hoverStylesMap) {
   // element with pointer-events: none should not be considered as interactable
   // but for elements which are disabled, we should not use this logic to test the interactable
   // https://developer.mozilla.org/en-US/docs/Web/CSS/pointer-events#none
-  const elementPointerEvent = getElementComputedStyle(element)?.pointerEvents;
+  const elementPointerEvent = getLayoutStyle(element)?.pointerEvents;
   if (elementPointerEvent === "none" && !element.disabled) {
     return false;
   }
@@ -1628,6 +1730,11 @@ async function buildTreeFromBody(
   ) {
     window.GlobalSkyvernFrameIndex = frame_index;
   }
+  if (window.globalStepMutationObserver === undefined) {
+    // track the mutations during the first building too, see recordTreeBuildDomVersion
+    startStepMutationTracker();
+  }
+  const domVersionAtStart = getDomVersion();
   const maxElementNumber = 15000;
   const elementsAndResultArray = await buildElementTree(
     document.documentElement,
@@ -1637,19 +1744,335 @@ async function buildTreeFromBody(
     maxElementNumber,
   );
   DomUtils.elementListCache = elementsAndResultArray[0];
+  window.globalSkyvernTreeCache = {
+    elements: elementsAndResultArray[0],
+    tree: elementsAndResultArray[1],
+    frame: frame,
+    url: window.location.href,
+    incrementalBuildCount: 0,
+    hasShadowDOM: elementsAndResultArray[0].some(
+      (element) => element.shadowHost,
+    ),
+  };
+  startStepMutationTracker();
+  recordTreeBuildDomVersion(domVersionAtStart);
   return elementsAndResultArray;
 }
 
+// the DOM nodes mutated since the last tree building, used by buildIncrementalTreeFromBody
+function startStepMutationTracker() {
+  if (!document.documentElement) {
+    return;
+  }
+  if (window.globalStepMutationObserver === undefined) {
+    // the version of the DOM of this document, increased on every mutation. see getDomVersion
+    window.globalDomVersionId = Math.random().toString(36).slice(2);
+    window.globalDomVersion = 0;
+    window.globalStepMutationObserver = new MutationObserver(
+      handleStepMutations,
+    );
+    // value/checked/selected changes don't produce any mutation record
+    const onValueChanged = (event) => {
+      window.globalDomVersion++;
+      addStepDirtyNode(event.composedPath()[0] ?? event.target);
+    };
+    document.addEventListener("input", onValueChanged, true);
+    document.addEventListener("change", onValueChanged, true);
+  }
+  // cleanup the older data, the pending mutations still change the DOM version
+  handleStepMutations(window.globalStepMutationObserver.takeRecords());
+  window.globalStepMutationObserver.disconnect();
+  window.globalStepDirtyNodes = new Set();
+  window.globalStepDirtyOverflow = false;
+  window.globalStepMutationObserver.observe(document.documentElement, {
+    attributes: true,
+    childList: true,
+    subtree: true,
+    characterData: true,
+  });
+}
+
+function handleStepMutations(mutationsList) {
+  for (const mutation of mutationsList) {
+    // ignore unique_id change, it's written by the tree building itself
+    if (mutation.attributeName === "unique_id") continue;
+    if (
+      mutation.type === "childList" &&
+      [...mutation.addedNodes, ...mutation.removedNodes].every(
+        (node) => node.id === "boundingBoxContainer",
+      )
+    )
+      continue;
+    window.globalDomVersion++;
+    // the text of a style element can change without changing the fingerprint of the stylesheets
+    if (window.globalHoverStylesMapCache && isStyleSheetMutation(mutation)) {
+      window.globalHoverStylesMapCache = undefined;
+    }
+    addStepDirtyNode(mutation.target);
+  }
+}
+
+function getDomVersion() {
+  // an opaque version of the DOM, changed by any mutation since the last call.
+  // null before the first tree building started the mutation tracking, the DOM can't be versioned then
+  if (window.globalStepMutationObserver === undefined) {
+    return null;
+  }
+  // the pending mutations are only delivered to the observer after the current task
+  handleStepMutations(window.globalStepMutationObserver.takeRecords());
+  return `${window.globalDomVersionId}:${window.globalDomVersion}`;
+}
+
+// the DOM version the last element tree was built from, null when the DOM changed during the building
+function recordTreeBuildDomVersion(domVersionAtStart) {
+  const domVersion = getDomVersion();
+  window.globalTreeBuildDomVersion =
+    domVersion === domVersionAtStart ? domVersion : null;
+}
+
+function hashString(hash, str) {
+  // FNV-1a
+  for (let i = 0; i < str.length; i++) {
+    hash ^= str.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash;
+}
+
+// a cheap fingerprint of the page the last element tree was built from: DOM version, url, scroll position,
+// viewport size and a structural hash. "untracked" when no element tree was built in this document.
+// null when the DOM changed since the last tree building, the element tree of the page is outdated then
+function getDomFingerprint() {
+  if (window.globalTreeBuildDomVersion === undefined) {
+    return "untracked";
+  }
+  const domVersion = getDomVersion();
+  if (domVersion === null || domVersion !== window.globalTreeBuildDomVersion) {
+    return null;
+  }
+  // the content of canvas and video elements changes without any mutation
+  for (const element of document.querySelectorAll("canvas, video")) {
+    if (element.getClientRects().length > 0) {
+      return null;
+    }
+  }
+
+  const elements = document.getElementsByTagName("*");
+  let structureHash = 0x811c9dc5;
+  for (const element of elements) {
+    structureHash = hashString(structureHash, element.tagName);
+    structureHash = hashString(
+      structureHash,
+      String(element.childElementCount),
+    );
+  }
+  return [
+    domVersion,
+    window.location.href,
+    `${window.scrollX},${window.scrollY}`,
+    `${window.innerWidth}x${window.innerHeight}`,
+    `${elements.length}:${(structureHash >>> 0).toString(16)}`,
+  ].join("|");
+}
+
+function addStepDirtyNode(node) {
+  const maxDirtyNodes = 500;
+  if (window.globalStepDirtyOverflow || !window.globalStepDirtyNodes) {
+    return;
+  }
+  const element =
+    node?.nodeType === Node.ELEMENT_NODE ? node : node?.parentElement;
+  if (!element || element.closest("#boundingBoxContainer")) {
+    return;
+  }
+  window.globalStepDirtyNodes.add(element);
+  if (window.globalStepDirtyNodes.size > maxDirtyNodes) {
+    // too many changes, a full tree building is cheaper than patching
+    window.globalStepDirtyOverflow = true;
+    window.globalStepDirtyNodes = new Set();
+  }
+}
+
+function getSameTagNodeIndex(element) {
+  const parent = element.parentElement;
+  if (!parent) {
+    return 1;
+  }
+  const tagName = element.tagName.toLowerCase();
+  let index = 0;
+  for (const sibling of parent.children) {
+    if (sibling.tagName?.toLowerCase() === tagName) {
+      index++;
+    }
+    if (sibling === element) {
+      break;
+    }
+  }
+  return index;
+}
+
+// xpath of the parent and the node index of the element, in the same format as buildElementTree generates
+function getParentXPathAndNodeIndex(element) {
+  if (element.getRootNode() !== document) {
+    // FIXME: xpath won't work when the element is in shadow DOM
+    return [null, 0];
+  }
+  let xpath = "";
+  for (let node = element.parentElement; node; node = node.parentElement) {
+    xpath =
+      "/" +
+      '*[name()="' +
+      node.tagName.toLowerCase() +
+      '"]' +
+      "[" +
+      getSameTagNodeIndex(node) +
+      "]" +
+      xpath;
+  }
+  return [xpath, getSameTagNodeIndex(element)];
+}
+
+// rebuild only the DOM subtrees mutated since the last tree building, and reuse the cached element objects for the rest.
+// element ids are kept since they're stored in the unique_id attribute.
+// return null when the caller should do a full buildTreeFromBody instead (navigation, too many changes, shadow DOM, etc)
+async function buildIncrementalTreeFromBody(
+  frame = "main.frame",
+  frame_index = undefined,
+) {
+  const maxIncrementalBuilds = 5;
+  const maxRebuildRoots = 50;
+  if (
+    window.GlobalSkyvernFrameIndex === undefined &&
+    frame_index !== undefined
+  ) {
+    window.GlobalSkyvernFrameIndex = frame_index;
+  }
+
+  // flush the pending mutations into the dirty nodes before they're taken
+  const domVersionAtStart = getDomVersion();
+  const cache = window.globalSkyvernTreeCache;
+  if (
+    !cache ||
+    cache.frame !== frame ||
+    cache.url !== window.location.href ||
+    cache.hasShadowDOM ||
+    cache.incrementalBuildCount >= maxIncrementalBuilds ||
+    !window.globalStepDirtyNodes ||
+    window.globalStepDirtyOverflow
+  ) {
+    return null;
+  }
+
+  let rebuildRoots = [...window.globalStepDirtyNodes].filter(
+    (node) => node.isConnected,
+  );
+  window.globalStepDirtyNodes = new Set();
+  // only rebuild from the outermost mutated nodes
+  rebuildRoots = rebuildRoots.filter(
+    (node) =>
+      !rebuildRoots.some((other) => other !== node && other.contains(node)),
+  );
+  if (rebuildRoots.length > maxRebuildRoots) {
+    return null;
+  }
+  for (const node of rebuildRoots) {
+    const tagName = node.tagName.toLowerCase();
+    if (
+      node === document.documentElement ||
+      node === document.body ||
+      tagName === "style" ||
+      tagName === "link" ||
+      node.closest("head")
+    ) {
+      // the whole page or the stylesheets changed
+      return null;
+    }
+  }
+
+  const idToElement = new Map();
+  for (const element of cache.elements) {
+    idToElement.set(element.id, element);
+  }
+  const idToDOMElement = new Map();
+  for (const domElement of document.querySelectorAll("[unique_id]")) {
+    idToDOMElement.set(domElement.getAttribute("unique_id"), domElement);
+  }
+
+  const hoverStylesMap =
+    rebuildRoots.length > 0 ? await getHoverStylesMap() : undefined;
+  const virtualRoot = { children: cache.tree };
+  let elements = cache.elements;
+  for (const starter of rebuildRoots) {
+    let parentObj = virtualRoot;
+    for (let node = starter.parentElement; node; node = node.parentElement) {
+      const id = node.getAttribute("unique_id");
+      if (id && idToElement.has(id)) {
+        parentObj = idToElement.get(id);
+        break;
+      }
+    }
+
+    const isReplaced = (elementObj) => {
+      const domElement = idToDOMElement.get(elementObj.id);
+      return !domElement || starter.contains(domElement);
+    };
+
+    const [newElements, newTree] = await buildElementTree(
+      starter,
+      frame,
+      false,
+      hoverStylesMap,
+      0,
+      true,
+    );
+
+    const keptChildren = parentObj.children.filter(
+      (child) => !isReplaced(child),
+    );
+    let insertAt = keptChildren.findIndex((child) => {
+      const domElement = idToDOMElement.get(child.id);
+      return (
+        domElement &&
+        starter.compareDocumentPosition(domElement) &
+          Node.DOCUMENT_POSITION_FOLLOWING
+      );
+    });
+    if (insertAt < 0) {
+      insertAt = keptChildren.length;
+    }
+    keptChildren.splice(insertAt, 0, ...newTree);
+    parentObj.children = keptChildren;
+    elements = elements
+      .filter((element) => !isReplaced(element))
+      .concat(newElements);
+  }
+
+  for (const element of elements) {
+    // rect is only attached by drawBoundingBoxes
+    delete element.rect;
+  }
+  cache.elements = elements;
+  cache.tree = virtualRoot.children;
+  cache.incrementalBuildCount += 1;
+  DomUtils.elementListCache = elements;
+  recordTreeBuildDomVersion(domVersionAtStart);
+  return [elements, cache.tree];
+}
+
 async function buildElementTree(
   starter = document.documentElement,
   frame,
   full_tree = false,
   hoverStylesMap = undefined,
   maxElementNumber = 0,
+  keepStarterXPath = false,
 ) {
+  const timings = DomUtils.treeBuildTimings;
+  const buildStart = performance.now();
   // Generate hover styles map at the start
   if (hoverStylesMap === undefined) {
     hoverStylesMap = await getHoverStylesMap();
+    timings.hover_styles_ms += performance.now() - buildStart;
   }
 
   if (window.GlobalEnableAllTextualElements === undefined) {
@@ -1711,9 +2134,16 @@ async function buildElementTree(
     if (element.shadowRoot) {
       shadowDOMchildren = getChildElements(element.shadowRoot);
     }
+    let checkStart = performance.now();
     const isVisible = isElementVisible(element);
-    if (isVisible && !isHidden(element) && !isScriptOrStyle(element)) {
+    const isShown =
+      isVisible && !isHidden(element) && !isScriptOrStyle(element);
+    timings.visibility_ms += performance.now() - checkStart;
+    if (isShown) {
+      checkStart = performance.now();
       let interactable = isInteractable(element, hoverStylesMap);
+      timings.interactability_ms += performance.now() - checkStart;
+      const elementObjectStart = performance.now();
       let elementObj = null;
       let isParentSVG = null;
       if (interactable) {
@@ -1765,6 +2195,7 @@ async function buildElementTree(
         }
       }
 
+      timings.element_object_ms += performance.now() - elementObjectStart;
       if (elementObj) {
         elementObj.xpath = current_xpath;
         elements.push(elementObj);
@@ -1870,12 +2301,23 @@ async function buildElementTree(
   };
 
   let current_xpath = null;
+  let starter_node_index = 1;
   if (starter === document.documentElement) {
     current_xpath = "";
+  } else if (keepStarterXPath) {
+    [current_xpath, starter_node_index] = getParentXPathAndNodeIndex(starter);
   }
 
-  // setup before parsing the dom
-  await processElement(starter, null, current_xpath, 1);
+  const snapshotStart = performance.now();
+  const outerLayoutSnapshot = DomUtils.layoutSnapshot;
+  DomUtils.layoutSnapshot = takeLayoutSnapshot(starter);
+  timings.layout_snapshot_ms += performance.now() - snapshotStart;
+  try {
+    // setup before parsing the dom
+    await processElement(starter, null, current_xpath, starter_node_index);
+  } finally {
+    DomUtils.layoutSnapshot = outerLayoutSnapshot;
+  }
 
   for (var element of elements) {
     if (
@@ -1897,6 +2339,9 @@ async function buildElementTree(
     trimDuplicatedText(root);
   });
 
+  timings.builds++;
+  timings.elements += elements.length;
+  timings.total_ms += performance.now() - buildStart;
   return [elements, resultArray];
 }
 
@@ -1926,6 +2371,129 @@ async function buildElementsAndDrawBoundingBoxes(
   drawBoundingBoxes(elementsAndResultArray[0]);
 }
 
+async function drawBoundingBoxesForFullPage(
+  captureHeight,
+  frame = "main.frame",
+  frame_index = undefined,
+) {
+  // draw the boxes of all the elements in the top captureHeight pixels of the page, for a capture beyond the viewport
+  removeBoundingBoxes();
+  safeWindowScroll(0, 0);
+  DomUtils.visibleAreaHeight = captureHeight;
+  try {
+    await buildElementsAndDrawBoundingBoxes(frame, frame_index);
+  } finally {
+    DomUtils.visibleAreaHeight = null;
+  }
+}
+
+async function getBoundingBoxRects(
+  captureHeight = null,
+  frame = "main.frame",
+  frame_index = undefined,
+) {
+  // the rects drawBoundingBoxes would draw, relative to the viewport, without adding anything to the DOM.
+  // the boxes are drawn on the clean screenshot afterwards
+  let elements = DomUtils.elementListCache;
+  if (elements.length === 0) {
+    _jsConsoleWarn("no element list cache, getBoundingBoxRects from scratch");
+    elements = (await buildTreeFromBody(frame, frame_index))[0];
+  }
+  DomUtils.clearVisibleClientRectCache();
+  DomUtils.visibleAreaHeight = captureHeight;
+  try {
+    const rects = [];
+    for (const element of elements) {
+      const domElement = getDOMElementBySkyvenElement(element);
+      const rect = domElement
+        ? DomUtils.getVisibleClientRect(domElement, true)
+        : null;
+      if (rect) {
+        rects.push({
+          id: element.id,
+          interactable: element.interactable,
+          left: rect.left,
+          top: rect.top,
+          right: rect.right,
+          bottom: rect.bottom,
+        });
+      }
+    }
+    return {
+      visibleHeight: captureHeight ?? window.innerHeight,
+      rects: rects,
+    };
+  } finally {
+    DomUtils.visibleAreaHeight = null;
+    DomUtils.clearVisibleClientRectCache();
+  }
+}
+
+const VIRTUALIZED_LIST_SELECTORS = [
+  ".ReactVirtualized__Grid",
+  ".ReactVirtualized__List",
+  "[data-virtuoso-scroller]",
+  "[data-test-id='virtuoso-scroller']",
+  ".cdk-virtual-scroll-viewport",
+  ".ag-body-viewport",
+];
+
+function hasVirtualizedList() {
+  if (document.querySelector(VIRTUALIZED_LIST_SELECTORS.join(","))) {
+    return true;
+  }
+  // accessible virtualized grids declare more rows than they render
+  for (const grid of document.querySelectorAll("[aria-rowcount]")) {
+    const rowCount = parseInt(grid.getAttribute("aria-rowcount"), 10);
+    if (rowCount > grid.querySelectorAll("[role='row']").length) {
+      return true;
+    }
+  }
+  return false;
+}
+
+function hasLargeFixedOverlay() {
+  // sample the viewport, an overlay covering a large part of it shows up under the sample points
+  const viewportArea = window.innerWidth * window.innerHeight;
+  const checked = new Set();
+  for (const xRatio of [0.25, 0.5, 0.75]) {
+    for (const yRatio of [0.25, 0.5, 0.75]) {
+      let element = document.elementFromPoint(
+        window.innerWidth * xRatio,
+        window.innerHeight * yRatio,
+      );
+      while (element && !checked.has(element)) {
+        checked.add(element);
+        const position = getElementComputedStyle(element)?.position;
+        if (position === "fixed" || position === "sticky") {
+          const rect = element.getBoundingClientRect();
+          if (rect.width * rect.height > viewportArea * 0.3) {
+            return true;
+          }
+        }
+        element = element.parentElement;
+      }
+    }
+  }
+  return false;
+}
+
+function getFullPageCaptureInfo() {
+  // the pages rendering different content while scrolling can't be captured in one shot beyond the viewport
+  let needScrolling = null;
+  if (hasVirtualizedList()) {
+    needScrolling = "virtualized list";
+  } else if (hasLargeFixedOverlay()) {
+    needScrolling = "fixed overlay";
+  }
+  return {
+    viewportWidth: window.innerWidth,
+    viewportHeight: window.innerHeight,
+    scrollHeight: document.documentElement.scrollHeight,
+    needScrolling: needScrolling,
+  };
+}
+
 function captchaSolvedCallback() {
   _jsConsoleLog("captcha solved");
   if (!window["captchaSolvedCounter"]) {
@@ -2275,7 +2843,61 @@ function scrollToElementTop(element) {
  * https://stackoverflow.com/questions/7013559/is-there-a-way-to-get-element-hover-style-while-the-element-not-in-hover-state
  * https://stackoverflow.com/questions/17226676/how-to-simulate-a-mouseover-in-pure-javascript-that-activates-the-css-hover
  */
+// the hover styles map is cached until the stylesheets change, parsing every rule is slow on CSS heavy pages
 async function getHoverStylesMap() {
+  const start = performance.now();
+  DomUtils.hoverStylesMapStats.calls++;
+  // taken before parsing, the inaccessible stylesheets recreated by the parsing change it and are parsed again
+  const fingerprint = getStyleSheetsFingerprint();
+  const cache = window.globalHoverStylesMapCache;
+  let hoverMap;
+  if (cache && cache.fingerprint === fingerprint) {
+    DomUtils.hoverStylesMapStats.cacheHits++;
+    hoverMap = cache.hoverMap;
+  } else {
+    hoverMap = await parseHoverStylesMap();
+    window.globalHoverStylesMapCache = { fingerprint, hoverMap };
+  }
+  DomUtils.hoverStylesMapStats.durationMs += performance.now() - start;
+  return hoverMap;
+}
+
+function getStyleSheetsFingerprint() {
+  const parts = [];
+  for (const sheet of document.styleSheets) {
+    let ruleCount = "inaccessible";
+    try {
+      ruleCount = sheet.cssRules.length;
+    } catch (e) {
+      // cross-origin stylesheet
+    }
+    parts.push(`${sheet.href ?? "inline"}:${ruleCount}:${sheet.disabled}`);
+  }
+  return parts.join("|");
+}
+
+function isStyleSheetMutation(mutation) {
+  const isStyleSheetNode = (node) =>
+    node?.nodeName === "STYLE" || node?.nodeName === "LINK";
+  if (
+    isStyleSheetNode(mutation.target) ||
+    isStyleSheetNode(mutation.target.parentNode)
+  ) {
+    return true;
+  }
+  if (mutation.type !== "childList") {
+    return false;
+  }
+  for (const node of mutation.addedNodes) {
+    if (isStyleSheetNode(node)) return true;
+  }
+  for (const node of mutation.removedNodes) {
+    if (isStyleSheetNode(node)) return true;
+  }
+  return false;
+}
+
+async function parseHoverStylesMap() {
   const hoverMap = new Map();
   const sheets = [...document.styleSheets];
 
@@ -2452,6 +3074,101 @@ function asyncSleepFor(ms) {
   return new Promise((resolve) => setTimeout(resolve, ms));
 }
 
+// the animation frames are throttled in the background tabs, don't wait for them longer than the timeout
+function waitForNextFrameOrTimeout(timeoutMs) {
+  return new Promise((resolve) => {
+    const timer = setTimeout(resolve, timeoutMs);
+    requestAnimationFrame(() => {
+      clearTimeout(timer);
+      resolve();
+    });
+  });
+}
+
+// infinite animations (spinners, carousels) never finish, they don't block the settling
+function hasRunningFiniteAnimations(root) {
+  return root.getAnimations({ subtree: true }).some((animation) => {
+    if (animation.playState !== "running") return false;
+    return animation.effect?.getComputedTiming().endTime !== Infinity;
+  });
+}
+
+// wait until the animations of the element and its subtree finish, at most maxWaitMs
+async function waitForElementAnimationsEnd(element, maxWaitMs) {
+  const deadline = performance.now() + maxWaitMs;
+  while (
+    performance.now() < deadline &&
+    element.isConnected &&
+    hasRunningFiniteAnimations(element)
+  ) {
+    await waitForNextFrameOrTimeout(50);
+  }
+}
+
+function markIncrementalDomMutation(mutationsList) {
+  for (const mutation of mutationsList) {
+    // unique_id is written by the element parsing itself
+    if (mutation.attributeName !== "unique_id") {
+      window.globalIncrementLastMutationTime = performance.now();
+      return;
+    }
+  }
+}
+
+async function isIncrementalDomSettled(quietMs) {
+  if ((window.globalIncrementPendingBatches ?? 0) > 0) {
+    return false;
+  }
+  if (
+    window.globalParsedElementCounter &&
+    (await window.globalParsedElementCounter.get()) <
+      (window.globalOneTimeIncrementElements?.length ?? 0)
+  ) {
+    return false;
+  }
+  if (
+    performance.now() - window.globalIncrementLastMutationTime <
+    quietMs
+  ) {
+    return false;
+  }
+  return !hasRunningFiniteAnimations(document);
+}
+
+// wait until the DOM observed by the incremental observer settles: no mutation for the quiet window, all the mutated
+// nodes parsed and no finite animation running. it's checked on every animation frame, so it returns as soon as
+// the page is stable instead of after a fixed wait.
+// when the DOM hasn't changed since the observer started or the last wait returned, wait up to firstChangeMs for
+// the first change.
+async function waitForIncrementalDomSettled(
+  quietMs,
+  timeoutMs,
+  firstChangeMs = 0,
+) {
+  const start = performance.now();
+  const deadline = start + timeoutMs;
+  const changeBaseline = window.globalIncrementChangeBaseline ?? start;
+  let settled = false;
+  while (performance.now() < deadline) {
+    if (
+      !window.globalListnerFlag ||
+      !(window.globalIncrementLastMutationTime > changeBaseline)
+    ) {
+      // nothing changed (or nothing is observed) yet
+      if (performance.now() - start >= firstChangeMs) {
+        settled = true;
+        break;
+      }
+    } else if (await isIncrementalDomSettled(quietMs)) {
+      settled = true;
+      break;
+    }
+    await waitForNextFrameOrTimeout(50);
+  }
+  window.globalIncrementChangeBaseline = performance.now();
+  return { settled, waited_ms: window.globalIncrementChangeBaseline - start };
+}
+
 async function addIncrementalNodeToMap(parentNode, childrenNode) {
   const maxParsedElement = 3000;
   const maxElementToWait = 100;
@@ -2475,11 +3192,11 @@ async function addIncrementalNodeToMap(parentNode, childrenNode) {
 
     try {
       for (const child of childrenNode) {
-        // sleep for a while until animation ends
+        // wait until the animation of the new element ends, instead of sleeping for a fixed time
         if (
           (await window.globalParsedElementCounter.get()) < maxElementToWait
         ) {
-          await asyncSleepFor(300);
+          await waitForElementAnimationsEnd(child, 300);
         }
         // Pass -1 as frame_index to indicate the frame number is not sensitive in this case
         const [_, newNodeTree] = await buildElementTree(
@@ -2505,120 +3222,132 @@ if (window.globalObserverForDOMIncrement === undefined) {
     mutationsList,
     observer,
   ) {
-    // TODO: how to detect duplicated recreate element?
-    for (const mutation of mutationsList) {
-      const node = mutation.target;
-      if (node.nodeType === Node.TEXT_NODE) continue;
-      const tagName = node.tagName?.toLowerCase();
+    markIncrementalDomMutation(mutationsList);
+    // the batch is parsed asynchronously, the DOM isn't settled until it's done
+    window.globalIncrementPendingBatches =
+      (window.globalIncrementPendingBatches ?? 0) + 1;
+    try {
+      await parseIncrementalMutations(mutationsList);
+    } finally {
+      window.globalIncrementPendingBatches--;
+    }
+  });
+}
 
-      // ignore unique_id change to avoid infinite loop about DOM changes
-      if (mutation.attributeName === "unique_id") continue;
+async function parseIncrementalMutations(mutationsList) {
+  // TODO: how to detect duplicated recreate element?
+  for (const mutation of mutationsList) {
+    const node = mutation.target;
+    if (node.nodeType === Node.TEXT_NODE) continue;
+    const tagName = node.tagName?.toLowerCase();
 
-      // if the changing element is dropdown related elements, we should consider
-      // they're the new element as long as the element is still visible on the page
-      if (
-        isDropdownRelatedElement(node) &&
-        getElementComputedStyle(node)?.display !== "none"
-      ) {
-        window.globalOneTimeIncrementElements.push({
-          targetNode: node,
-          newNodes: [node],
-        });
-        await addIncrementalNodeToMap(node, [node]);
-        continue;
-      }
+    // ignore unique_id change to avoid infinite loop about DOM changes
+    if (mutation.attributeName === "unique_id") continue;
 
-      // if they're not the dropdown related elements
-      // we detect the element based on the following rules
-      switch (mutation.type) {
-        case "attributes": {
-          switch (mutation.attributeName) {
-            case "hidden": {
-              if (!node.hidden) {
-                window.globalOneTimeIncrementElements.push({
-                  targetNode: node,
-                  newNodes: [node],
-                });
-                await addIncrementalNodeToMap(node, [node]);
-              }
-              break;
+    // if the changing element is dropdown related elements, we should consider
+    // they're the new element as long as the element is still visible on the page
+    if (
+      isDropdownRelatedElement(node) &&
+      getElementComputedStyle(node)?.display !== "none"
+    ) {
+      window.globalOneTimeIncrementElements.push({
+        targetNode: node,
+        newNodes: [node],
+      });
+      await addIncrementalNodeToMap(node, [node]);
+      continue;
+    }
+
+    // if they're not the dropdown related elements
+    // we detect the element based on the following rules
+    switch (mutation.type) {
+      case "attributes": {
+        switch (mutation.attributeName) {
+          case "hidden": {
+            if (!node.hidden) {
+              window.globalOneTimeIncrementElements.push({
+                targetNode: node,
+                newNodes: [node],
+              });
+              await addIncrementalNodeToMap(node, [node]);
             }
-            case "style": {
-              // TODO: need to confirm that elemnent is hidden previously
-              if (tagName === "body") continue;
-              if (getElementComputedStyle(node)?.display !== "none") {
-                window.globalOneTimeIncrementElements.push({
-                  targetNode: node,
-                  newNodes: [node],
-                });
-                await addIncrementalNodeToMap(node, [node]);
-              }
-              break;
+            break;
+          }
+          case "style": {
+            // TODO: need to confirm that elemnent is hidden previously
+            if (tagName === "body") continue;
+            if (getElementComputedStyle(node)?.display !== "none") {
+              window.globalOneTimeIncrementElements.push({
+                targetNode: node,
+                newNodes: [node],
+              });
+              await addIncrementalNodeToMap(node, [node]);
             }
-            case "class": {
-              if (tagName === "body") continue;
-              if (!mutation.oldValue) continue;
-              const currentClassName = node.className
-                ? node.className.toString()
-                : "";
-              if (
-                !isClassNameIncludesHidden(mutation.oldValue) &&
-                !isClassNameIncludesActivatedStatus(currentClassName) &&
-                !node.hasAttribute("data-menu-uid") && // google framework use this to trace dropdown menu
-                !mutation.oldValue.includes("select__items") &&
-                !(
-                  node.hasAttribute("data-testid") &&
-                  node.getAttribute("data-testid").includes("select-dropdown")
-                )
+            break;
+          }
+          case "class": {
+            if (tagName === "body") continue;
+            if (!mutation.oldValue) continue;
+            const currentClassName = node.className
+              ? node.className.toString()
+              : "";
+            if (
+              !isClassNameIncludesHidden(mutation.oldValue) &&
+              !isClassNameIncludesActivatedStatus(currentClassName) &&
+              !node.hasAttribute("data-menu-uid") && // google framework use this to trace dropdown menu
+              !mutation.oldValue.includes("select__items") &&
+              !(
+                node.hasAttribute("data-testid") &&
+                node.getAttribute("data-testid").includes("select-dropdown")
               )
-                continue;
-              if (getElementComputedStyle(node)?.display !== "none") {
-                window.globalOneTimeIncrementElements.push({
-                  targetNode: node,
-                  newNodes: [node],
-                });
-                await addIncrementalNodeToMap(node, [node]);
-              }
-              break;
+            )
+              continue;
+            if (getElementComputedStyle(node)?.display !== "none") {
+              window.globalOneTimeIncrementElements.push({
+                targetNode: node,
+                newNodes: [node],
+              });
+              await addIncrementalNodeToMap(node, [node]);
             }
+            break;
           }
-          break;
         }
-        case "childList": {
-          let changedNode = {
-            targetNode: node, // TODO: for future usage, when we want to parse new elements into a tree
-          };
-          let newNodes = [];
-          if (mutation.addedNodes && mutation.addedNodes.length > 0) {
-            for (const node of mutation.addedNodes) {
-              // skip the text nodes, they won't be interactable
-              if (node.nodeType === Node.TEXT_NODE) continue;
-              newNodes.push(node);
-            }
-          }
-          if (
-            newNodes.length == 0 &&
-            (tagName === "ul" ||
-              (tagName === "div" &&
-                node.hasAttribute("role") &&
-                node.getAttribute("role").toLowerCase() === "listbox"))
-          ) {
+        break;
+      }
+      case "childList": {
+        let changedNode = {
+          targetNode: node, // TODO: for future usage, when we want to parse new elements into a tree
+        };
+        let newNodes = [];
+        if (mutation.addedNodes && mutation.addedNodes.length > 0) {
+          for (const node of mutation.addedNodes) {
+            // skip the text nodes, they won't be interactable
+            if (node.nodeType === Node.TEXT_NODE) continue;
             newNodes.push(node);
           }
+        }
+        if (
+          newNodes.length == 0 &&
+          (tagName === "ul" ||
+            (tagName === "div" &&
+              node.hasAttribute("role") &&
+              node.getAttribute("role").toLowerCase() === "listbox"))
+        ) {
+          newNodes.push(node);
+        }
 
-          if (newNodes.length > 0) {
-            changedNode.newNodes = newNodes;
-            window.globalOneTimeIncrementElements.push(changedNode);
-            await addIncrementalNodeToMap(
-              changedNode.targetNode,
-              changedNode.newNodes,
-            );
-          }
-          break;
+        if (newNodes.length > 0) {
+          changedNode.newNodes = newNodes;
+          window.globalOneTimeIncrementElements.push(changedNode);
+          await addIncrementalNodeToMap(
+            changedNode.targetNode,
+            changedNode.newNodes,
+          );
         }
+        break;
       }
     }
-  });
+  }
 }
 
 async function startGlobalIncrementalObserver(element = null) {
@@ -2628,6 +3357,8 @@ async function startGlobalIncrementalObserver(element = null) {
   window.globalHoverStylesMap = await getHoverStylesMap();
   window.globalParsedElementCounter = new SafeCounter();
   window.globalObserverForDOMIncrement.takeRecords(); // cleanup the older data
+  window.globalIncrementLastMutationTime = null;
+  window.globalIncrementChangeBaseline = performance.now();
   window.globalObserverForDOMIncrement.observe(document.body, {
     attributes: true,
     attributeOldValue: true,
@@ -2664,15 +3395,24 @@ async function stopGlobalIncrementalObserver() {
   window.globalDomDepthMap = new Map();
 }
 
-async function getIncrementElements(wait_until_finished = true) {
+// return the incremental elements, the tree and the time waited for the DOM to settle in ms
+async function getIncrementElements(
+  wait_until_finished = true,
+  quietMs = 100,
+  settleTimeoutMs = 3000,
+) {
+  const start = performance.now();
   if (wait_until_finished) {
+    await waitForIncrementalDomSettled(quietMs, settleTimeoutMs);
+    // the DOM may keep changing after the settle timeout, the parsed elements are waited anyway
     while (
       (await window.globalParsedElementCounter.get()) <
       window.globalOneTimeIncrementElements.length
     ) {
-      await asyncSleepFor(100);
+      await waitForNextFrameOrTimeout(100);
     }
   }
+  const waitedMs = performance.now() - start;
 
   // cleanup the children tree, remove the duplicated element
   // search starting from the shallowest node:
@@ -2756,7 +3496,110 @@ async function getIncrementElements(wait_until_finished = true) {
     }
   }
 
-  return [Array.from(idToElement.values()), cleanedTreeList];
+  return [Array.from(idToElement.values()), cleanedTreeList, waitedMs];
+}
+
+function markDomQuietMutation(mutationsList) {
+  for (const mutation of mutationsList) {
+    // unique_id is written by the element parsing itself
+    if (mutation.attributeName !== "unique_id") {
+      window.globalLastDomMutationTime = performance.now();
+      return;
+    }
+  }
+}
+
+// the observer is started by the first wait in the document and kept until the document is gone,
+// the next waits see the mutations caused by the actions before them
+function startDomQuietObserver() {
+  if (window.globalObserverForDomQuiet !== undefined) {
+    return;
+  }
+  window.globalLastDomMutationTime = performance.now();
+  window.globalObserverForDomQuiet = new MutationObserver(markDomQuietMutation);
+  window.globalObserverForDomQuiet.observe(document, {
+    attributes: true,
+    childList: true,
+    subtree: true,
+    characterData: true,
+  });
+}
+
+// wait until no DOM mutation happened in the quiet window and no finite animation is running.
+// it's checked on every animation frame, so it returns as soon as the page is stable.
+async function waitForDomQuiet(quietMs, timeoutMs) {
+  startDomQuietObserver();
+  const start = performance.now();
+  const deadline = start + timeoutMs;
+  let settled = false;
+  while (true) {
+    const now = performance.now();
+    if (
+      now - window.globalLastDomMutationTime >= quietMs &&
+      !hasRunningFiniteAnimations(document)
+    ) {
+      settled = true;
+      break;
+    }
+    if (now >= deadline) {
+      break;
+    }
+    await waitForNextFrameOrTimeout(50);
+  }
+  return { settled, waited_ms: performance.now() - start };
+}
+
+// fill the plain text inputs in one call, the events are dispatched like typing would do.
+// the inputs are [{id, css, text}], it returns the ids of the inputs holding their text afterwards.
+// an input is skipped when it can't be found, can't be typed in or doesn't keep the text (e.g. a masked input).
+function fillInputsInBatch(inputs) {
+  // the inputs are filled in order and it stops at the first one which can't be filled,
+  // the inputs after it might depend on it so they're all left to the one by one filling
+  const filledIds = [];
+  for (const input of inputs) {
+    const elements = document.querySelectorAll(input.css);
+    if (elements.length !== 1) {
+      break;
+    }
+    const element = elements[0];
+    if (
+      !isElementVisible(element) ||
+      isHiddenOrDisabled(element) ||
+      isReadonlyElement(element)
+    ) {
+      break;
+    }
+    if (element.value === input.text) {
+      filledIds.push(input.id);
+      continue;
+    }
+
+    // the native setter, the frameworks (e.g. React) track the value set by the property
+    const prototype =
+      element.tagName.toLowerCase() === "textarea"
+        ? HTMLTextAreaElement.prototype
+        : HTMLInputElement.prototype;
+    const valueSetter = Object.getOwnPropertyDescriptor(
+      prototype,
+      "value",
+    ).set;
+    element.focus();
+    valueSetter.call(element, input.text);
+    element.dispatchEvent(
+      new InputEvent("input", {
+        bubbles: true,
+        inputType: "insertText",
+        data: input.text,
+      }),
+    );
+    element.dispatchEvent(new Event("change", { bubbles: true }));
+    element.blur();
+    if (element.value !== input.text) {
+      break;
+    }
+    filledIds.push(input.id);
+  }
+  return filledIds;
 }
 
 function isAnimationFinished() {
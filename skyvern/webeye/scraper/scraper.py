@@ -1,8 +1,10 @@
 import asyncio
-import copy
 import json
+import sys
+import uuid
 from abc import ABC, abstractmethod
 from collections import defaultdict
+from dataclasses import dataclass
 from enum import StrEnum
 from typing import Any, Awaitable, Callable, Self
 
@@ -12,7 +14,7 @@ from playwright.async_api import ElementHandle, Frame, Locator, Page
 from pydantic import BaseModel, PrivateAttr
 
 from skyvern.config import settings
-from skyvern.constants import DEFAULT_MAX_TOKENS, SKYVERN_DIR, SKYVERN_ID_ATTR
+from skyvern.constants import DEFAULT_MAX_TOKENS, DOM_FINGERPRINT_TIMEOUT, SKYVERN_DIR, SKYVERN_ID_ATTR
 from skyvern.exceptions import (
     FailedToTakeScreenshot,
     NoElementFound,
@@ -23,12 +25,19 @@ from skyvern.exceptions import (
 from skyvern.experimentation.wait_utils import empty_page_retry_wait
 from skyvern.forge.sdk.api.crypto import calculate_sha256
 from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.step_profiler import profile_phase
 from skyvern.forge.sdk.settings_manager import SettingsManager
 from skyvern.forge.sdk.trace import TraceManager
 from skyvern.utils.image_resizer import Resolution
-from skyvern.utils.token_counter import count_tokens
+from skyvern.utils.token_counter import exceeds_token_limit_async
 from skyvern.webeye.browser_factory import BrowserState
-from skyvern.webeye.utils.page import SkyvernFrame
+from skyvern.webeye.utils.locator_cache import LOCATOR_CACHE_STATS, LocatorCache, mark_dom_changed
+from skyvern.webeye.utils.page import (
+    DOM_UTILS_INJECTION_STATS,
+    ELEMENT_TREE_BUILD_TIMINGS,
+    PageContentSnapshot,
+    SkyvernFrame,
+)
 
 LOG = structlog.get_logger()
 CleanupElementTreeFunc = Callable[[Page | Frame, str, list[dict]], Awaitable[list[dict]]]
@@ -104,76 +113,154 @@ def build_attribute(key: str, value: Any) -> str:
     return f'{key}="{str(value)}"' if value else key
 
 
-def json_to_html(element: dict, need_skyvern_attrs: bool = True) -> str:
+SELF_CLOSING_TAGS = frozenset({"img", "input", "br", "hr", "meta", "link"})
+
+# the hashed hrefs of a rendered subtree, they're registered into the context again when the fragment is reused
+HashedHrefs = tuple[tuple[str, str], ...]
+
+# every memoized fragment holds the HTML of its whole subtree, so the cache grows with the HTML length times the tree
+# depth. Above this many characters, the new fragments are rendered without being memoized.
+MAX_MEMOIZED_HTML_FRAGMENT_CHARS = 16 * 1024 * 1024
+
+
+class ElementHTMLRenderer:
     """
-    if element is flagged as dropped, the html format is empty
+    Render elements to HTML. The HTML fragment of every rendered element is memoized by the element object and
+    need_skyvern_attrs, so rendering the same tree again, or another tree sharing subtrees with it (like the economy
+    tree), reuses the fragments instead of rendering them again.
+    The rendered elements must not be modified after they're rendered.
+    The elements are rendered children first, so when the cache is full, it's the big fragments near the roots which
+    aren't memoized, and rendering them again only joins the memoized fragments of their children.
     """
-    tag = element["tagName"]
-    attributes: dict[str, Any] = copy.deepcopy(element.get("attributes", {}))
 
-    interactable = element.get("interactable", False)
-    if element.get("isDropped", False):
-        if not interactable:
+    def __init__(self, max_memoized_chars: int = MAX_MEMOIZED_HTML_FRAGMENT_CHARS) -> None:
+        self.max_memoized_chars = max_memoized_chars
+        self.memoized_chars = 0
+        # (id(element), need_skyvern_attrs) -> (element, html, hashed hrefs of the subtree)
+        # the element is kept in the cache, so its id can't be reused by another object
+        self._fragments: dict[tuple[int, bool], tuple[dict, str, HashedHrefs]] = {}
+
+    def clear(self) -> None:
+        self._fragments.clear()
+        self.memoized_chars = 0
+
+    def render(self, element_tree: list[dict], need_skyvern_attrs: bool = True) -> str:
+        if not element_tree:
             return ""
-        else:
-            LOG.debug("Element is interactable. Trimmed all attributes instead of dropping it", element=element)
-            attributes = {}
+        hashed_href_map = skyvern_context.ensure_context().hashed_href_map
+        return "".join([self._render(element, need_skyvern_attrs, hashed_href_map)[0] for element in element_tree])
+
+    def render_element(self, element: dict, need_skyvern_attrs: bool = True) -> str:
+        return self.render([element], need_skyvern_attrs=need_skyvern_attrs)
+
+    def _render(
+        self, element: dict, need_skyvern_attrs: bool, hashed_href_map: dict[str, str]
+    ) -> tuple[str, HashedHrefs]:
+        key = (id(element), need_skyvern_attrs)
+        cached = self._fragments.get(key)
+        if cached is not None:
+            _, html, hashed_hrefs = cached
+            hashed_href_map.update(hashed_hrefs)
+            return html, hashed_hrefs
+
+        html, hashed_hrefs = self._render_uncached(element, need_skyvern_attrs, hashed_href_map)
+        if self.memoized_chars + len(html) <= self.max_memoized_chars:
+            self._fragments[key] = (element, html, hashed_hrefs)
+            self.memoized_chars += len(html)
+        return html, hashed_hrefs
+
+    def _render_uncached(
+        self, element: dict, need_skyvern_attrs: bool, hashed_href_map: dict[str, str]
+    ) -> tuple[str, HashedHrefs]:
+        tag = element["tagName"]
+        attributes: dict[str, Any] = element.get("attributes", {})
 
-    context = skyvern_context.ensure_context()
+        interactable = element.get("interactable", False)
+        if element.get("isDropped", False):
+            if not interactable:
+                return "", ()
+            else:
+                LOG.debug("Element is interactable. Trimmed all attributes instead of dropping it", element=element)
+                attributes = {}
+
+        # the attributes of the element are shared with the element tree, only the overridden ones are copied
+        overridden_attributes: dict[str, Any] = {}
+        hashed_hrefs: HashedHrefs = ()
+
+        # FIXME: Theoretically, all href links with over 69(64+1+4) length could be hashed
+        # but currently, just hash length>150 links to confirm the solution goes well
+        if "href" in attributes and len(attributes.get("href", "")) > 150:
+            href = attributes.get("href", "")
+            # jinja style can't accept the variable name starts with number
+            # adding "_" to make sure the variable name is valid.
+            hashed_href = "_" + calculate_sha256(href)
+            hashed_href_map[hashed_href] = href
+            hashed_hrefs = ((hashed_href, href),)
+            overridden_attributes["href"] = "{{" + hashed_href + "}}"
+
+        if need_skyvern_attrs:
+            # adding the node attribute to attributes
+            for attr in ELEMENT_NODE_ATTRIBUTES:
+                value = element.get(attr)
+                if value is None:
+                    continue
+                overridden_attributes[attr] = value
+
+        if overridden_attributes:
+            attributes = {**attributes, **overridden_attributes}
+
+        attributes_html = " ".join([build_attribute(key, value) for key, value in attributes.items()])
+
+        if element.get("isSelectable", False):
+            tag = "select"
 
-    # FIXME: Theoretically, all href links with over 69(64+1+4) length could be hashed
-    # but currently, just hash length>150 links to confirm the solution goes well
-    if "href" in attributes and len(attributes.get("href", "")) > 150:
-        href = attributes.get("href", "")
-        # jinja style can't accept the variable name starts with number
-        # adding "_" to make sure the variable name is valid.
-        hashed_href = "_" + calculate_sha256(href)
-        context.hashed_href_map[hashed_href] = href
-        attributes["href"] = "{{" + hashed_href + "}}"
-
-    if need_skyvern_attrs:
-        # adding the node attribute to attributes
-        for attr in ELEMENT_NODE_ATTRIBUTES:
-            value = element.get(attr)
-            if value is None:
-                continue
-            attributes[attr] = value
+        text = element.get("text", "")
+        # build children HTML
+        children_parts: list[str] = []
+        for child in element.get("children", []):
+            child_html, child_hashed_hrefs = self._render(child, need_skyvern_attrs, hashed_href_map)
+            children_parts.append(child_html)
+            if child_hashed_hrefs:
+                hashed_hrefs += child_hashed_hrefs
+        children_html = "".join(children_parts)
+        # build option HTML
+        option_html = "".join(
+            [
+                f'<option index="{option.get("optionIndex")}">{option.get("text")}</option>'
+                if option.get("text")
+                else f'<option index="{option.get("optionIndex")}" value="{option.get("value")}">{option.get("text")}</option>'
+                for option in element.get("options", [])
+            ]
+        )
 
-    attributes_html = " ".join(build_attribute(key, value) for key, value in attributes.items())
+        if element.get("purgeable", False):
+            return children_html + option_html, hashed_hrefs
 
-    if element.get("isSelectable", False):
-        tag = "select"
+        before_pseudo_text = element.get("beforePseudoText") or ""
+        after_pseudo_text = element.get("afterPseudoText") or ""
+        start_tag = f"<{tag} {attributes_html}>" if attributes_html else f"<{tag}>"
 
-    text = element.get("text", "")
-    # build children HTML
-    children_html = "".join(
-        json_to_html(child, need_skyvern_attrs=need_skyvern_attrs) for child in element.get("children", [])
-    )
-    # build option HTML
-    option_html = "".join(
-        f'<option index="{option.get("optionIndex")}">{option.get("text")}</option>'
-        if option.get("text")
-        else f'<option index="{option.get("optionIndex")}" value="{option.get("value")}">{option.get("text")}</option>'
-        for option in element.get("options", [])
-    )
+        # Check if the element is self-closing
+        if (
+            tag in SELF_CLOSING_TAGS
+            and not option_html
+            and not children_html
+            and not before_pseudo_text
+            and not after_pseudo_text
+        ):
+            return start_tag, hashed_hrefs
 
-    if element.get("purgeable", False):
-        return children_html + option_html
+        return (
+            f"{start_tag}{before_pseudo_text}{text}{children_html}{option_html}{after_pseudo_text}</{tag}>",
+            hashed_hrefs,
+        )
 
-    before_pseudo_text = element.get("beforePseudoText") or ""
-    after_pseudo_text = element.get("afterPseudoText") or ""
 
-    # Check if the element is self-closing
-    if (
-        tag in ["img", "input", "br", "hr", "meta", "link"]
-        and not option_html
-        and not children_html
-        and not before_pseudo_text
-        and not after_pseudo_text
-    ):
-        return f"<{tag}{attributes_html if not attributes_html else ' ' + attributes_html}>"
-    else:
-        return f"<{tag}{attributes_html if not attributes_html else ' ' + attributes_html}>{before_pseudo_text}{text}{children_html + option_html}{after_pseudo_text}</{tag}>"
+def json_to_html(element: dict, need_skyvern_attrs: bool = True) -> str:
+    """
+    if element is flagged as dropped, the html format is empty
+    """
+    return ElementHTMLRenderer().render_element(element, need_skyvern_attrs=need_skyvern_attrs)
 
 
 def clean_element_before_hashing(element: dict) -> dict:
@@ -190,12 +277,91 @@ def clean_element_before_hashing(element: dict) -> dict:
     return clean_nested(element)
 
 
-def hash_element(element: dict) -> str:
-    hash_ready_element = clean_element_before_hashing(element)
-    # Sort the keys to ensure consistent ordering
-    element_string = json.dumps(hash_ready_element, sort_keys=True)
+HASH_EXCLUDED_KEYS = frozenset({"id", "rect", "frame_index"})
+# the children are serialized separately and spliced into the JSON string of the parent at the placeholder.
+# a random suffix makes sure the placeholder can't collide with the page content
+_HASH_CHILDREN_PLACEHOLDER = f"__skyvern_hash_children_{uuid.uuid4().hex}__"
+_HASH_CHILDREN_PLACEHOLDER_JSON = json.dumps(_HASH_CHILDREN_PLACEHOLDER)
+_hash_json_encoder = json.JSONEncoder(sort_keys=True)
+
+
+def _serialize_element_for_hashing(element: dict, memo: dict[int, str]) -> str:
+    """
+    Produce exactly json.dumps(clean_element_before_hashing(element), sort_keys=True) without deep copying the element.
+    The serialized string of every element is memoized, so a child shared by the elements list and its ancestors
+    is only serialized once.
+    """
+    serialized = memo.get(id(element))
+    if serialized is not None:
+        return serialized
+
+    element_cleaned = {key: value for key, value in element.items() if key not in HASH_EXCLUDED_KEYS}
+    if "attributes" in element_cleaned:
+        element_cleaned["attributes"] = {
+            key: value for key, value in element_cleaned["attributes"].items() if key != SKYVERN_ID_ATTR
+        }
+
+    children = element_cleaned.get("children")
+    if children is None:
+        serialized = _hash_json_encoder.encode(element_cleaned)
+    else:
+        element_cleaned["children"] = _HASH_CHILDREN_PLACEHOLDER
+        children_serialized = "[" + ", ".join(_serialize_element_for_hashing(child, memo) for child in children) + "]"
+        serialized = _hash_json_encoder.encode(element_cleaned).replace(
+            _HASH_CHILDREN_PLACEHOLDER_JSON, children_serialized, 1
+        )
+
+    memo[id(element)] = serialized
+    return serialized
+
+
+def hash_element(element: dict, memo: dict[int, str] | None = None) -> str:
+    """
+    :param memo: Serialized elements shared by the hash calls of the same (unmodified) element tree.
+    """
+    if memo is None:
+        memo = {}
+    return calculate_sha256(_serialize_element_for_hashing(element, memo))
+
+
+def hash_elements(elements: list[dict]) -> list[str]:
+    """
+    Hash all the elements in one pass. Hashes are the same as calling hash_element on each element.
+    """
+    memo: dict[int, str] = {}
+    return [hash_element(element, memo) for element in elements]
+
+
+# the string values repeated by most elements of a page
+INTERNED_ELEMENT_VALUE_KEYS = ("tagName", "frame")
 
-    return calculate_sha256(element_string)
+
+def _intern_keys(value: dict) -> None:
+    items = [(sys.intern(key), item) for key, item in value.items()]
+    value.clear()
+    value.update(items)
+
+
+def intern_element_strings(elements: list[dict]) -> list[dict]:
+    """
+    Intern the keys, tag names, frame names and attribute names of the scraped elements in place.
+    The elements are decoded from the page with a new string object for every key of every element. After interning,
+    all elements share one string object per name, and the lookups with literal keys match by identity.
+    """
+    for element in elements:
+        _intern_keys(element)
+        for key in INTERNED_ELEMENT_VALUE_KEYS:
+            value = element.get(key)
+            if isinstance(value, str):
+                element[key] = sys.intern(value)
+        for key in ("attributes", "rect"):
+            value = element.get(key)
+            if isinstance(value, dict):
+                _intern_keys(value)
+        for option in element.get("options") or []:
+            if isinstance(option, dict):
+                _intern_keys(option)
+    return elements
 
 
 def build_element_dict(
@@ -207,15 +373,14 @@ def build_element_dict(
     id_to_element_hash: dict[str, str] = {}
     hash_to_element_ids: dict[str, list[str]] = {}
 
-    for element in elements:
+    for element, element_hash in zip(elements, hash_elements(elements)):
         element_id: str = element.get("id", "")
         # get_interactable_element_tree marks each interactable element with a unique_id attribute
         id_to_css_dict[element_id] = f"[{SKYVERN_ID_ATTR}='{element_id}']"
         id_to_element_dict[element_id] = element
         id_to_frame_dict[element_id] = element["frame"]
-        element_hash = hash_element(element)
         id_to_element_hash[element_id] = element_hash
-        hash_to_element_ids[element_hash] = hash_to_element_ids.get(element_hash, []) + [element_id]
+        hash_to_element_ids.setdefault(element_hash, []).append(element_id)
 
     return id_to_css_dict, id_to_element_dict, id_to_frame_dict, id_to_element_hash, hash_to_element_ids
 
@@ -245,6 +410,102 @@ class ElementTreeBuilder(ABC):
     ) -> str:
         pass
 
+    def build_economy_elements_tree_within_budget(
+        self,
+        max_length: int,
+        html_need_skyvern_attrs: bool = True,
+    ) -> str:
+        """
+        Render the economy elements tree in at most max_length characters.
+        """
+        element_str = self.build_economy_elements_tree(html_need_skyvern_attrs=html_need_skyvern_attrs)
+        return element_str[: max(max_length, 0)]
+
+
+class _ElementTreePruner:
+    """
+    Cut an element tree down to a target HTML length, using the memoized fragments of the renderer.
+    The pruned trees share the untouched subtrees with the source tree, only the elements whose children changed are
+    shallow copied.
+    """
+
+    def __init__(self, renderer: ElementHTMLRenderer, need_skyvern_attrs: bool) -> None:
+        self._renderer = renderer
+        self._need_skyvern_attrs = need_skyvern_attrs
+        self._actionable: dict[int, bool] = {}
+
+    def length(self, element: dict) -> int:
+        return len(self._renderer.render_element(element, need_skyvern_attrs=self._need_skyvern_attrs))
+
+    def is_actionable(self, element: dict) -> bool:
+        # trim_element only keeps the id of the elements the LLM can act on
+        actionable = self._actionable.get(id(element))
+        if actionable is None:
+            actionable = "id" in element or any(self.is_actionable(child) for child in element.get("children", []))
+            self._actionable[id(element)] = actionable
+        return actionable
+
+    def drop_non_actionable_subtrees(self, element_tree: list[dict], length_to_drop: int) -> list[dict]:
+        """
+        Drop the subtrees without any actionable element, from the end of the page, until length_to_drop is reached.
+        """
+        candidates: list[dict] = []
+
+        def collect(element: dict) -> None:
+            if not self.is_actionable(element):
+                candidates.append(element)
+                return
+            for child in element.get("children", []):
+                collect(child)
+
+        for root in element_tree:
+            collect(root)
+
+        dropped: set[int] = set()
+        for candidate in reversed(candidates):
+            if length_to_drop <= 0:
+                break
+            dropped.add(id(candidate))
+            length_to_drop -= self.length(candidate)
+
+        return self._without(element_tree, dropped)
+
+    def _without(self, elements: list[dict], dropped: set[int]) -> list[dict]:
+        kept = []
+        for element in elements:
+            if id(element) in dropped:
+                continue
+            children = element.get("children")
+            if children:
+                new_children = self._without(children, dropped)
+                if len(new_children) != len(children) or any(
+                    new_child is not child for new_child, child in zip(new_children, children)
+                ):
+                    element = {**element, "children": new_children}
+            kept.append(element)
+        return kept
+
+    def truncate(self, elements: list[dict], max_length: int) -> tuple[list[dict], int]:
+        """
+        Keep the elements in document order, cutting at element boundaries once max_length is reached.
+        :return: the kept elements and the length left.
+        """
+        kept = []
+        for element in elements:
+            length = self.length(element)
+            if length <= max_length:
+                kept.append(element)
+                max_length -= length
+                continue
+
+            children = element.get("children") or []
+            own_length = length - sum(self.length(child) for child in children)
+            if children and own_length <= max_length:
+                new_children, max_length = self.truncate(children, max_length - own_length)
+                kept.append({**element, "children": new_children})
+            break
+        return kept, max_length
+
 
 class ScrapedPage(BaseModel, ElementTreeBuilder):
     """
@@ -254,7 +515,7 @@ class ScrapedPage(BaseModel, ElementTreeBuilder):
     3. The element tree of the page (list of dicts). Each element has children and attributes.
     4. The screenshot (base64 encoded)
     5. The URL of the page
-    6. The HTML of the page
+    6. The HTML of the page, serialized on the first get_html call
     7. The extracted text from the page
     """
 
@@ -276,6 +537,10 @@ class ScrapedPage(BaseModel, ElementTreeBuilder):
     _browser_state: BrowserState = PrivateAttr()
     _clean_up_func: CleanupElementTreeFunc = PrivateAttr()
     _scrape_exclude: ScrapeExcludeFunc | None = PrivateAttr(default=None)
+    _html_renderer: ElementHTMLRenderer = PrivateAttr(default_factory=ElementHTMLRenderer)
+    _page: Page | None = PrivateAttr(default=None)
+    _html_snapshot: PageContentSnapshot | None = PrivateAttr(default=None)
+    _locator_cache: LocatorCache = PrivateAttr(default_factory=LocatorCache)
 
     def __init__(self, **data: Any) -> None:
         missing_attrs = [attr for attr in ["_browser_state", "_clean_up_func"] if attr not in data]
@@ -286,16 +551,77 @@ class ScrapedPage(BaseModel, ElementTreeBuilder):
         browser_state = data.pop("_browser_state")
         clean_up_func = data.pop("_clean_up_func")
         scrape_exclude = data.pop("_scrape_exclude")
+        # the renderer which already rendered the trimmed tree during scraping
+        html_renderer = data.pop("_html_renderer", None)
+        # the page the html is read from
+        page = data.pop("_page", None)
 
         super().__init__(**data)
 
         self._browser_state = browser_state
         self._clean_up_func = clean_up_func
         self._scrape_exclude = scrape_exclude
+        if html_renderer is not None:
+            self._html_renderer = html_renderer
+        self._page = page
 
     def support_economy_elements_tree(self) -> bool:
         return True
 
+    def clear_rendered_html(self) -> None:
+        """
+        Drop the memoized HTML fragments of the element trees once the prompt is built. The scraped page can be kept
+        for the next steps, the fragments would be kept alive with it. The trees are rendered again when needed.
+        """
+        self._html_renderer.clear()
+
+    def get_locator_cache(self) -> LocatorCache:
+        """
+        The frames and the element locators resolved for the elements of this scraped page.
+        """
+        return self._locator_cache
+
+    async def get_html_snapshot(self) -> PageContentSnapshot | None:
+        """
+        Serialize the HTML of the page on the first call. Most of the scraped pages never read it, and serializing a
+        big page takes long. The serialized HTML is reused by the later reads of the page until the DOM changes.
+        """
+        if self._html_snapshot is None and self._page is not None:
+            try:
+                skyvern_frame = await SkyvernFrame.create_instance(frame=self._page)
+                self._html_snapshot = await skyvern_frame.get_content_snapshot()
+            except Exception:
+                LOG.error(
+                    "Failed out to get HTML content",
+                    url=self.url,
+                    exc_info=True,
+                )
+        return self._html_snapshot
+
+    async def get_html(self) -> str:
+        if not self.html:
+            html_snapshot = await self.get_html_snapshot()
+            if html_snapshot is not None:
+                self.html = html_snapshot.content
+        return self.html
+
+    def estimate_memory_usage(self) -> dict[str, int]:
+        """
+        Estimated bytes held by the elements and the element trees of the page.
+        The structures shared between them are counted once, in the first of them holding it.
+        """
+        elements_bytes, element_tree_bytes, element_tree_trimmed_bytes, economy_element_tree_bytes = (
+            estimate_memory_size(self.elements, self.element_tree, self.element_tree_trimmed, self.economy_element_tree)
+        )
+        total_bytes = elements_bytes + element_tree_bytes + element_tree_trimmed_bytes + economy_element_tree_bytes
+        return {
+            "elements_bytes": elements_bytes,
+            "element_tree_bytes": element_tree_bytes,
+            "element_tree_trimmed_bytes": element_tree_trimmed_bytes,
+            "economy_element_tree_bytes": economy_element_tree_bytes,
+            "total_bytes": total_bytes,
+        }
+
     def build_element_tree(
         self, fmt: ElementTreeFormat = ElementTreeFormat.HTML, html_need_skyvern_attrs: bool = True
     ) -> str:
@@ -304,10 +630,7 @@ class ScrapedPage(BaseModel, ElementTreeBuilder):
             return json.dumps(self.element_tree_trimmed)
 
         if fmt == ElementTreeFormat.HTML:
-            return "".join(
-                json_to_html(element, need_skyvern_attrs=html_need_skyvern_attrs)
-                for element in self.element_tree_trimmed
-            )
+            return self._html_renderer.render(self.element_tree_trimmed, need_skyvern_attrs=html_need_skyvern_attrs)
 
         raise UnknownElementTreeFormat(fmt=fmt)
 
@@ -320,37 +643,63 @@ class ScrapedPage(BaseModel, ElementTreeBuilder):
         """
         Economy elements tree doesn't include secondary elements like SVG, etc
         """
+        economy_element_tree = self._get_economy_element_tree()
+        self.last_used_element_tree = economy_element_tree
+
+        if fmt == ElementTreeFormat.JSON:
+            element_str = json.dumps(economy_element_tree)
+            return element_str[: int(len(element_str) * percent_to_keep)]
+
+        if fmt == ElementTreeFormat.HTML:
+            element_str = self._html_renderer.render(economy_element_tree, need_skyvern_attrs=html_need_skyvern_attrs)
+            return element_str[: int(len(element_str) * percent_to_keep)]
+
+        raise UnknownElementTreeFormat(fmt=fmt)
+
+    def build_economy_elements_tree_within_budget(
+        self,
+        max_length: int,
+        html_need_skyvern_attrs: bool = True,
+    ) -> str:
+        """
+        Render the economy elements tree in at most max_length characters, in a single pass over the rendered fragments.
+        When the tree is too long, the subtrees without any actionable element are dropped from the end of the page
+        first, then the rest is cut at element boundaries in document order. So the actionable elements and the top of
+        the page, where the scraping viewport is, are kept.
+        """
+        economy_element_tree = self._get_economy_element_tree()
+        self.last_used_element_tree = economy_element_tree
+        element_str = self._html_renderer.render(economy_element_tree, need_skyvern_attrs=html_need_skyvern_attrs)
+        if len(element_str) <= max_length:
+            return element_str
+
+        pruner = _ElementTreePruner(self._html_renderer, need_skyvern_attrs=html_need_skyvern_attrs)
+        pruned_element_tree = pruner.drop_non_actionable_subtrees(
+            economy_element_tree, length_to_drop=len(element_str) - max_length
+        )
+        pruned_element_tree, _ = pruner.truncate(pruned_element_tree, max(max_length, 0))
+        self.last_used_element_tree = pruned_element_tree
+        return self._html_renderer.render(pruned_element_tree, need_skyvern_attrs=html_need_skyvern_attrs)
+
+    def _get_economy_element_tree(self) -> list[dict]:
         if not self.economy_element_tree:
             economy_elements = []
-            copied_element_tree_trimmed = copy.deepcopy(self.element_tree_trimmed)
 
             # Process each root element
-            for root_element in copied_element_tree_trimmed:
+            for root_element in self.element_tree_trimmed:
                 processed_element = self._process_element_for_economy_tree(root_element)
                 if processed_element:
                     economy_elements.append(processed_element)
 
             self.economy_element_tree = economy_elements
-
-        self.last_used_element_tree = self.economy_element_tree
-
-        if fmt == ElementTreeFormat.JSON:
-            element_str = json.dumps(self.economy_element_tree)
-            return element_str[: int(len(element_str) * percent_to_keep)]
-
-        if fmt == ElementTreeFormat.HTML:
-            element_str = "".join(
-                json_to_html(element, need_skyvern_attrs=html_need_skyvern_attrs)
-                for element in self.economy_element_tree
-            )
-            return element_str[: int(len(element_str) * percent_to_keep)]
-
-        raise UnknownElementTreeFormat(fmt=fmt)
+        return self.economy_element_tree
 
     def _process_element_for_economy_tree(self, element: dict) -> dict | None:
         """
         Helper method to process an element for the economy tree using BFS.
         Removes SVG elements and their children.
+        The subtrees without SVG elements are shared with the trimmed tree, only the elements whose children changed
+        are shallow copied. So the rendered HTML fragments of the shared subtrees are reused.
         """
         # Skip SVG elements entirely
         if element.get("tagName", "").lower() == "svg":
@@ -358,12 +707,16 @@ class ScrapedPage(BaseModel, ElementTreeBuilder):
 
         # Process children using BFS
         if "children" in element:
+            children = element["children"]
             new_children = []
-            for child in element["children"]:
+            for child in children:
                 processed_child = self._process_element_for_economy_tree(child)
                 if processed_child:
                     new_children.append(processed_child)
-            element["children"] = new_children
+            if len(new_children) != len(children) or any(
+                new_child is not child for new_child, child in zip(new_children, children)
+            ):
+                element = {**element, "children": new_children}
         return element
 
     async def refresh(self, draw_boxes: bool = True, scroll: bool = True, max_retries: int = 0) -> Self:
@@ -386,6 +739,9 @@ class ScrapedPage(BaseModel, ElementTreeBuilder):
         self.element_tree_trimmed = refreshed_page.element_tree_trimmed
         self.screenshots = refreshed_page.screenshots or self.screenshots
         self.html = refreshed_page.html
+        self._page = refreshed_page._page
+        self._html_snapshot = refreshed_page._html_snapshot
+        self._locator_cache = refreshed_page._locator_cache
         self.extracted_text = refreshed_page.extracted_text
         self.url = refreshed_page.url
         return self
@@ -426,6 +782,7 @@ async def scrape_website(
     scroll: bool = True,
     support_empty_page: bool = False,
     wait_seconds: float = 0,
+    incremental: bool = False,
 ) -> ScrapedPage:
     """
     ************************************************************************************************
@@ -443,6 +800,8 @@ async def scrape_website(
     :param url: URL of the web page to be scraped.
     :param page: Optional Page instance for scraping, a new page is created if None.
     :param num_retry: Tracks number of retries if scraping fails, defaults to 0.
+    :param incremental: Only rebuild the DOM subtrees mutated since the last scraping. Falls back to a full scraping
+        on navigation or when the page changed too much.
 
     :return: Tuple containing Page instance, base64 encoded screenshot, and page elements.
 
@@ -462,6 +821,7 @@ async def scrape_website(
             scroll=scroll,
             support_empty_page=support_empty_page,
             wait_seconds=wait_seconds,
+            incremental=incremental,
         )
     except ScrapingFailedBlankPage:
         raise
@@ -495,16 +855,25 @@ async def scrape_website(
         )
 
 
-async def get_frame_text(iframe: Frame) -> str:
+async def get_frame_text(
+    iframe: Frame,
+    semaphore: asyncio.Semaphore | None = None,
+    timeout_ms: float = settings.BROWSER_ACTION_TIMEOUT_MS,
+) -> str:
     """
     Get all the visible text in the iframe.
     :param iframe: Frame instance to get the text from.
+    :param semaphore: Bounds the number of frames evaluated at the same time, shared by the nested frames.
+    :param timeout_ms: The max time to get the text of the iframe itself, while it holds the semaphore.
     :return: All the visible text from the iframe.
     """
     js_script = "() => document.body.innerText"
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.BROWSER_SCRAPING_FRAME_CONCURRENCY)
 
     try:
-        text = await SkyvernFrame.evaluate(frame=iframe, expression=js_script)
+        async with semaphore:
+            text = await SkyvernFrame.evaluate(frame=iframe, expression=js_script, timeout_ms=timeout_ms)
     except Exception:
         LOG.warning(
             "failed to get text from iframe",
@@ -512,26 +881,33 @@ async def get_frame_text(iframe: Frame) -> str:
         )
         return ""
 
-    for child_frame in iframe.child_frames:
-        if child_frame.is_detached():
-            continue
+    # child frames are independent, get their text concurrently but keep the order of the concatenation
+    child_frame_texts = await asyncio.gather(
+        *[_get_child_frame_text(child_frame, semaphore) for child_frame in iframe.child_frames]
+    )
+    return text + "".join(child_frame_texts)
 
-        try:
-            child_frame_element = await child_frame.frame_element()
-        except Exception:
-            LOG.warning(
-                "Unable to get child_frame_element",
-                exc_info=True,
-            )
-            continue
 
-        # it will get stuck when we `frame.evaluate()` on an invisible iframe
-        if not await child_frame_element.is_visible():
-            continue
+async def _get_child_frame_text(child_frame: Frame, semaphore: asyncio.Semaphore) -> str:
+    if child_frame.is_detached():
+        return ""
 
-        text += await get_frame_text(child_frame)
+    frame_timeout_ms = settings.BROWSER_SCRAPING_FRAME_TIMEOUT_MS
+    try:
+        async with asyncio.timeout(frame_timeout_ms / 1000):
+            child_frame_element = await child_frame.frame_element()
+            # it will get stuck when we `frame.evaluate()` on an invisible iframe
+            if not await child_frame_element.is_visible():
+                return ""
+    except Exception:
+        LOG.warning(
+            "Unable to get child_frame_element",
+            exc_info=True,
+        )
+        return ""
 
-    return text
+    # the text evaluation is bounded by the per-frame timeout as well, so a hung frame doesn't hold the semaphore longer
+    return await get_frame_text(child_frame, semaphore, timeout_ms=frame_timeout_ms)
 
 
 async def scrape_web_unsafe(
@@ -545,6 +921,7 @@ async def scrape_web_unsafe(
     scroll: bool = True,
     support_empty_page: bool = False,
     wait_seconds: float = 0,
+    incremental: bool = False,
 ) -> ScrapedPage:
     """
     Asynchronous function that performs web scraping without any built-in error handling. This function is intended
@@ -569,63 +946,66 @@ async def scrape_web_unsafe(
     if url == "about:blank" and not support_empty_page:
         raise ScrapingFailedBlankPage()
 
-    skyvern_frame = await SkyvernFrame.create_instance(page)
-    await skyvern_frame.safe_wait_for_animation_end()
+    with profile_phase("wait_for_page"):
+        skyvern_frame = await SkyvernFrame.create_instance(page)
+        await skyvern_frame.safe_wait_for_animation_end()
 
-    if wait_seconds > 0:
-        LOG.info(f"Waiting for {wait_seconds} seconds before scraping the website.", wait_seconds=wait_seconds)
-        await asyncio.sleep(wait_seconds)
+        if wait_seconds > 0:
+            LOG.info(f"Waiting for {wait_seconds} seconds before scraping the website.", wait_seconds=wait_seconds)
+            await asyncio.sleep(wait_seconds)
 
-    elements, element_tree = await get_interactable_element_tree(page, scrape_exclude)
-    if not elements and not support_empty_page:
-        LOG.warning("No elements found on the page, wait and retry")
-        await empty_page_retry_wait()
-        elements, element_tree = await get_interactable_element_tree(page, scrape_exclude)
+    with profile_phase("build_element_tree"):
+        elements, element_tree = await get_interactable_element_tree(page, scrape_exclude, incremental=incremental)
+        if not elements and not support_empty_page:
+            LOG.warning("No elements found on the page, wait and retry")
+            await empty_page_retry_wait()
+            elements, element_tree = await get_interactable_element_tree(page, scrape_exclude)
 
-    element_tree = await cleanup_element_tree(page, url, copy.deepcopy(element_tree))
-    element_tree_trimmed = trim_element_tree(copy.deepcopy(element_tree))
+    with profile_phase("cleanup_element_tree"):
+        element_tree = await cleanup_element_tree(page, url, copy_element_tree(element_tree))
+        element_tree_trimmed = trim_element_tree(copy_element_tree(element_tree))
 
     screenshots = []
+    html_renderer = ElementHTMLRenderer()
     if take_screenshots:
-        element_tree_trimmed_html_str = "".join(
-            json_to_html(element, need_skyvern_attrs=False) for element in element_tree_trimmed
-        )
-        token_count = count_tokens(element_tree_trimmed_html_str)
-        if token_count > DEFAULT_MAX_TOKENS:
-            max_screenshot_number = min(max_screenshot_number, 1)
+        with profile_phase("screenshots"):
+            element_tree_trimmed_html_str = html_renderer.render(element_tree_trimmed, need_skyvern_attrs=False)
+            if await exceeds_token_limit_async(element_tree_trimmed_html_str, DEFAULT_MAX_TOKENS):
+                max_screenshot_number = min(max_screenshot_number, 1)
 
-        screenshots = await SkyvernFrame.take_split_screenshots(
-            page=page,
-            url=url,
-            draw_boxes=draw_boxes,
-            max_number=max_screenshot_number,
-            scroll=scroll,
+            screenshots = await SkyvernFrame.take_split_screenshots(
+                page=page,
+                url=url,
+                draw_boxes=draw_boxes,
+                max_number=max_screenshot_number,
+                scroll=scroll,
+            )
+    with profile_phase("build_element_dict"):
+        id_to_css_dict, id_to_element_dict, id_to_frame_dict, id_to_element_hash, hash_to_element_ids = (
+            build_element_dict(elements)
         )
-    id_to_css_dict, id_to_element_dict, id_to_frame_dict, id_to_element_hash, hash_to_element_ids = build_element_dict(
-        elements
-    )
 
     # if there are no elements, fail the scraping unless support_empty_page is True
     if not elements and not support_empty_page:
         raise NoElementFound()
 
-    text_content = await get_frame_text(page.main_frame)
+    with profile_phase("get_text"):
+        text_content = await get_frame_text(page.main_frame)
 
-    html = ""
+    # the html is serialized lazily, when it's read by ScrapedPage.get_html
     window_dimension = None
-    try:
-        skyvern_frame = await SkyvernFrame.create_instance(frame=page)
-        html = await skyvern_frame.get_content()
-        if page.viewport_size:
-            window_dimension = Resolution(width=page.viewport_size["width"], height=page.viewport_size["height"])
-    except Exception:
-        LOG.error(
-            "Failed out to get HTML content",
-            url=url,
-            exc_info=True,
-        )
+    if page.viewport_size:
+        window_dimension = Resolution(width=page.viewport_size["width"], height=page.viewport_size["height"])
+
+    LOG.debug(
+        "domUtils.js injection stats",
+        injection_performed=DOM_UTILS_INJECTION_STATS.performed,
+        injection_skipped=DOM_UTILS_INJECTION_STATS.skipped,
+        tree_build_timings=ELEMENT_TREE_BUILD_TIMINGS,
+        locator_cache_stats=LOCATOR_CACHE_STATS,
+    )
 
-    return ScrapedPage(
+    scraped_page = ScrapedPage(
         elements=elements,
         id_to_css_dict=id_to_css_dict,
         id_to_element_dict=id_to_element_dict,
@@ -636,13 +1016,18 @@ async def scrape_web_unsafe(
         element_tree_trimmed=element_tree_trimmed,
         screenshots=screenshots,
         url=url,
-        html=html,
         extracted_text=text_content,
         window_dimension=window_dimension,
         _browser_state=browser_state,
+        _page=page,
         _clean_up_func=cleanup_element_tree,
+        _html_renderer=html_renderer,
         _scrape_exclude=scrape_exclude,
     )
+    if settings.DEBUG_MODE:
+        LOG.debug("Scraped page memory usage", url=url, **scraped_page.estimate_memory_usage())
+
+    return scraped_page
 
 
 async def get_all_children_frames(page: Page) -> list[Frame]:
@@ -657,6 +1042,52 @@ async def get_all_children_frames(page: Page) -> list[Frame]:
     return frames
 
 
+@dataclass
+class ScrapedPageReuseStats:
+    reused: int = 0
+    scraped: int = 0
+
+
+# process-wide counters of how many steps reused the scraped page of an unchanged page vs scraped it again
+SCRAPED_PAGE_REUSE_STATS = ScrapedPageReuseStats()
+
+
+async def get_page_fingerprint(page: Page) -> str | None:
+    """
+    Get the fingerprint of the page and its iframes, computed in the page by domUtils.js.
+    The same fingerprint means the page is unchanged since it was scraped, and the scraped page can be reused.
+    :return: None when the page changed since the last element tree building, or it can't be fingerprinted.
+    """
+    main_frame_fingerprint = await SkyvernFrame(frame=page).get_dom_fingerprint()
+    if main_frame_fingerprint is None:
+        return None
+
+    frames = [frame for frame in await get_all_children_frames(page) if not frame.is_detached()]
+    fingerprints = [main_frame_fingerprint]
+    for frame_fingerprint in await asyncio.gather(*[_get_frame_fingerprint(frame) for frame in frames]):
+        if frame_fingerprint is None:
+            return None
+        fingerprints.append(frame_fingerprint)
+    return "\n".join(fingerprints)
+
+
+async def _get_frame_fingerprint(frame: Frame) -> str | None:
+    try:
+        async with asyncio.timeout(DOM_FINGERPRINT_TIMEOUT):
+            frame_element = await frame.frame_element()
+            # it will get stuck when we `frame.evaluate()` on an invisible iframe, it isn't scraped either
+            if not await frame_element.is_visible():
+                return f"{frame.url} hidden"
+    except Exception:
+        LOG.debug("Unable to get the frame element for the fingerprint", frame_url=frame.url, exc_info=True)
+        return None
+
+    fingerprint = await SkyvernFrame(frame=frame).get_dom_fingerprint()
+    if fingerprint is None:
+        return None
+    return f"{frame.url} {fingerprint}"
+
+
 async def filter_frames(frames: list[Frame], scrape_exclude: ScrapeExcludeFunc | None = None) -> list[Frame]:
     filtered_frames = []
     for frame in frames:
@@ -670,41 +1101,77 @@ async def filter_frames(frames: list[Frame], scrape_exclude: ScrapeExcludeFunc |
     return filtered_frames
 
 
-async def add_frame_interactable_elements(
+def _group_frames_by_depth(frames: list[Frame]) -> list[list[Frame]]:
+    """
+    Group the frames by their nesting depth, keeping the original order in each group.
+    The iframe element of a nested frame only gets its unique_id when the parent frame is scraped,
+    so a depth can only be scraped after the previous one is done.
+    """
+    frames_by_depth: dict[int, list[Frame]] = defaultdict(list)
+    for frame in frames:
+        depth = 0
+        parent_frame = frame.parent_frame
+        while parent_frame is not None:
+            depth += 1
+            parent_frame = parent_frame.parent_frame
+        frames_by_depth[depth].append(frame)
+    return [frames_by_depth[depth] for depth in sorted(frames_by_depth)]
+
+
+async def build_frame_interactable_elements(
     frame: Frame,
     frame_index: int,
-    elements: list[dict],
-    element_tree: list[dict],
-) -> tuple[list[dict], list[dict]]:
+    incremental: bool = False,
+) -> tuple[str, list[dict], list[dict]] | None:
     """
-    Add the interactable element of the frame to the elements and element_tree.
+    Build the interactable elements of the frame.
+    :return: Tuple containing the unique_id of the iframe element, the elements and the element tree of the frame.
+        None if the frame should be skipped.
     """
     try:
         frame_element = await frame.frame_element()
         # it will get stuck when we `frame.evaluate()` on an invisible iframe
         if not await frame_element.is_visible():
-            return elements, element_tree
+            return None
         unique_id = await frame_element.get_attribute("unique_id")
         if not unique_id:
             LOG.info(
                 "No unique_id found for frame, skipping",
                 frame_index=frame_index,
             )
-            return elements, element_tree
+            return None
     except Exception:
         LOG.warning(
             "Unable to get unique_id from frame_element",
             exc_info=True,
         )
-        return elements, element_tree
+        return None
 
     skyvern_frame = await SkyvernFrame.create_instance(frame)
     await skyvern_frame.safe_wait_for_animation_end()
 
-    frame_elements, frame_element_tree = await skyvern_frame.build_tree_from_body(
-        frame_name=unique_id, frame_index=frame_index
-    )
+    if incremental:
+        frame_elements, frame_element_tree = await skyvern_frame.build_tree_from_body_incrementally(
+            frame_name=unique_id, frame_index=frame_index
+        )
+    else:
+        frame_elements, frame_element_tree = await skyvern_frame.build_tree_from_body(
+            frame_name=unique_id, frame_index=frame_index
+        )
+
+    return unique_id, frame_elements, frame_element_tree
 
+
+def merge_frame_interactable_elements(
+    unique_id: str,
+    frame_elements: list[dict],
+    frame_element_tree: list[dict],
+    elements: list[dict],
+    element_tree: list[dict],
+) -> tuple[list[dict], list[dict]]:
+    """
+    Add the interactable element of the frame to the elements and element_tree.
+    """
     for element in elements:
         if element["id"] == unique_id:
             element["children"] = frame_element_tree
@@ -714,19 +1181,64 @@ async def add_frame_interactable_elements(
     return elements, element_tree
 
 
+async def add_frame_interactable_elements(
+    frame: Frame,
+    frame_index: int,
+    elements: list[dict],
+    element_tree: list[dict],
+    incremental: bool = False,
+) -> tuple[list[dict], list[dict]]:
+    """
+    Add the interactable element of the frame to the elements and element_tree.
+    """
+    result = await build_frame_interactable_elements(frame, frame_index, incremental=incremental)
+    if result is None:
+        return elements, element_tree
+
+    unique_id, frame_elements, frame_element_tree = result
+    return merge_frame_interactable_elements(unique_id, frame_elements, frame_element_tree, elements, element_tree)
+
+
+async def _build_frame_interactable_elements_with_limit(
+    frame: Frame,
+    frame_index: int,
+    semaphore: asyncio.Semaphore,
+    incremental: bool = False,
+) -> tuple[str, list[dict], list[dict]] | None:
+    async with semaphore:
+        try:
+            async with asyncio.timeout(settings.BROWSER_SCRAPING_FRAME_TIMEOUT_MS / 1000):
+                return await build_frame_interactable_elements(frame, frame_index, incremental=incremental)
+        except asyncio.TimeoutError:
+            LOG.warning(
+                "Timeout to build the interactable elements of the frame, skipping it",
+                frame_index=frame_index,
+                frame_url=frame.url,
+                timeout_ms=settings.BROWSER_SCRAPING_FRAME_TIMEOUT_MS,
+            )
+            return None
+
+
 @TraceManager.traced_async(ignore_input=True)
 async def get_interactable_element_tree(
     page: Page,
     scrape_exclude: ScrapeExcludeFunc | None = None,
+    incremental: bool = False,
 ) -> tuple[list[dict], list[dict]]:
     """
     Get the element tree of the page, including all the elements that are interactable.
     :param page: Page instance to get the element tree from.
+    :param incremental: Patch the element tree of the last scraping with the mutated DOM subtrees when it's possible.
     :return: Tuple containing the element tree and a map of element IDs to elements.
     """
     # main page index is 0
     skyvern_page = await SkyvernFrame.create_instance(page)
-    elements, element_tree = await skyvern_page.build_tree_from_body(frame_name="main.frame", frame_index=0)
+    if incremental:
+        elements, element_tree = await skyvern_page.build_tree_from_body_incrementally(
+            frame_name="main.frame", frame_index=0
+        )
+    else:
+        elements, element_tree = await skyvern_page.build_tree_from_body(frame_name="main.frame", frame_index=0)
 
     context = skyvern_context.ensure_context()
     frames = await get_all_children_frames(page)
@@ -738,15 +1250,31 @@ async def get_interactable_element_tree(
             frame_index = len(context.frame_index_map) + 1
             context.frame_index_map[frame] = frame_index
 
-    for frame in frames:
-        frame_index = context.frame_index_map[frame]
-        elements, element_tree = await add_frame_interactable_elements(
-            frame,
-            frame_index,
-            elements,
-            element_tree,
+    # frames in the same depth are scraped concurrently, and the results are merged in the original frame order,
+    # so the element ids and frame_index stay the same as scraping them one by one
+    semaphore = asyncio.Semaphore(settings.BROWSER_SCRAPING_FRAME_CONCURRENCY)
+    for frames_in_depth in _group_frames_by_depth(frames):
+        results = await asyncio.gather(
+            *[
+                _build_frame_interactable_elements_with_limit(
+                    frame,
+                    context.frame_index_map[frame],
+                    semaphore,
+                    incremental=incremental,
+                )
+                for frame in frames_in_depth
+            ]
         )
+        for result in results:
+            if result is None:
+                continue
+            unique_id, frame_elements, frame_element_tree = result
+            elements, element_tree = merge_frame_interactable_elements(
+                unique_id, frame_elements, frame_element_tree, elements, element_tree
+            )
 
+    # the tree shares the element objects with the elements list
+    intern_element_strings(elements)
     return elements, element_tree
 
 
@@ -787,21 +1315,60 @@ class IncrementalScrapePage(ElementTreeBuilder):
                 wait_until_finished=False
             )
 
+        if incremental_elements:
+            # the elements looked up before the DOM changed might be gone
+            mark_dom_changed(frame)
+
+        intern_element_strings(incremental_elements)
         # we listen the incremental elements seperated by frames, so all elements will be in the same SkyvernFrame
         self.id_to_css_dict, self.id_to_element_dict, _, _, _ = build_element_dict(incremental_elements)
 
         self.elements = incremental_elements
 
-        incremental_tree = await cleanup_element_tree(frame, frame.url, copy.deepcopy(incremental_tree))
-        trimmed_element_tree = trim_element_tree(copy.deepcopy(incremental_tree))
+        incremental_tree = await cleanup_element_tree(frame, frame.url, copy_element_tree(incremental_tree))
+        trimmed_element_tree = trim_element_tree(copy_element_tree(incremental_tree))
 
         self.element_tree = incremental_tree
         self.element_tree_trimmed = trimmed_element_tree
 
         return self.element_tree_trimmed
 
+    async def wait_for_dom_settled(self, change_timeout_sec: float = 0) -> float:
+        """
+        Wait until the DOM observed since start_listen_dom_increment settles: no mutation in the quiet window, the new
+        elements parsed and no finite animation running. It returns as soon as the page is stable, bounded by
+        BROWSER_DOM_SETTLE_TIMEOUT_MS. Then it waits for the load state of the frame, e.g. an onclick navigated.
+        :param change_timeout_sec: how long to wait for the first change when the DOM hasn't changed since the
+            listening started or the last wait, e.g. the options of an auto-completion are loaded from the network.
+        :return: the seconds waited for the DOM to settle
+        """
+        settings = SettingsManager.get_settings()
+        frame = self.skyvern_frame.get_frame()
+        settle_timeout_ms = max(settings.BROWSER_DOM_SETTLE_TIMEOUT_MS, change_timeout_sec * 1000)
+        js_script = """async ([quiet_ms, settle_timeout_ms, first_change_ms]) =>
+            await SkyvernDomUtils.waitForIncrementalDomSettled(quiet_ms, settle_timeout_ms, first_change_ms)"""
+        waited_sec: float = 0
+        try:
+            result = await SkyvernFrame.evaluate(
+                frame=frame,
+                expression=js_script,
+                arg=[settings.BROWSER_DOM_SETTLE_QUIET_MS, settle_timeout_ms, change_timeout_sec * 1000],
+                timeout_ms=settle_timeout_ms + 1000,
+            )
+            LOG.debug("Waited for the DOM to settle", waited_ms=round(result["waited_ms"]), settled=result["settled"])
+            waited_sec = result["waited_ms"] / 1000
+        except Exception:
+            # the navigation destroys the execution context of the wait
+            LOG.debug("Failed to wait for the DOM to settle, but ignore it", exc_info=True)
+
+        try:
+            await frame.wait_for_load_state("load", timeout=settle_timeout_ms)
+        except Exception:
+            LOG.debug("Failed to wait for the load state, but ignore it", exc_info=True)
+        return waited_sec
+
     async def start_listen_dom_increment(self, element: ElementHandle | None = None) -> None:
-        js_script = "async (element) => await startGlobalIncrementalObserver(element)"
+        js_script = "async (element) => await SkyvernDomUtils.startGlobalIncrementalObserver(element)"
         await SkyvernFrame.evaluate(frame=self.skyvern_frame.get_frame(), expression=js_script, arg=element)
 
     async def stop_listen_dom_increment(self) -> None:
@@ -809,7 +1376,7 @@ class IncrementalScrapePage(ElementTreeBuilder):
         js_script = "() => window.globalObserverForDOMIncrement === undefined"
         if await SkyvernFrame.evaluate(frame=self.skyvern_frame.get_frame(), expression=js_script):
             return
-        js_script = "async () => await stopGlobalIncrementalObserver()"
+        js_script = "async () => await SkyvernDomUtils.stopGlobalIncrementalObserver()"
         await SkyvernFrame.evaluate(
             frame=self.skyvern_frame.get_frame(),
             expression=js_script,
@@ -877,11 +1444,9 @@ class IncrementalScrapePage(ElementTreeBuilder):
         return None
 
     def build_html_tree(self, element_tree: list[dict] | None = None, need_skyvern_attrs: bool = True) -> str:
-        return "".join(
-            [
-                json_to_html(element, need_skyvern_attrs=need_skyvern_attrs)
-                for element in (element_tree or self.element_tree_trimmed)
-            ]
+        # the incremental trees are rebuilt between the calls, so the fragments aren't memoized across calls
+        return ElementHTMLRenderer().render(
+            element_tree or self.element_tree_trimmed, need_skyvern_attrs=need_skyvern_attrs
         )
 
     def support_economy_elements_tree(self) -> bool:
@@ -992,6 +1557,48 @@ def trim_element_tree(elements: list[dict]) -> list[dict]:
     return elements
 
 
+def copy_element_tree(element_tree: list[dict]) -> list[dict]:
+    """
+    Copy-on-write copy of the element tree: every element dict and children list is copied, the other values
+    (attributes, rect, options, etc) are shared with the source tree.
+    The keys of the copied elements can be added, replaced or deleted without touching the source tree, but the shared
+    values must be replaced instead of modified in place. trim_element_tree and cleanup_element_tree follow that rule.
+    """
+    return [_copy_element(element) for element in element_tree]
+
+
+def _copy_element(element: dict) -> dict:
+    copied = element.copy()
+    if "children" in copied:
+        copied["children"] = [_copy_element(child) for child in copied["children"]]
+    return copied
+
+
+def estimate_memory_size(*values: Any) -> list[int]:
+    """
+    Estimate the memory size in bytes of each value, including everything it references.
+    An object shared by several values is only counted in the first value referencing it, so the sizes can be summed.
+    """
+    seen: set[int] = set()
+    sizes: list[int] = []
+    for value in values:
+        size = 0
+        stack = [value]
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            size += sys.getsizeof(obj)
+            if isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set)):
+                stack.extend(obj)
+        sizes.append(size)
+    return sizes
+
+
 def _trimmed_base64_data(attributes: dict) -> dict:
     new_attributes: dict = {}
 
@@ -35,6 +35,13 @@ COMMON_INPUT_TAGS = {"input", "textarea", "select"}
 
 
 async def resolve_locator(scrape_page: ScrapedPage, page: Page, frame: str, css: str) -> tuple[Locator, Page | Frame]:
+    # the iframes resolved before are reused until they're detached or the page navigates
+    locator_cache = scrape_page.get_locator_cache()
+    element_frame = frame
+    if element_frame != "main.frame" and (cached_frame := locator_cache.get_frame(page, element_frame)):
+        cached_frame_locator, cached_content_frame = cached_frame
+        return cached_frame_locator.locator(css), cached_content_frame
+
     iframe_path: list[str] = []
 
     while frame != "main.frame":
@@ -67,6 +74,9 @@ async def resolve_locator(scrape_page: ScrapedPage, page: Page, frame: str, css:
 
         current_page = current_page.frame_locator(f"[{SKYVERN_ID_ATTR}='{child_frame}']")
 
+    if isinstance(current_page, FrameLocator) and isinstance(current_frame, Frame):
+        locator_cache.set_frame(page, element_frame, current_page, current_frame)
+
     return current_page.locator(css), current_frame
 
 
@@ -1008,6 +1018,13 @@ class DomUtil:
         if not css:
             raise MissingElementInCSSMap(element_id)
 
+        hash_value = self.scraped_page.id_to_element_hash.get(element_id, "")
+        # the element was checked in the page by an earlier lookup and the DOM hasn't changed since
+        locator_cache = self.scraped_page.get_locator_cache()
+        if cached_element := locator_cache.get_element(self.page, element_id):
+            locator, frame_content = cached_element
+            return SkyvernElement(locator, frame_content, element, hash_value)
+
         locator, frame_content = await resolve_locator(self.scraped_page, self.page, frame, css)
 
         num_elements = await locator.count()
@@ -1036,8 +1053,7 @@ class DomUtil:
             )
             raise MultipleElementsFound(num=num_elements, selector=css, element_id=element_id)
 
-        hash_value = self.scraped_page.id_to_element_hash.get(element_id, "")
-
+        locator_cache.set_element(self.page, element_id, locator, frame_content)
         return SkyvernElement(locator, frame_content, element, hash_value)
 
     async def safe_get_skyvern_element_by_id(self, element_id: str) -> SkyvernElement | None:
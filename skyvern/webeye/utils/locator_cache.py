@@ -0,0 +1,112 @@
+"""
+Cache the frames and the element locators resolved for the elements of a scraped page. The action handlers look up the
+same elements several times per action (the anchors, the labels, the select options, the blocking elements), the
+repeated lookups skip the frame resolution and the existence check in the page.
+
+The frames are kept until they're detached or the page navigates. The element locators are dropped whenever the DOM may
+have changed: the page navigated, an action started or the incremental elements showed up.
+"""
+
+import weakref
+from dataclasses import dataclass
+
+from playwright.async_api import Frame, FrameLocator, Locator, Page
+
+
+@dataclass
+class LocatorCacheStats:
+    frame_hits: int = 0
+    frame_misses: int = 0
+    element_hits: int = 0
+    element_misses: int = 0
+    invalidations: int = 0
+
+
+# process-wide counters of the lookups served by the locator caches vs resolved in the page
+LOCATOR_CACHE_STATS = LocatorCacheStats()
+
+
+@dataclass
+class PageChanges:
+    navigations: int = 0
+    dom_changes: int = 0
+
+
+_PAGE_CHANGES: weakref.WeakKeyDictionary[Page, PageChanges] = weakref.WeakKeyDictionary()
+
+
+def track_page_changes(page: Page) -> PageChanges:
+    """
+    Get the change counters of the page, the navigations are counted since the first call.
+    """
+    changes = _PAGE_CHANGES.get(page)
+    if changes is not None:
+        return changes
+
+    changes = PageChanges()
+
+    def on_frame_navigated(_: Frame) -> None:
+        changes.navigations += 1
+
+    page.on("framenavigated", on_frame_navigated)
+    _PAGE_CHANGES[page] = changes
+    return changes
+
+
+def mark_dom_changed(frame: Page | Frame) -> None:
+    """
+    Drop the cached element locators of the page the frame belongs to.
+    """
+    page = frame if isinstance(frame, Page) else frame.page
+    track_page_changes(page).dom_changes += 1
+
+
+class LocatorCache:
+    def __init__(self) -> None:
+        self._page: Page | None = None
+        self._navigations = 0
+        self._dom_changes = 0
+        # frame id -> the frame locator chain and the content frame of the iframe
+        self._frames: dict[str, tuple[FrameLocator, Frame]] = {}
+        # element id -> the locator matching exactly one element and the frame it's in
+        self._elements: dict[str, tuple[Locator, Page | Frame]] = {}
+
+    def _sync(self, page: Page) -> None:
+        changes = track_page_changes(page)
+        if page is not self._page or changes.navigations != self._navigations:
+            if self._frames or self._elements:
+                LOCATOR_CACHE_STATS.invalidations += 1
+            self._frames.clear()
+            self._elements.clear()
+        elif changes.dom_changes != self._dom_changes and self._elements:
+            LOCATOR_CACHE_STATS.invalidations += 1
+            self._elements.clear()
+        self._page = page
+        self._navigations = changes.navigations
+        self._dom_changes = changes.dom_changes
+
+    def get_frame(self, page: Page, frame_id: str) -> tuple[FrameLocator, Frame] | None:
+        self._sync(page)
+        cached = self._frames.get(frame_id)
+        if cached is None or cached[1].is_detached():
+            LOCATOR_CACHE_STATS.frame_misses += 1
+            return None
+        LOCATOR_CACHE_STATS.frame_hits += 1
+        return cached
+
+    def set_frame(self, page: Page, frame_id: str, frame_locator: FrameLocator, frame: Frame) -> None:
+        self._sync(page)
+        self._frames[frame_id] = (frame_locator, frame)
+
+    def get_element(self, page: Page, element_id: str) -> tuple[Locator, Page | Frame] | None:
+        self._sync(page)
+        cached = self._elements.get(element_id)
+        if cached is None or (isinstance(cached[1], Frame) and cached[1].is_detached()):
+            LOCATOR_CACHE_STATS.element_misses += 1
+            return None
+        LOCATOR_CACHE_STATS.element_hits += 1
+        return cached
+
+    def set_element(self, page: Page, element_id: str, locator: Locator, frame: Page | Frame) -> None:
+        self._sync(page)
+        self._elements[element_id] = (locator, frame)
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import re
 import time
+import weakref
+from dataclasses import dataclass
 from enum import StrEnum
 from io import BytesIO
 from typing import Any
@@ -9,12 +13,14 @@ from typing import Any
 import structlog
 from PIL import Image
 from playwright._impl._errors import TimeoutError
-from playwright.async_api import ElementHandle, Frame, Page
+from playwright.async_api import BrowserContext, ElementHandle, FloatRect, Frame, Page
 
-from skyvern.constants import PAGE_CONTENT_TIMEOUT, SKYVERN_DIR
+from skyvern.constants import DOM_FINGERPRINT_TIMEOUT, PAGE_CONTENT_TIMEOUT, SKYVERN_DIR
 from skyvern.exceptions import FailedToTakeScreenshot
 from skyvern.forge.sdk.settings_manager import SettingsManager
 from skyvern.forge.sdk.trace import TraceManager
+from skyvern.utils.image_resizer import DEFAULT_LOSSY_IMAGE_QUALITY, ImageFormat, encode_image
+from skyvern.webeye.utils.screenshot_annotation import BoundingBoxRects, annotate_screenshot
 
 LOG = structlog.get_logger()
 
@@ -33,6 +39,95 @@ def load_js_script() -> str:
 
 
 JS_FUNCTION_DEFS = load_js_script()
+JS_FUNCTION_DEFS_VERSION = hashlib.sha256(JS_FUNCTION_DEFS.encode("utf-8")).hexdigest()[:16]
+# the top level functions of domUtils.js, the callers reach them through the SkyvernDomUtils namespace
+JS_FUNCTION_NAMES = re.findall(r"^(?:async )?function (\w+)", JS_FUNCTION_DEFS, flags=re.MULTILINE)
+# The script runs in its own scope, so its declarations never clash with the ones of the page scripts. The namespace
+# is frozen and can't be assigned by the page. It's defined at the end of the script, so its version is the sentinel
+# that the whole script evaluated successfully.
+JS_FUNCTION_DEFS_WITH_VERSION = f"""(() => {{
+{JS_FUNCTION_DEFS}
+Object.defineProperty(window, "SkyvernDomUtils", {{
+  value: Object.freeze({{ version: "{JS_FUNCTION_DEFS_VERSION}", {", ".join(JS_FUNCTION_NAMES)} }}),
+  configurable: true,
+}});
+}})();
+"""
+
+
+class DomUtilsInjectionMode(StrEnum):
+    CONTEXT = "context"
+    FRAME = "frame"
+
+
+@dataclass
+class DomUtilsInjectionStats:
+    performed: int = 0
+    skipped: int = 0
+
+
+# process-wide counters of how many times domUtils.js was pushed into a frame vs reused from the frame
+DOM_UTILS_INJECTION_STATS = DomUtilsInjectionStats()
+
+
+@dataclass
+class ElementTreeBuildTimings:
+    builds: int = 0
+    elements: int = 0
+    hover_styles_ms: float = 0
+    layout_snapshot_ms: float = 0
+    visibility_ms: float = 0
+    interactability_ms: float = 0
+    element_object_ms: float = 0
+    total_ms: float = 0
+
+    def add(self, timings: dict[str, float]) -> None:
+        for name, value in timings.items():
+            if hasattr(self, name):
+                setattr(self, name, getattr(self, name) + value)
+
+
+# process-wide timings of the element tree buildings in domUtils.js, where the tree building time goes
+ELEMENT_TREE_BUILD_TIMINGS = ElementTreeBuildTimings()
+
+
+@dataclass(frozen=True)
+class PageContentSnapshot:
+    # None when the DOM can't be versioned, before the first element tree building of the document
+    dom_version: str | None
+    content: str
+    content_hash: str
+
+
+# the last serialized HTML of every page, reused until the DOM version changes
+_page_content_snapshots: weakref.WeakKeyDictionary[Page | Frame, PageContentSnapshot] = weakref.WeakKeyDictionary()
+
+
+def _record_tree_build_timings(frame_name: str | None, timings: dict[str, float]) -> None:
+    ELEMENT_TREE_BUILD_TIMINGS.add(timings)
+    LOG.debug("Element tree build timings", frame_name=frame_name, **timings)
+
+
+def get_dom_utils_injection_mode() -> DomUtilsInjectionMode:
+    try:
+        return DomUtilsInjectionMode(SettingsManager.get_settings().DOM_UTILS_INJECTION_MODE)
+    except ValueError:
+        LOG.warning(
+            "Unknown domUtils injection mode, fallback to frame mode",
+            mode=SettingsManager.get_settings().DOM_UTILS_INJECTION_MODE,
+        )
+        return DomUtilsInjectionMode.FRAME
+
+
+async def add_dom_utils_init_script(browser_context: BrowserContext) -> None:
+    """
+    Register domUtils.js as an init script of the browser context, so every new document (page or iframe) gets it
+    before SkyvernFrame touches the frame. SkyvernFrame.create_instance only re-injects when the sentinel is gone.
+    """
+    if get_dom_utils_injection_mode() != DomUtilsInjectionMode.CONTEXT:
+        return
+    await browser_context.add_init_script(script=JS_FUNCTION_DEFS_WITH_VERSION)
+    LOG.debug("domUtils.js is registered as the browser context init script", version=JS_FUNCTION_DEFS_VERSION)
 
 
 class ScreenshotMode(StrEnum):
@@ -45,6 +140,7 @@ async def _page_screenshot_helper(
     file_path: str | None = None,
     full_page: bool = False,
     timeout: float = SettingsManager.get_settings().BROWSER_SCREENSHOT_TIMEOUT_MS,
+    clip: FloatRect | None = None,
 ) -> bytes:
     try:
         return await page.screenshot(
@@ -52,6 +148,7 @@ async def _page_screenshot_helper(
             timeout=timeout,
             full_page=full_page,
             animations="disabled",
+            clip=clip,
         )
     except TimeoutError as timeout_error:
         LOG.info(
@@ -62,6 +159,7 @@ async def _page_screenshot_helper(
             timeout=timeout,
             full_page=full_page,
             animations="allow",
+            clip=clip,
         )
 
 
@@ -101,6 +199,105 @@ async def _current_viewpoint_screenshot_helper(
         raise FailedToTakeScreenshot(error_message=str(e)) from e
 
 
+def _get_scroll_positions(viewport_height: int, scroll_height: int, max_number: int, need_overlap: bool) -> list[int]:
+    """
+    The scroll positions the scrolling screenshots would be taken at, the same as scrollToNextPage in domUtils.js.
+    """
+    step = viewport_height - 200 if need_overlap else viewport_height
+    max_scroll_y = max(scroll_height - viewport_height, 0)
+    positions = [0]
+    while len(positions) < max_number:
+        next_position = min(positions[-1] + step, max_scroll_y)
+        if next_position - positions[-1] <= 25:
+            break
+        positions.append(next_position)
+    return positions
+
+
+def _slice_full_page_capture(capture: bytes, positions: list[int], viewport_height: int) -> list[bytes]:
+    screenshots: list[bytes] = []
+    with Image.open(BytesIO(capture)) as img:
+        img.load()
+        # the capture is in device pixels, the positions are in css pixels
+        scale = img.height / (positions[-1] + viewport_height)
+        for position in positions:
+            top = round(position * scale)
+            bottom = min(round((position + viewport_height) * scale), img.height)
+            screenshots.append(encode_image(img.crop((0, top, img.width, bottom))))
+    return screenshots
+
+
+async def _full_page_capture_helper(
+    skyvern_page: SkyvernFrame,
+    page: Page,
+    url: str | None = None,
+    draw_boxes: bool = False,
+    max_number: int = SettingsManager.get_settings().MAX_NUM_SCREENSHOTS,
+    mode: ScreenshotMode = ScreenshotMode.DETAILED,
+) -> tuple[bytes, list[int], int] | None:
+    """
+    Capture the area the scrolling screenshots would cover in one screenshot beyond the viewport, without scrolling.
+    :return: the capture, the scroll positions covered by it and the viewport height.
+        None if the page renders different content while scrolling and needs the scrolling screenshots.
+    """
+    capture_info = await skyvern_page.get_full_page_capture_info()
+    if capture_info["needScrolling"]:
+        LOG.debug("The page needs scrolling to take the screenshots", url=url, reason=capture_info["needScrolling"])
+        return None
+
+    viewport_height = int(capture_info["viewportHeight"])
+    positions = _get_scroll_positions(
+        viewport_height=viewport_height,
+        scroll_height=int(capture_info["scrollHeight"]),
+        max_number=max_number,
+        need_overlap=(mode == ScreenshotMode.DETAILED),
+    )
+    capture_height = positions[-1] + viewport_height
+
+    draw_boxes_in_dom = draw_boxes and not SettingsManager.get_settings().BROWSER_SCREENSHOT_DRAW_BOXES_IN_PYTHON
+    bounding_boxes: BoundingBoxRects | None = None
+    if draw_boxes_in_dom:
+        await skyvern_page.draw_bounding_boxes_for_full_page(capture_height=capture_height)
+    else:
+        await skyvern_page.scroll_to_top(draw_boxes=False, frame="main.frame", frame_index=0)
+        if draw_boxes:
+            bounding_boxes = await skyvern_page.get_bounding_box_rects(capture_height=capture_height)
+    try:
+        if mode == ScreenshotMode.DETAILED:
+            await page.wait_for_load_state(timeout=SettingsManager.get_settings().BROWSER_LOADING_TIMEOUT_MS)
+        capture = await _page_screenshot_helper(
+            page=page,
+            full_page=True,
+            clip={"x": 0, "y": 0, "width": capture_info["viewportWidth"], "height": capture_height},
+        )
+    finally:
+        if draw_boxes_in_dom:
+            await skyvern_page.remove_bounding_boxes()
+
+    if bounding_boxes is not None:
+        capture = await asyncio.to_thread(annotate_screenshot, capture, bounding_boxes)
+    return capture, positions, viewport_height
+
+
+async def _try_full_page_capture(
+    skyvern_page: SkyvernFrame,
+    page: Page,
+    url: str | None = None,
+    draw_boxes: bool = False,
+    max_number: int = SettingsManager.get_settings().MAX_NUM_SCREENSHOTS,
+    mode: ScreenshotMode = ScreenshotMode.DETAILED,
+) -> tuple[bytes, list[int], int] | None:
+    if not SettingsManager.get_settings().BROWSER_SCREENSHOT_SINGLE_CAPTURE:
+        return None
+    try:
+        return await _full_page_capture_helper(
+            skyvern_page=skyvern_page, page=page, url=url, draw_boxes=draw_boxes, max_number=max_number, mode=mode
+        )
+    except Exception:
+        LOG.warning("Failed to capture the full page, fallback to the scrolling screenshots", url=url, exc_info=True)
+        return None
+
+
 async def _scrolling_screenshots_helper(
     page: Page,
     url: str | None = None,
@@ -120,7 +317,18 @@ async def _scrolling_screenshots_helper(
 
     screenshots: list[bytes] = []
     positions: list[int] = []
-    if await skyvern_page.is_window_scrollable():
+    is_window_scrollable = await skyvern_page.is_window_scrollable()
+    if is_window_scrollable:
+        full_page_capture = await _try_full_page_capture(
+            skyvern_page=skyvern_page, page=page, url=url, draw_boxes=draw_boxes, max_number=max_number, mode=mode
+        )
+        if full_page_capture is not None:
+            capture, positions, viewport_height = full_page_capture
+            screenshots = await asyncio.to_thread(_slice_full_page_capture, capture, positions, viewport_height)
+            LOG.debug("Took the scrolling screenshots in one capture", url=url, num_screenshots=len(screenshots))
+            return screenshots, positions
+
+    if is_window_scrollable:
         scroll_y_px_old = -30.0
         _, initial_scroll_height = await skyvern_page.get_scroll_width_and_height()
         scroll_y_px = await skyvern_page.scroll_to_top(draw_boxes=draw_boxes, frame=frame, frame_index=frame_index)
@@ -163,15 +371,21 @@ async def _scrolling_screenshots_helper(
             # wait until animation ends, which is triggered by scrolling
             await skyvern_page.safe_wait_for_animation_end()
     else:
-        if draw_boxes:
+        draw_boxes_in_dom = draw_boxes and not SettingsManager.get_settings().BROWSER_SCREENSHOT_DRAW_BOXES_IN_PYTHON
+        bounding_boxes: BoundingBoxRects | None = None
+        if draw_boxes_in_dom:
             await skyvern_page.build_elements_and_draw_bounding_boxes(frame=frame, frame_index=frame_index)
+        elif draw_boxes:
+            bounding_boxes = await skyvern_page.get_bounding_box_rects()
 
         LOG.debug("Page is not scrollable", url=url, num_screenshots=len(screenshots))
         screenshot = await _current_viewpoint_screenshot_helper(page=page, mode=mode)
+        if bounding_boxes is not None:
+            screenshot = await asyncio.to_thread(annotate_screenshot, screenshot, bounding_boxes)
         screenshots.append(screenshot)
         positions.append(0)
 
-        if draw_boxes:
+        if draw_boxes_in_dom:
             await skyvern_page.remove_bounding_boxes()
 
     return screenshots, positions
@@ -213,6 +427,30 @@ def _merge_images_by_position(images: list[Image.Image], positions: list[int]) -
     return merged_img
 
 
+def _merge_screenshots(
+    screenshots: list[bytes],
+    positions: list[int],
+    image_format: ImageFormat = ImageFormat.PNG,
+    quality: int = DEFAULT_LOSSY_IMAGE_QUALITY,
+) -> bytes:
+    """
+    Decode the screenshots once, merge them and encode the merged image. CPU bound, run it in a thread.
+    """
+    if len(screenshots) == 1 and image_format == ImageFormat.PNG:
+        return screenshots[0]
+
+    images: list[Image.Image] = []
+    try:
+        for screenshot in screenshots:
+            img = Image.open(BytesIO(screenshot))
+            img.load()
+            images.append(img)
+        return encode_image(_merge_images_by_position(images, positions), image_format=image_format, quality=quality)
+    finally:
+        for img in images:
+            img.close()
+
+
 class SkyvernFrame:
     @staticmethod
     async def evaluate(
@@ -269,23 +507,20 @@ class SkyvernFrame:
         try:
             x, y = await skyvern_frame.get_scroll_x_y()
             async with asyncio.timeout(timeout):
-                screenshots, positions = await _scrolling_screenshots_helper(
-                    page=page, mode=mode, max_number=scrolling_number
-                )
-                images = []
-
-                for screenshot in screenshots:
-                    with Image.open(BytesIO(screenshot)) as img:
-                        img.load()
-                        images.append(img)
-
-                merged_img = _merge_images_by_position(images, positions)
-
-                buffer = BytesIO()
-                merged_img.save(buffer, format="PNG")
-                buffer.seek(0)
-
-                img_data = buffer.read()
+                full_page_capture = None
+                if await skyvern_frame.is_window_scrollable():
+                    # the single capture is already the merged screenshot, no need to slice and merge it again
+                    full_page_capture = await _try_full_page_capture(
+                        skyvern_page=skyvern_frame, page=page, mode=mode, max_number=scrolling_number
+                    )
+
+                if full_page_capture is not None:
+                    img_data = full_page_capture[0]
+                else:
+                    screenshots, positions = await _scrolling_screenshots_helper(
+                        page=page, mode=mode, max_number=scrolling_number
+                    )
+                    img_data = await asyncio.to_thread(_merge_screenshots, screenshots, positions)
                 if file_path is not None:
                     with open(file_path, "wb") as f:
                         f.write(img_data)
@@ -336,13 +571,43 @@ class SkyvernFrame:
     @classmethod
     async def create_instance(cls, frame: Page | Frame) -> SkyvernFrame:
         instance = cls(frame=frame)
-        await cls.evaluate(frame=instance.frame, expression=JS_FUNCTION_DEFS)
-        if SettingsManager.get_settings().ENABLE_EXP_ALL_TEXTUAL_ELEMENTS_INTERACTABLE:
+        enable_all_textual_elements = SettingsManager.get_settings().ENABLE_EXP_ALL_TEXTUAL_ELEMENTS_INTERACTABLE
+        if get_dom_utils_injection_mode() == DomUtilsInjectionMode.CONTEXT and await instance.is_dom_utils_injected(
+            enable_all_textual_elements=enable_all_textual_elements
+        ):
+            DOM_UTILS_INJECTION_STATS.skipped += 1
+            return instance
+
+        await cls.evaluate(frame=instance.frame, expression=JS_FUNCTION_DEFS_WITH_VERSION)
+        DOM_UTILS_INJECTION_STATS.performed += 1
+        if enable_all_textual_elements:
             await instance.evaluate(
                 frame=instance.frame, expression="() => window.GlobalEnableAllTextualElements = true"
             )
         return instance
 
+    async def is_dom_utils_injected(self, enable_all_textual_elements: bool = False) -> bool:
+        """
+        Check the version sentinel left by domUtils.js in the frame. Navigation wipes it, and so does a script version
+        change after a deployment. Flags that need to be set on every instance creation are set in the same round trip.
+        """
+        js_script = """([version, enable_all_textual_elements]) => {
+            if (window.SkyvernDomUtils?.version !== version) {
+                return false;
+            }
+            if (enable_all_textual_elements) {
+                window.GlobalEnableAllTextualElements = true;
+            }
+            return true;
+        }"""
+        try:
+            return await self.evaluate(
+                frame=self.frame, expression=js_script, arg=[JS_FUNCTION_DEFS_VERSION, enable_all_textual_elements]
+            )
+        except Exception:
+            LOG.debug("Failed to check the domUtils.js sentinel, going to inject it", exc_info=True)
+            return False
+
     def __init__(self, frame: Page | Frame) -> None:
         self.frame = frame
 
@@ -353,16 +618,56 @@ class SkyvernFrame:
         async with asyncio.timeout(timeout):
             return await self.frame.content()
 
+    async def get_dom_version(self) -> str | None:
+        try:
+            return await self.evaluate(frame=self.frame, expression="() => SkyvernDomUtils.getDomVersion()")
+        except Exception:
+            LOG.debug("Failed to get the DOM version", exc_info=True)
+            return None
+
+    async def get_dom_fingerprint(self, timeout: float = DOM_FINGERPRINT_TIMEOUT) -> str | None:
+        """
+        Get the fingerprint of the frame from domUtils.js. It never injects domUtils.js, a frame without it is
+        "untracked". None when the DOM changed since the last element tree building, or the frame didn't respond.
+        """
+        js_script = "() => window.SkyvernDomUtils ? SkyvernDomUtils.getDomFingerprint() : 'untracked'"
+        try:
+            async with asyncio.timeout(timeout):
+                return await self.frame.evaluate(js_script)
+        except Exception:
+            LOG.debug("Failed to get the DOM fingerprint", exc_info=True)
+            return None
+
+    async def get_content_snapshot(self, timeout: float = PAGE_CONTENT_TIMEOUT) -> PageContentSnapshot:
+        """
+        Get the serialized HTML of the frame. Serializing a big page takes long, so the HTML is reused until the
+        mutation observer of domUtils.js sees the DOM change.
+        """
+        # read the version before the content, a mutation in between only causes an extra serialization later
+        dom_version = await self.get_dom_version()
+        snapshot = _page_content_snapshots.get(self.frame)
+        if dom_version is not None and snapshot is not None and snapshot.dom_version == dom_version:
+            return snapshot
+
+        content = await self.get_content(timeout=timeout)
+        snapshot = PageContentSnapshot(
+            dom_version=dom_version,
+            content=content,
+            content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+        )
+        _page_content_snapshots[self.frame] = snapshot
+        return snapshot
+
     async def get_scroll_x_y(self) -> tuple[int, int]:
-        js_script = "() => getScrollXY()"
+        js_script = "() => SkyvernDomUtils.getScrollXY()"
         return await self.evaluate(frame=self.frame, expression=js_script)
 
     async def get_scroll_width_and_height(self) -> tuple[int, int]:
-        js_script = "() => getScrollWidthAndHeight()"
+        js_script = "() => SkyvernDomUtils.getScrollWidthAndHeight()"
         return await self.evaluate(frame=self.frame, expression=js_script)
 
     async def scroll_to_x_y(self, x: int, y: int) -> None:
-        js_script = "([x, y]) => scrollToXY(x, y)"
+        js_script = "([x, y]) => SkyvernDomUtils.scrollToXY(x, y)"
         return await self.evaluate(frame=self.frame, expression=js_script, arg=[x, y])
 
     async def safe_scroll_to_x_y(self, x: int, y: int) -> None:
@@ -372,31 +677,31 @@ class SkyvernFrame:
             LOG.warning("Failed to scroll to x, y, ignore it", x=x, y=y, exc_info=True)
 
     async def scroll_to_element_bottom(self, element: ElementHandle, page_by_page: bool = False) -> None:
-        js_script = "([element, page_by_page]) => scrollToElementBottom(element, page_by_page)"
+        js_script = "([element, page_by_page]) => SkyvernDomUtils.scrollToElementBottom(element, page_by_page)"
         return await self.evaluate(frame=self.frame, expression=js_script, arg=[element, page_by_page])
 
     async def scroll_to_element_top(self, element: ElementHandle) -> None:
-        js_script = "(element) => scrollToElementTop(element)"
+        js_script = "(element) => SkyvernDomUtils.scrollToElementTop(element)"
         return await self.evaluate(frame=self.frame, expression=js_script, arg=element)
 
     async def parse_element_from_html(self, frame: str, element: ElementHandle, interactable: bool) -> dict:
-        js_script = "async ([frame, element, interactable]) => await buildElementObject(frame, element, interactable)"
+        js_script = "async ([frame, element, interactable]) => await SkyvernDomUtils.buildElementObject(frame, element, interactable)"
         return await self.evaluate(frame=self.frame, expression=js_script, arg=[frame, element, interactable])
 
     async def get_element_scrollable(self, element: ElementHandle) -> bool:
-        js_script = "(element) => isScrollable(element)"
+        js_script = "(element) => SkyvernDomUtils.isScrollable(element)"
         return await self.evaluate(frame=self.frame, expression=js_script, arg=element)
 
     async def get_element_visible(self, element: ElementHandle) -> bool:
-        js_script = "(element) => isElementVisible(element) && !isHidden(element)"
+        js_script = "(element) => SkyvernDomUtils.isElementVisible(element) && !SkyvernDomUtils.isHidden(element)"
         return await self.evaluate(frame=self.frame, expression=js_script, arg=element)
 
     async def get_disabled_from_style(self, element: ElementHandle) -> bool:
-        js_script = "(element) => checkDisabledFromStyle(element)"
+        js_script = "(element) => SkyvernDomUtils.checkDisabledFromStyle(element)"
         return await self.evaluate(frame=self.frame, expression=js_script, arg=element)
 
     async def get_blocking_element_id(self, element: ElementHandle) -> tuple[str, bool]:
-        js_script = "(element) => getBlockElementUniqueID(element)"
+        js_script = "(element) => SkyvernDomUtils.getBlockElementUniqueID(element)"
         return await self.evaluate(frame=self.frame, expression=js_script, arg=element)
 
     async def scroll_to_top(self, draw_boxes: bool, frame: str, frame_index: int) -> float:
@@ -406,7 +711,7 @@ class SkyvernFrame:
         :param page: Page instance to take the screenshot from.
         :return: Screenshot of the page.
         """
-        js_script = "async ([draw_boxes, frame, frame_index]) => await safeScrollToTop(draw_boxes, frame, frame_index)"
+        js_script = "async ([draw_boxes, frame, frame_index]) => await SkyvernDomUtils.safeScrollToTop(draw_boxes, frame, frame_index)"
         scroll_y_px = await self.evaluate(
             frame=self.frame,
             expression=js_script,
@@ -424,7 +729,7 @@ class SkyvernFrame:
         :param page: Page instance to take the screenshot from.
         :return: Screenshot of the page.
         """
-        js_script = "async ([draw_boxes, frame, frame_index, need_overlap]) => await scrollToNextPage(draw_boxes, frame, frame_index, need_overlap)"
+        js_script = "async ([draw_boxes, frame, frame_index, need_overlap]) => await SkyvernDomUtils.scrollToNextPage(draw_boxes, frame, frame_index, need_overlap)"
         scroll_y_px = await self.evaluate(
             frame=self.frame,
             expression=js_script,
@@ -438,7 +743,7 @@ class SkyvernFrame:
         Remove the bounding boxes from the page.
         :param page: Page instance to remove the bounding boxes from.
         """
-        js_script = "() => removeBoundingBoxes()"
+        js_script = "() => SkyvernDomUtils.removeBoundingBoxes()"
         await self.evaluate(
             frame=self.frame,
             expression=js_script,
@@ -446,7 +751,7 @@ class SkyvernFrame:
         )
 
     async def build_elements_and_draw_bounding_boxes(self, frame: str, frame_index: int) -> None:
-        js_script = "async ([frame, frame_index]) => await buildElementsAndDrawBoundingBoxes(frame, frame_index)"
+        js_script = "async ([frame, frame_index]) => await SkyvernDomUtils.buildElementsAndDrawBoundingBoxes(frame, frame_index)"
         await self.evaluate(
             frame=self.frame,
             expression=js_script,
@@ -454,20 +759,47 @@ class SkyvernFrame:
             arg=[frame, frame_index],
         )
 
+    async def get_full_page_capture_info(self) -> dict[str, Any]:
+        js_script = "() => SkyvernDomUtils.getFullPageCaptureInfo()"
+        return await self.evaluate(frame=self.frame, expression=js_script)
+
+    async def draw_bounding_boxes_for_full_page(self, capture_height: int) -> None:
+        js_script = "async ([capture_height]) => await SkyvernDomUtils.drawBoundingBoxesForFullPage(capture_height)"
+        await self.evaluate(
+            frame=self.frame,
+            expression=js_script,
+            timeout_ms=SettingsManager.get_settings().BROWSER_SCRAPING_BUILDING_ELEMENT_TREE_TIMEOUT_MS,
+            arg=[capture_height],
+        )
+
+    async def get_bounding_box_rects(self, capture_height: int | None = None) -> BoundingBoxRects:
+        """
+        Get the rects of the bounding boxes to draw on a clean screenshot, without drawing them into the page.
+        :param capture_height: the height of a capture beyond the viewport, from the top of the page.
+            None for the rects in the viewport.
+        """
+        js_script = "async ([capture_height]) => await SkyvernDomUtils.getBoundingBoxRects(capture_height)"
+        return await self.evaluate(
+            frame=self.frame,
+            expression=js_script,
+            timeout_ms=SettingsManager.get_settings().BROWSER_SCRAPING_BUILDING_ELEMENT_TREE_TIMEOUT_MS,
+            arg=[capture_height],
+        )
+
     async def is_window_scrollable(self) -> bool:
-        js_script = "() => isWindowScrollable()"
+        js_script = "() => SkyvernDomUtils.isWindowScrollable()"
         return await self.evaluate(frame=self.frame, expression=js_script)
 
     async def is_parent(self, parent: ElementHandle, child: ElementHandle) -> bool:
-        js_script = "([parent, child]) => isParent(parent, child)"
+        js_script = "([parent, child]) => SkyvernDomUtils.isParent(parent, child)"
         return await self.evaluate(frame=self.frame, expression=js_script, arg=[parent, child])
 
     async def is_sibling(self, el1: ElementHandle, el2: ElementHandle) -> bool:
-        js_script = "([el1, el2]) => isSibling(el1, el2)"
+        js_script = "([el1, el2]) => SkyvernDomUtils.isSibling(el1, el2)"
         return await self.evaluate(frame=self.frame, expression=js_script, arg=[el1, el2])
 
     async def has_ASP_client_control(self) -> bool:
-        js_script = "() => hasASPClientControl()"
+        js_script = "() => SkyvernDomUtils.hasASPClientControl()"
         return await self.evaluate(frame=self.frame, expression=js_script)
 
     async def click_element_in_javascript(self, element: ElementHandle) -> None:
@@ -479,15 +811,15 @@ class SkyvernFrame:
         return await self.evaluate(frame=self.frame, expression=js_script, arg=element)
 
     async def get_select_options(self, element: ElementHandle) -> tuple[list, str]:
-        js_script = "([element]) => getSelectOptions(element)"
+        js_script = "([element]) => SkyvernDomUtils.getSelectOptions(element)"
         return await self.evaluate(frame=self.frame, expression=js_script, arg=[element])
 
     async def get_element_dom_depth(self, element: ElementHandle) -> int:
-        js_script = "([element]) => getElementDomDepth(element)"
+        js_script = "([element]) => SkyvernDomUtils.getElementDomDepth(element)"
         return await self.evaluate(frame=self.frame, expression=js_script, arg=[element])
 
     async def remove_all_unique_ids(self) -> None:
-        js_script = "() => removeAllUniqueIds()"
+        js_script = "() => SkyvernDomUtils.removeAllUniqueIds()"
         await self.evaluate(frame=self.frame, expression=js_script)
 
     @TraceManager.traced_async()
@@ -497,10 +829,59 @@ class SkyvernFrame:
         frame_index: int,
         timeout_ms: float = SettingsManager.get_settings().BROWSER_SCRAPING_BUILDING_ELEMENT_TREE_TIMEOUT_MS,
     ) -> tuple[list[dict], list[dict]]:
-        js_script = "async ([frame_name, frame_index]) => await buildTreeFromBody(frame_name, frame_index)"
-        return await self.evaluate(
+        js_script = """async ([frame_name, frame_index]) => {
+            const [elements, tree] = await SkyvernDomUtils.buildTreeFromBody(frame_name, frame_index);
+            return [elements, tree, SkyvernDomUtils.takeTreeBuildTimings()];
+        }"""
+        elements, element_tree, timings = await self.evaluate(
+            frame=self.frame, expression=js_script, timeout_ms=timeout_ms, arg=[frame_name, frame_index]
+        )
+        _record_tree_build_timings(frame_name, timings)
+        return elements, element_tree
+
+    @TraceManager.traced_async()
+    async def build_incremental_tree_from_body(
+        self,
+        frame_name: str | None,
+        frame_index: int,
+        timeout_ms: float = SettingsManager.get_settings().BROWSER_SCRAPING_BUILDING_ELEMENT_TREE_TIMEOUT_MS,
+    ) -> tuple[list[dict], list[dict]] | None:
+        """
+        Patch the element tree built by the last build_tree_from_body with the DOM subtrees mutated since then.
+        None means the frame can't be built incrementally (navigated, too many changes, etc) and it needs a full build.
+        """
+        js_script = """async ([frame_name, frame_index]) => {
+            const result = await SkyvernDomUtils.buildIncrementalTreeFromBody(frame_name, frame_index);
+            return result && [...result, SkyvernDomUtils.takeTreeBuildTimings()];
+        }"""
+        result = await self.evaluate(
             frame=self.frame, expression=js_script, timeout_ms=timeout_ms, arg=[frame_name, frame_index]
         )
+        if result is None:
+            return None
+        elements, element_tree, timings = result
+        _record_tree_build_timings(frame_name, timings)
+        return elements, element_tree
+
+    async def build_tree_from_body_incrementally(
+        self,
+        frame_name: str | None,
+        frame_index: int,
+        timeout_ms: float = SettingsManager.get_settings().BROWSER_SCRAPING_BUILDING_ELEMENT_TREE_TIMEOUT_MS,
+    ) -> tuple[list[dict], list[dict]]:
+        result = None
+        try:
+            result = await self.build_incremental_tree_from_body(
+                frame_name=frame_name, frame_index=frame_index, timeout_ms=timeout_ms
+            )
+        except Exception:
+            LOG.warning("Failed to build the element tree incrementally, going to build the full tree", exc_info=True)
+
+        if result is not None:
+            LOG.debug("Element tree is built incrementally", frame_name=frame_name, frame_index=frame_index)
+            return result
+
+        return await self.build_tree_from_body(frame_name=frame_name, frame_index=frame_index, timeout_ms=timeout_ms)
 
     @TraceManager.traced_async()
     async def get_incremental_element_tree(
@@ -508,10 +889,22 @@ class SkyvernFrame:
         wait_until_finished: bool = True,
         timeout_ms: float = SettingsManager.get_settings().BROWSER_SCRAPING_BUILDING_ELEMENT_TREE_TIMEOUT_MS,
     ) -> tuple[list[dict], list[dict]]:
-        js_script = "async ([wait_until_finished]) => await getIncrementElements(wait_until_finished)"
-        return await self.evaluate(
-            frame=self.frame, expression=js_script, timeout_ms=timeout_ms, arg=[wait_until_finished]
+        settings = SettingsManager.get_settings()
+        js_script = """async ([wait_until_finished, quiet_ms, settle_timeout_ms]) =>
+            await SkyvernDomUtils.getIncrementElements(wait_until_finished, quiet_ms, settle_timeout_ms)"""
+        elements, element_tree, waited_ms = await self.evaluate(
+            frame=self.frame,
+            expression=js_script,
+            timeout_ms=timeout_ms,
+            arg=[wait_until_finished, settings.BROWSER_DOM_SETTLE_QUIET_MS, settings.BROWSER_DOM_SETTLE_TIMEOUT_MS],
         )
+        LOG.debug(
+            "Got the incremental elements",
+            wait_until_finished=wait_until_finished,
+            waited_ms=round(waited_ms),
+            num_elements=len(elements),
+        )
+        return elements, element_tree
 
     @TraceManager.traced_async()
     async def build_tree_from_element(
@@ -521,7 +914,9 @@ class SkyvernFrame:
         full_tree: bool = False,
         timeout_ms: float = SettingsManager.get_settings().BROWSER_SCRAPING_BUILDING_ELEMENT_TREE_TIMEOUT_MS,
     ) -> tuple[list[dict], list[dict]]:
-        js_script = "async ([starter, frame, full_tree]) => await buildElementTree(starter, frame, full_tree)"
+        js_script = (
+            "async ([starter, frame, full_tree]) => await SkyvernDomUtils.buildElementTree(starter, frame, full_tree)"
+        )
         return await self.evaluate(
             frame=self.frame, expression=js_script, timeout_ms=timeout_ms, arg=[starter, frame, full_tree]
         )
@@ -540,9 +935,37 @@ class SkyvernFrame:
             while True:
                 is_finished = await self.evaluate(
                     frame=self.frame,
-                    expression="() => isAnimationFinished()",
+                    expression="() => SkyvernDomUtils.isAnimationFinished()",
                     timeout_ms=timeout_ms,
                 )
                 if is_finished:
                     return
                 await asyncio.sleep(0.1)
+
+    async def wait_for_dom_quiet(self, quiet_ms: float, timeout_ms: float) -> bool:
+        """
+        Wait in the frame until no DOM mutation happened for quiet_ms and no finite animation is running.
+        :return: whether the DOM got quiet before the timeout
+        """
+        js_script = "async ([quiet_ms, timeout_ms]) => await SkyvernDomUtils.waitForDomQuiet(quiet_ms, timeout_ms)"
+        result = await self.evaluate(
+            frame=self.frame,
+            expression=js_script,
+            arg=[quiet_ms, timeout_ms],
+            timeout_ms=timeout_ms + 1000,
+        )
+        return result["settled"]
+
+    async def fill_inputs_in_batch(self, inputs: list[dict[str, str]]) -> set[str]:
+        """
+        Fill the plain text inputs of the frame in one evaluation.
+        :param inputs: [{"id": element_id, "css": css_selector, "text": text}]
+        :return: the ids of the inputs holding their text afterwards, it stops at the first input which isn't filled
+        """
+        js_script = "(inputs) => SkyvernDomUtils.fillInputsInBatch(inputs)"
+        filled_ids = await self.evaluate(
+            frame=self.frame,
+            expression=js_script,
+            arg=inputs,
+        )
+        return set(filled_ids)
@@ -0,0 +1,138 @@
+"""
+Wait for the page to settle after an action: the requests started by the action finished, no DOM mutation in the quiet
+window and no finite animation running. It returns as soon as the page is stable instead of sleeping for a fixed time.
+"""
+
+import asyncio
+import time
+import weakref
+from dataclasses import dataclass
+
+import structlog
+from playwright.async_api import Page, Request
+
+from skyvern.forge.sdk.settings_manager import SettingsManager
+from skyvern.webeye.utils.page import SkyvernFrame
+
+LOG = structlog.get_logger()
+
+# the long-lived connections never finish, they don't block the settling
+IGNORED_RESOURCE_TYPES = frozenset({"websocket", "eventsource", "media"})
+NETWORK_POLL_INTERVAL_SEC = 0.05
+
+
+class PageNetworkTracker:
+    """
+    Track the in-flight requests of a page by the request events of playwright.
+    """
+
+    def __init__(self) -> None:
+        # request -> the monotonic time it was sent
+        self._in_flight: dict[Request, float] = {}
+
+    def on_request(self, request: Request) -> None:
+        if request.resource_type in IGNORED_RESOURCE_TYPES:
+            return
+        self._in_flight[request] = time.monotonic()
+
+    def on_request_done(self, request: Request) -> None:
+        self._in_flight.pop(request, None)
+
+    def pending_requests(self, since: float, max_in_flight_sec: float | None = None) -> int:
+        """
+        The number of the in-flight requests sent at or after the monotonic time since.
+        :param max_in_flight_sec: the requests in flight for longer than this aren't counted
+        """
+        sent_after = since
+        if max_in_flight_sec is not None:
+            sent_after = max(since, time.monotonic() - max_in_flight_sec)
+        return sum(1 for sent_at in self._in_flight.values() if sent_at >= sent_after)
+
+
+_PAGE_NETWORK_TRACKERS: weakref.WeakKeyDictionary[Page, PageNetworkTracker] = weakref.WeakKeyDictionary()
+
+
+def track_page_network(page: Page) -> PageNetworkTracker:
+    """
+    Get the network tracker of the page, the tracking starts at the first call.
+    """
+    tracker = _PAGE_NETWORK_TRACKERS.get(page)
+    if tracker is not None:
+        return tracker
+
+    tracker = PageNetworkTracker()
+    page.on("request", tracker.on_request)
+    page.on("requestfinished", tracker.on_request_done)
+    page.on("requestfailed", tracker.on_request_done)
+    _PAGE_NETWORK_TRACKERS[page] = tracker
+    return tracker
+
+
+@dataclass
+class PageSettleResult:
+    settled: bool
+    waited_ms: float
+    pending_requests: int
+
+
+async def wait_for_page_settled(
+    page: Page,
+    since: float,
+    quiet_ms: float | None = None,
+    timeout_ms: float | None = None,
+    max_request_ms: float | None = None,
+) -> PageSettleResult:
+    """
+    Wait until the requests sent since the monotonic time since finished and the DOM of the page is quiet.
+    The responses usually update the DOM, so the DOM is checked again after the requests finished.
+    The requests in flight for longer than max_request_ms are left out, the pages polling the server would otherwise
+    wait for the whole timeout after every action.
+    """
+    settings = SettingsManager.get_settings()
+    quiet_ms = settings.BROWSER_ACTION_SETTLE_QUIET_MS if quiet_ms is None else quiet_ms
+    timeout_ms = settings.BROWSER_ACTION_SETTLE_TIMEOUT_MS if timeout_ms is None else timeout_ms
+    max_request_ms = settings.BROWSER_ACTION_SETTLE_MAX_REQUEST_MS if max_request_ms is None else max_request_ms
+    max_in_flight_sec = max_request_ms / 1000
+
+    tracker = track_page_network(page)
+    start = time.monotonic()
+    deadline = start + timeout_ms / 1000
+    settled = False
+    pending_requests = 0
+    while (remaining_ms := (deadline - time.monotonic()) * 1000) > 0:
+        try:
+            skyvern_frame = await SkyvernFrame.create_instance(frame=page)
+            dom_quiet = await skyvern_frame.wait_for_dom_quiet(quiet_ms=quiet_ms, timeout_ms=remaining_ms)
+        except Exception:
+            # the page navigated during the wait, wait for the new document instead
+            LOG.debug("Failed to wait for the DOM to be quiet, waiting for the page to load", exc_info=True)
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=max(remaining_ms, 1))
+            except Exception:
+                LOG.debug("Failed to wait for the page to load", exc_info=True)
+                break
+            # the load state returns at once when the page was already loaded, e.g. the evaluation is blocked
+            await asyncio.sleep(NETWORK_POLL_INTERVAL_SEC)
+            continue
+
+        pending_requests = tracker.pending_requests(since, max_in_flight_sec)
+        if dom_quiet and pending_requests == 0:
+            settled = True
+            break
+
+        while pending_requests > 0 and time.monotonic() < deadline:
+            await asyncio.sleep(NETWORK_POLL_INTERVAL_SEC)
+            pending_requests = tracker.pending_requests(since, max_in_flight_sec)
+
+    result = PageSettleResult(
+        settled=settled,
+        waited_ms=(time.monotonic() - start) * 1000,
+        pending_requests=pending_requests,
+    )
+    LOG.debug(
+        "Waited for the page to settle",
+        settled=result.settled,
+        waited_ms=round(result.waited_ms),
+        pending_requests=result.pending_requests,
+    )
+    return result
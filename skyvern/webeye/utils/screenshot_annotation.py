@@ -0,0 +1,128 @@
+"""
+Draw the bounding boxes and the id labels of the elements on clean screenshots, the same as drawBoundingBoxes in
+domUtils.js draws them into the DOM. The rects come from getBoundingBoxRects, so the page is never modified.
+"""
+
+import functools
+from dataclasses import dataclass
+from io import BytesIO
+from typing import TypedDict
+
+from PIL import Image, ImageDraw, ImageFont
+
+BOUNDING_BOX_COLOR = (0, 0, 255)
+BOUNDING_BOX_WIDTH = 2
+LABEL_BACKGROUND_COLOR = (255, 255, 255)
+
+
+class ElementRect(TypedDict):
+    id: str
+    interactable: bool
+    left: float
+    top: float
+    right: float
+    bottom: float
+
+
+class BoundingBoxRects(TypedDict):
+    # the height of the area the rects are relative to, in css pixels
+    visibleHeight: float
+    rects: list[ElementRect]
+
+
+@dataclass
+class ElementRectGroup:
+    rects: list[ElementRect]
+    left: float
+    top: float
+    right: float
+    bottom: float
+
+    @property
+    def label(self) -> str | None:
+        # the same as createHintMarkersForGroups, the group is labeled by its first interactable element
+        for rect in self.rects:
+            if rect["interactable"]:
+                return rect["id"]
+        return None
+
+
+def _intersects(rect1: ElementRect, rect2: ElementRect) -> bool:
+    return (
+        rect1["right"] > rect2["left"]
+        and rect1["left"] < rect2["right"]
+        and rect1["bottom"] > rect2["top"]
+        and rect1["top"] < rect2["bottom"]
+    )
+
+
+def group_overlapping_rects(rects: list[ElementRect]) -> list[ElementRectGroup]:
+    """
+    Group the rects overlapping each other directly or through other rects, the same as groupElementsVisually in
+    domUtils.js. The groups and the rects in them keep the order of the rects.
+    """
+    parents = list(range(len(rects)))
+
+    def find(index: int) -> int:
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    # sweep from left to right, a rect can only overlap the rects still open at its left edge
+    open_indexes: list[int] = []
+    for index in sorted(range(len(rects)), key=lambda i: rects[i]["left"]):
+        rect = rects[index]
+        open_indexes = [other for other in open_indexes if rects[other]["right"] > rect["left"]]
+        for other in open_indexes:
+            if _intersects(rect, rects[other]):
+                parents[find(index)] = find(other)
+        open_indexes.append(index)
+
+    groups: dict[int, ElementRectGroup] = {}
+    for index, rect in enumerate(rects):
+        root = find(index)
+        group = groups.get(root)
+        if group is None:
+            groups[root] = ElementRectGroup(
+                rects=[rect], left=rect["left"], top=rect["top"], right=rect["right"], bottom=rect["bottom"]
+            )
+            continue
+        group.rects.append(rect)
+        group.left = min(group.left, rect["left"])
+        group.top = min(group.top, rect["top"])
+        group.right = max(group.right, rect["right"])
+        group.bottom = max(group.bottom, rect["bottom"])
+    return list(groups.values())
+
+
+@functools.cache
+def _get_label_font() -> ImageFont.ImageFont | ImageFont.FreeTypeFont:
+    return ImageFont.load_default()
+
+
+def annotate_screenshot(screenshot: bytes, bounding_boxes: BoundingBoxRects) -> bytes:
+    """
+    Draw the boxes of the groups with interactable elements on the screenshot. CPU bound, run it in a thread.
+    """
+    with Image.open(BytesIO(screenshot)) as img:
+        img.load()
+        # the screenshot is in device pixels, the rects are in css pixels
+        scale = img.height / bounding_boxes["visibleHeight"]
+        border_width = max(1, round(BOUNDING_BOX_WIDTH * scale))
+        font = _get_label_font()
+        draw = ImageDraw.Draw(img)
+        for group in group_overlapping_rects(bounding_boxes["rects"]):
+            label = group.label
+            if label is None:
+                continue
+            left, top = round(group.left * scale), round(group.top * scale)
+            right = max(left, round(group.right * scale) - 1)
+            bottom = max(top, round(group.bottom * scale) - 1)
+            draw.rectangle((left, top, right, bottom), outline=BOUNDING_BOX_COLOR, width=border_width)
+            draw.rectangle(draw.textbbox((left, top), label, font=font), fill=LABEL_BACKGROUND_COLOR)
+            draw.text((left, top), label, fill=BOUNDING_BOX_COLOR, font=font)
+
+        buffer = BytesIO()
+        img.save(buffer, format="PNG")
+        return buffer.getvalue()
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from skyvern.forge.sdk.artifact.capture_pipeline import ArtifactCapturePipeline, CaptureJob
+
+
+@pytest.mark.asyncio
+async def test_pending_job_with_the_same_coalesce_key_is_replaced() -> None:
+    pipeline = ArtifactCapturePipeline(max_pending=10, concurrency=1)
+    release = asyncio.Event()
+    ran: list[str] = []
+
+    async def blocker() -> None:
+        await release.wait()
+
+    def job(name: str) -> CaptureJob:
+        async def run() -> None:
+            ran.append(name)
+
+        return run
+
+    await pipeline.submit("tsk_1", "blocker", blocker)
+    await pipeline.submit("tsk_1", "video", job("video_1"), coalesce_key="tsk_1:video")
+    await pipeline.submit("tsk_1", "video", job("video_2"), coalesce_key="tsk_1:video")
+    release.set()
+    await pipeline.flush(["tsk_1"])
+
+    assert ran == ["video_2"]
+    assert pipeline.stats.coalesced == 1
+    assert pipeline.stats.completed == 2
+
+
+@pytest.mark.asyncio
+async def test_saturated_pipeline_drops_or_throttles() -> None:
+    pipeline = ArtifactCapturePipeline(max_pending=1, concurrency=1)
+    release = asyncio.Event()
+    ran: list[str] = []
+
+    async def blocker() -> None:
+        await release.wait()
+
+    async def screenshot() -> None:
+        ran.append("screenshot")
+
+    async def failing() -> None:
+        raise ValueError("upload failed")
+
+    await pipeline.submit("tsk_1", "blocker", blocker)
+    await pipeline.submit("tsk_1", "html", screenshot, droppable=True)
+    assert pipeline.stats.dropped == 1
+
+    throttled_submit = asyncio.create_task(pipeline.submit("tsk_1", "screenshot", screenshot))
+    await asyncio.sleep(0)
+    assert not throttled_submit.done()
+    release.set()
+    await throttled_submit
+    await pipeline.flush(["tsk_1"])
+    await pipeline.submit("tsk_1", "failing", failing)
+    await pipeline.flush(["tsk_1"])
+
+    assert ran == ["screenshot"]
+    assert pipeline.stats.throttled == 1
+    assert pipeline.stats.failed == 1
+    assert pipeline.stats.completed == 2
+
+
+@pytest.mark.asyncio
+async def test_jobs_of_a_task_run_in_the_submission_order() -> None:
+    pipeline = ArtifactCapturePipeline(max_pending=10, concurrency=2)
+    release = asyncio.Event()
+    ran: list[str] = []
+
+    async def slow_screenshot() -> None:
+        await release.wait()
+        ran.append("screenshot_1")
+
+    def job(name: str) -> CaptureJob:
+        async def run() -> None:
+            ran.append(name)
+
+        return run
+
+    await pipeline.submit("tsk_1", "screenshot", slow_screenshot)
+    await pipeline.submit("tsk_1", "screenshot", job("screenshot_2"))
+    # the other tasks and the coalesced jobs don't wait for the lane of the task
+    await pipeline.submit("tsk_2", "screenshot", job("other_task"))
+    await pipeline.submit("tsk_1", "video", job("video"), coalesce_key="tsk_1:video")
+    await asyncio.sleep(0.01)
+    assert ran == ["other_task", "video"]
+
+    release.set()
+    await pipeline.flush(["tsk_1", "tsk_2"])
+    assert ran == ["other_task", "video", "screenshot_1", "screenshot_2"]
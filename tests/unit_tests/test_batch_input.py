@@ -0,0 +1,110 @@
+import types
+from typing import Any
+
+import pytest
+
+from skyvern.webeye.actions.action_types import ActionType
+from skyvern.webeye.actions.actions import Action, ClickAction, InputTextAction
+from skyvern.webeye.actions.handler import ActionHandler, fill_input_text_actions_in_batch, is_batch_input_action
+from skyvern.webeye.scraper.scraper import ScrapedPage
+
+ELEMENTS = {
+    "AAA1": {"id": "AAA1", "tagName": "input", "attributes": {"type": "text", "name": "first_name"}},
+    "AAA2": {"id": "AAA2", "tagName": "textarea", "attributes": {}},
+    "AAA3": {"id": "AAA3", "tagName": "input", "attributes": {"type": "email"}},
+    "AAA4": {"id": "AAA4", "tagName": "input", "attributes": {"type": "text", "role": "combobox"}},
+    "AAA5": {"id": "AAA5", "tagName": "input", "attributes": {"type": "tel"}},
+    "AAA6": {"id": "AAA6", "tagName": "button", "attributes": {}},
+}
+
+
+class FakePage:
+    def __init__(self, filled_ids: list[str]) -> None:
+        self.filled_ids = filled_ids
+        self.batches: list[list[dict[str, str]]] = []
+
+    async def evaluate(self, expression: str, arg: Any | None = None) -> Any:
+        if expression.startswith("(inputs) => SkyvernDomUtils.fillInputsInBatch"):
+            self.batches.append(arg)
+            return self.filled_ids
+        # the domUtils.js sentinel check
+        return True
+
+
+def _build_scraped_page() -> ScrapedPage:
+    return ScrapedPage(
+        elements=list(ELEMENTS.values()),
+        id_to_element_dict=ELEMENTS,
+        id_to_frame_dict={element_id: "main.frame" for element_id in ELEMENTS},
+        id_to_css_dict={element_id: f"[unique_id='{element_id}']" for element_id in ELEMENTS},
+        element_tree=[],
+        element_tree_trimmed=[],
+        _browser_state=None,
+        _clean_up_func=None,
+        _scrape_exclude=None,
+    )
+
+
+def _input(element_id: str, text: str = "value") -> InputTextAction:
+    return InputTextAction(element_id=element_id, text=text)
+
+
+def test_only_plain_text_inputs_are_batched() -> None:
+    scraped_page = _build_scraped_page()
+    assert is_batch_input_action(_input("AAA1"), scraped_page)
+    assert is_batch_input_action(_input("AAA2"), scraped_page)
+    assert is_batch_input_action(_input("AAA3"), scraped_page)
+    # auto completion, format check, not an input
+    assert not is_batch_input_action(_input("AAA4"), scraped_page)
+    assert not is_batch_input_action(_input("AAA5"), scraped_page)
+    assert not is_batch_input_action(_input("AAA6"), scraped_page)
+    assert not is_batch_input_action(_input("AAA1", text=""), scraped_page)
+    assert not is_batch_input_action(ClickAction(element_id="AAA6"), scraped_page)
+
+
+@pytest.mark.asyncio
+async def test_consecutive_inputs_are_filled_in_one_call() -> None:
+    scraped_page = _build_scraped_page()
+    actions: list[Action] = [
+        ClickAction(element_id="AAA6"),
+        _input("AAA1", text="Jane"),
+        _input("AAA2", text="note"),
+        _input("AAA3", text="jane@example.com"),
+        _input("AAA4", text="Paris"),
+        _input("AAA1", text="Janet"),
+    ]
+    # the filling stops at the textarea, the email input is left to the one by one filling
+    page: Any = FakePage(filled_ids=["AAA1"])
+    task: Any = types.SimpleNamespace(workflow_run_id=None)
+    step: Any = types.SimpleNamespace()
+
+    filled = await fill_input_text_actions_in_batch(actions, 1, page, scraped_page, task, step)
+    assert filled == {1: True, 2: False, 3: False}
+    assert page.batches == [
+        [
+            {"id": "AAA1", "css": "[unique_id='AAA1']", "text": "Jane"},
+            {"id": "AAA2", "css": "[unique_id='AAA2']", "text": "note"},
+            {"id": "AAA3", "css": "[unique_id='AAA3']", "text": "jane@example.com"},
+        ]
+    ]
+
+    # a single input isn't worth a batch
+    filled = await fill_input_text_actions_in_batch(actions, 5, page, scraped_page, task, step)
+    assert filled == {}
+    assert len(page.batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_inputs_with_a_setup_are_not_batched(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def setup(*args: Any) -> list:
+        return []
+
+    monkeypatch.setitem(ActionHandler._setup_action_types, ActionType.INPUT_TEXT, setup)
+    actions: list[Action] = [_input("AAA1", text="Jane"), _input("AAA2", text="note")]
+    page: Any = FakePage(filled_ids=["AAA1", "AAA2"])
+    task: Any = types.SimpleNamespace(workflow_run_id=None)
+    step: Any = types.SimpleNamespace()
+
+    filled = await fill_input_text_actions_in_batch(actions, 0, page, _build_scraped_page(), task, step)
+    assert filled == {}
+    assert page.batches == []
@@ -0,0 +1,80 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from skyvern.forge.sdk.settings_manager import SettingsManager
+from skyvern.webeye.scraper.scraper import IncrementalScrapePage
+
+
+class FakeFrame:
+    def __init__(self, result: dict | None = None, error: Exception | None = None, hang: bool = False) -> None:
+        self.result = result
+        self.error = error
+        self.hang = hang
+        self.settle_args: list[Any] = []
+        self.load_state_timeouts: list[float] = []
+
+    async def evaluate(self, expression: str, arg: Any | None = None) -> Any:
+        if "waitForIncrementalDomSettled" not in expression:
+            # the domUtils.js sentinel check
+            return True
+        self.settle_args.append(arg)
+        if self.hang:
+            await asyncio.Event().wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    async def wait_for_load_state(self, state: str, timeout: float) -> None:
+        assert state == "load"
+        self.load_state_timeouts.append(timeout)
+
+
+class FakeSkyvernFrame:
+    def __init__(self, frame: FakeFrame) -> None:
+        self.frame = frame
+
+    def get_frame(self) -> FakeFrame:
+        return self.frame
+
+
+@pytest.fixture(autouse=True)
+def dom_settle_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(SettingsManager.get_settings(), "BROWSER_DOM_SETTLE_QUIET_MS", 100)
+    monkeypatch.setattr(SettingsManager.get_settings(), "BROWSER_DOM_SETTLE_TIMEOUT_MS", 200)
+
+
+@pytest.mark.asyncio
+async def test_wait_for_dom_settled_returns_the_waited_seconds() -> None:
+    frame = FakeFrame(result={"waited_ms": 250, "settled": True})
+    incremental_scraped = IncrementalScrapePage(skyvern_frame=FakeSkyvernFrame(frame))  # type: ignore[arg-type]
+
+    assert await incremental_scraped.wait_for_dom_settled() == 0.25
+    # the timeout is extended to wait for the first change
+    assert await incremental_scraped.wait_for_dom_settled(change_timeout_sec=1) == 0.25
+
+    assert frame.settle_args == [[100, 200, 0], [100, 1000, 1000]]
+    assert frame.load_state_timeouts == [200, 1000]
+
+
+@pytest.mark.asyncio
+async def test_wait_for_dom_settled_still_waits_for_the_load_state_after_a_failure() -> None:
+    # e.g. an onclick navigated and destroyed the execution context of the wait
+    frame = FakeFrame(error=RuntimeError("Execution context was destroyed"))
+    incremental_scraped = IncrementalScrapePage(skyvern_frame=FakeSkyvernFrame(frame))  # type: ignore[arg-type]
+
+    assert await incremental_scraped.wait_for_dom_settled() == 0
+    assert frame.load_state_timeouts == [200]
+
+
+@pytest.mark.asyncio
+async def test_wait_for_dom_settled_gives_up_after_the_timeout() -> None:
+    frame = FakeFrame(hang=True)
+    incremental_scraped = IncrementalScrapePage(skyvern_frame=FakeSkyvernFrame(frame))  # type: ignore[arg-type]
+
+    # bounded by the settle timeout plus a second for the evaluation
+    waited_sec = await asyncio.wait_for(incremental_scraped.wait_for_dom_settled(), timeout=5)
+
+    assert waited_sec == 0
+    assert frame.load_state_timeouts == [200]
@@ -0,0 +1,21 @@
+import inspect
+import re
+
+from skyvern.webeye.scraper import scraper
+from skyvern.webeye.utils import page
+from skyvern.webeye.utils.page import JS_FUNCTION_DEFS_VERSION, JS_FUNCTION_DEFS_WITH_VERSION, JS_FUNCTION_NAMES
+
+
+def test_the_script_only_defines_the_namespace() -> None:
+    assert JS_FUNCTION_DEFS_WITH_VERSION.startswith("(() => {\n")
+    assert JS_FUNCTION_DEFS_WITH_VERSION.rstrip().endswith("})();")
+    assert f'version: "{JS_FUNCTION_DEFS_VERSION}"' in JS_FUNCTION_DEFS_WITH_VERSION
+
+
+def test_the_functions_called_through_the_namespace_are_exposed() -> None:
+    called_names = set()
+    for module in (page, scraper):
+        called_names.update(re.findall(r"SkyvernDomUtils\.(\w+)\(", inspect.getsource(module)))
+
+    assert "buildTreeFromBody" in called_names
+    assert called_names <= set(JS_FUNCTION_NAMES)
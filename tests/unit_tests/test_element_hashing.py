@@ -0,0 +1,65 @@
+import copy
+import json
+
+from skyvern.constants import SKYVERN_ID_ATTR
+from skyvern.forge.sdk.api.crypto import calculate_sha256
+from skyvern.webeye.scraper.scraper import build_element_dict, clean_element_before_hashing, hash_element
+
+
+def _legacy_hash_element(element: dict) -> str:
+    return calculate_sha256(json.dumps(clean_element_before_hashing(element), sort_keys=True))
+
+
+def _build_elements() -> list[dict]:
+    option_child = {
+        "id": "AAAc",
+        "frame": "main.frame",
+        "frame_index": 0,
+        "tagName": "span",
+        "attributes": {SKYVERN_ID_ATTR: "AAAc", "class": 'say "héllo" ✱'},
+        "text": "line\nbreak",
+        "children": [],
+        "rect": {"top": 1, "left": 2},
+    }
+    select = {
+        "id": "AAAb",
+        "frame": "main.frame",
+        "frame_index": 0,
+        "tagName": "select",
+        "interactable": True,
+        "attributes": {SKYVERN_ID_ATTR: "AAAb", "required": True, "value": None},
+        "options": [{"optionIndex": 0, "text": "One", "value": "1"}],
+        "children": [option_child],
+    }
+    root = {
+        "id": "AAAa",
+        "frame": "main.frame",
+        "frame_index": 0,
+        "tagName": "div",
+        "interactable": False,
+        "attributes": {SKYVERN_ID_ATTR: "AAAa", "width": 1.5},
+        "text": "",
+        "children": [select],
+    }
+    leaf_without_children = {"id": "AAAd", "frame": "main.frame", "tagName": "br"}
+    # the elements list shares the element objects with the tree, the same as the scraper output
+    return [root, select, option_child, leaf_without_children]
+
+
+def test_hash_element_is_the_same_as_legacy_hashing() -> None:
+    for element in _build_elements():
+        assert hash_element(element) == _legacy_hash_element(element)
+
+
+def test_build_element_dict_hashes_shared_and_copied_elements() -> None:
+    elements = _build_elements()
+    _, _, _, id_to_element_hash, hash_to_element_ids = build_element_dict(elements)
+    for element in elements:
+        assert id_to_element_hash[element["id"]] == _legacy_hash_element(element)
+
+    # the same element content with another id gets the same hash
+    duplicated = copy.deepcopy(elements[2])
+    duplicated["id"] = "AAAe"
+    duplicated["attributes"][SKYVERN_ID_ATTR] = "AAAe"
+    _, _, _, id_to_element_hash, hash_to_element_ids = build_element_dict(elements + [duplicated])
+    assert hash_to_element_ids[id_to_element_hash["AAAc"]] == ["AAAc", "AAAe"]
@@ -0,0 +1,81 @@
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
+from skyvern.webeye.scraper.scraper import ElementHTMLRenderer, json_to_html
+
+LONG_HREF = "https://example.com/" + "a" * 200
+
+
+def _build_element_tree() -> list[dict]:
+    link = {
+        "id": "AAAc",
+        "tagName": "a",
+        "attributes": {"href": LONG_HREF, "title": "go"},
+        "text": "Go",
+        "children": [],
+    }
+    select = {
+        "id": "AAAb",
+        "tagName": "div",
+        "isSelectable": True,
+        "attributes": {"required": True},
+        "options": [{"optionIndex": 0, "text": "One"}, {"optionIndex": 1, "text": "", "value": "2"}],
+        "children": [],
+    }
+    root = {
+        "id": "AAAa",
+        "tagName": "div",
+        "attributes": {},
+        "beforePseudoText": "*",
+        "children": [select, link, {"tagName": "br"}, {"tagName": "span", "isDropped": True}],
+    }
+    return [root]
+
+
+def test_renderer_reuses_fragments_and_registers_hashed_hrefs() -> None:
+    skyvern_context.set(SkyvernContext())
+    try:
+        element_tree = _build_element_tree()
+        expected = "".join(json_to_html(element) for element in element_tree)
+        hashed_href_map = dict(skyvern_context.ensure_context().hashed_href_map)
+        assert len(hashed_href_map) == 1
+        assert LONG_HREF not in expected
+        # the attributes of the tree are not modified by rendering
+        assert element_tree[0]["children"][1]["attributes"]["href"] == LONG_HREF
+
+        renderer = ElementHTMLRenderer()
+        assert renderer.render(element_tree) == expected
+
+        # rendering from the memoized fragments still registers the hashed hrefs into the new context
+        skyvern_context.set(SkyvernContext())
+        assert renderer.render(element_tree) == expected
+        assert skyvern_context.ensure_context().hashed_href_map == hashed_href_map
+
+        assert 'id="AAAa"' not in renderer.render(element_tree, need_skyvern_attrs=False)
+    finally:
+        skyvern_context.reset()
+
+
+def test_renderer_memoizes_fragments_within_the_bound() -> None:
+    skyvern_context.set(SkyvernContext())
+    try:
+        # a deep chain, every fragment holds the HTML of its whole subtree
+        element = {"tagName": "span", "attributes": {}, "text": "x" * 100, "children": []}
+        for _ in range(50):
+            element = {"tagName": "div", "attributes": {}, "children": [element]}
+        element_tree = [element]
+        expected = json_to_html(element)
+
+        unbounded_renderer = ElementHTMLRenderer()
+        assert unbounded_renderer.render(element_tree) == expected
+        assert unbounded_renderer.memoized_chars > 10 * len(expected)
+
+        renderer = ElementHTMLRenderer(max_memoized_chars=2 * len(expected))
+        assert renderer.render(element_tree) == expected
+        assert renderer.render(element_tree) == expected
+        assert 0 < renderer.memoized_chars <= 2 * len(expected)
+
+        renderer.clear()
+        assert renderer.memoized_chars == 0
+        assert renderer.render(element_tree) == expected
+    finally:
+        skyvern_context.reset()
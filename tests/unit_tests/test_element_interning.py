@@ -0,0 +1,41 @@
+import json
+
+from skyvern.webeye.scraper.scraper import intern_element_strings
+
+
+def _build_element_tree() -> list[dict]:
+    child = {
+        "id": "AAAb",
+        "frame": "main.frame",
+        "tagName": "input",
+        "interactable": True,
+        "attributes": {"unique_id": "AAAb", "name": "first_name"},
+        "text": " ",
+        "children": [],
+    }
+    root = {
+        "id": "AAAa",
+        "frame": "main.frame",
+        "tagName": "div",
+        "attributes": {"unique_id": "AAAa", "class": "root"},
+        "children": [child],
+    }
+    return [root]
+
+
+def test_intern_element_strings_keeps_the_content() -> None:
+    # decoded elements have a new string object for every key, like the elements coming from the page
+    element_tree = json.loads(
+        json.dumps(_build_element_tree()),
+        object_pairs_hook=lambda pairs: {"".join(list(key)): value for key, value in pairs},
+    )
+    elements = [element_tree[0], element_tree[0]["children"][0]]
+    serialized = json.dumps(element_tree)
+
+    intern_element_strings(elements)
+
+    assert json.dumps(element_tree) == serialized
+    assert elements[1] is element_tree[0]["children"][0]
+    root_keys = {key: key for key in elements[0]}
+    child_keys = {key: key for key in elements[1]}
+    assert root_keys["tagName"] is child_keys["tagName"]
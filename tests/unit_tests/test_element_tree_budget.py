@@ -0,0 +1,131 @@
+from typing import Any
+
+import pytest
+
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
+from skyvern.utils import prompt_engine
+from skyvern.webeye.scraper.scraper import ElementTreeBuilder, ElementTreeFormat, ScrapedPage
+
+
+def _text_block(index: int) -> dict:
+    return {"tagName": "p", "text": f"paragraph {index} " + "x" * 50}
+
+
+def _build_scraped_page() -> ScrapedPage:
+    form = {
+        "tagName": "form",
+        "children": [
+            {"id": "AAAb", "tagName": "input", "interactable": True, "attributes": {"name": "email"}},
+            {"tagName": "svg", "children": [{"tagName": "path"}]},
+            {"id": "AAAc", "tagName": "button", "interactable": True, "text": "Submit"},
+        ],
+    }
+    body = {
+        "tagName": "body",
+        "children": [_text_block(0), form, *[_text_block(index) for index in range(1, 10)]],
+    }
+    return ScrapedPage(
+        elements=[],
+        element_tree=[body],
+        element_tree_trimmed=[body],
+        _browser_state=None,
+        _clean_up_func=None,
+        _scrape_exclude=None,
+    )
+
+
+def test_economy_tree_within_budget() -> None:
+    skyvern_context.set(SkyvernContext())
+    try:
+        scraped_page = _build_scraped_page()
+        economy_tree = scraped_page.build_economy_elements_tree()
+        assert "<svg" not in economy_tree
+        assert scraped_page.build_economy_elements_tree_within_budget(max_length=len(economy_tree)) == economy_tree
+
+        # the text blocks at the end of the page are dropped first, the actionable elements are kept
+        max_length = len(economy_tree) // 2
+        budgeted_tree = scraped_page.build_economy_elements_tree_within_budget(max_length=max_length)
+        assert len(budgeted_tree) <= max_length
+        assert 'id="AAAb"' in budgeted_tree and 'id="AAAc"' in budgeted_tree
+        assert "paragraph 0" in budgeted_tree and "paragraph 9" not in budgeted_tree
+        assert budgeted_tree.startswith("<body>") and budgeted_tree.endswith("</body>")
+
+        # when the actionable elements don't fit either, the tree is cut at element boundaries
+        budgeted_tree = scraped_page.build_economy_elements_tree_within_budget(max_length=80)
+        assert len(budgeted_tree) <= 80
+        assert budgeted_tree.startswith("<body>") and budgeted_tree.endswith("</body>")
+
+        # the cached economy tree is not modified by the budgeting
+        assert scraped_page.build_economy_elements_tree() == economy_tree
+    finally:
+        skyvern_context.reset()
+
+
+def _count_tokens(text: str) -> int:
+    # one token per non blank character
+    return len(text.replace(" ", ""))
+
+
+class FakePromptEngine:
+    def load_prompt(self, template: str, **kwargs: Any) -> str:
+        return "prompt " + kwargs["elements"]
+
+
+class DenseEconomyTreeBuilder(ElementTreeBuilder):
+    """
+    The economy tree has twice as many tokens per character as the whole tree.
+    """
+
+    def __init__(self) -> None:
+        self.max_lengths: list[int] = []
+
+    def support_economy_elements_tree(self) -> bool:
+        return True
+
+    def build_element_tree(
+        self, fmt: ElementTreeFormat = ElementTreeFormat.HTML, html_need_skyvern_attrs: bool = True
+    ) -> str:
+        return "a " * 200
+
+    def build_economy_elements_tree(
+        self,
+        fmt: ElementTreeFormat = ElementTreeFormat.HTML,
+        html_need_skyvern_attrs: bool = True,
+        percent_to_keep: float = 1,
+    ) -> str:
+        return "b" * 200
+
+    def build_economy_elements_tree_within_budget(self, max_length: int, html_need_skyvern_attrs: bool = True) -> str:
+        self.max_lengths.append(max_length)
+        return super().build_economy_elements_tree_within_budget(max_length, html_need_skyvern_attrs)
+
+
+def test_economy_tree_is_pruned_again_when_the_prompt_is_still_too_long(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(prompt_engine, "DEFAULT_MAX_TOKENS", 100)
+    monkeypatch.setattr(prompt_engine, "count_tokens", _count_tokens)
+    monkeypatch.setattr(prompt_engine, "count_tokens_cached", _count_tokens)
+    monkeypatch.setattr(prompt_engine, "exceeds_token_limit", lambda text, max_tokens: _count_tokens(text) > max_tokens)
+    builder = DenseEconomyTreeBuilder()
+
+    prompt = prompt_engine.load_prompt_with_elements(builder, FakePromptEngine(), "template")  # type: ignore[arg-type]
+
+    # the first length budget comes from the tokens per character of the whole tree, the economy tree is denser
+    assert builder.max_lengths == [188, 94]
+    assert prompt == "prompt " + "b" * 94
+    assert _count_tokens(prompt) <= 100
+
+
+def test_elements_are_dropped_when_the_rest_of_the_prompt_is_over_the_max_tokens(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(prompt_engine, "DEFAULT_MAX_TOKENS", 5)
+    monkeypatch.setattr(prompt_engine, "count_tokens", _count_tokens)
+    monkeypatch.setattr(prompt_engine, "count_tokens_cached", _count_tokens)
+    monkeypatch.setattr(prompt_engine, "exceeds_token_limit", lambda text, max_tokens: _count_tokens(text) > max_tokens)
+    builder = DenseEconomyTreeBuilder()
+
+    prompt = prompt_engine.load_prompt_with_elements(builder, FakePromptEngine(), "template")  # type: ignore[arg-type]
+
+    assert builder.max_lengths == [0]
+    assert prompt == "prompt "
@@ -0,0 +1,27 @@
+from typing import Any
+
+import pytest
+
+from skyvern.webeye.utils.page import ELEMENT_TREE_BUILD_TIMINGS, SkyvernFrame
+
+
+class FakeFrame:
+    async def evaluate(self, expression: str, arg: Any | None = None) -> Any:
+        assert "SkyvernDomUtils.takeTreeBuildTimings()" in expression
+        timings = {"builds": 1, "elements": 1, "layout_snapshot_ms": 2.5, "visibility_ms": 1.0, "total_ms": 10.0}
+        return [[{"id": "AAAB"}], [{"id": "AAAB", "children": []}], timings]
+
+
+@pytest.mark.asyncio
+async def test_build_tree_from_body_records_the_tree_build_timings() -> None:
+    builds = ELEMENT_TREE_BUILD_TIMINGS.builds
+    layout_snapshot_ms = ELEMENT_TREE_BUILD_TIMINGS.layout_snapshot_ms
+
+    elements, element_tree = await SkyvernFrame(frame=FakeFrame()).build_tree_from_body(  # type: ignore[arg-type]
+        frame_name="main.frame", frame_index=0
+    )
+
+    assert elements == [{"id": "AAAB"}]
+    assert element_tree == [{"id": "AAAB", "children": []}]
+    assert ELEMENT_TREE_BUILD_TIMINGS.builds == builds + 1
+    assert ELEMENT_TREE_BUILD_TIMINGS.layout_snapshot_ms == layout_snapshot_ms + 2.5
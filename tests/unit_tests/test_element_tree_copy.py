@@ -0,0 +1,46 @@
+import copy
+
+from skyvern.webeye.scraper.scraper import copy_element_tree, estimate_memory_size, trim_element_tree
+
+
+def _build_element_tree() -> list[dict]:
+    child = {
+        "id": "AAAb",
+        "frame": "main.frame",
+        "tagName": "input",
+        "interactable": True,
+        "attributes": {"unique_id": "AAAb", "src": "data:image/png;base64,AAAA", "name": "n" * 600},
+        "rect": {"top": 1, "left": 2},
+        "text": " ",
+        "children": [],
+    }
+    root = {
+        "id": "AAAa",
+        "frame": "main.frame",
+        "tagName": "div",
+        "attributes": {"unique_id": "AAAa", "class": "root"},
+        "rect": {"top": 0, "left": 0},
+        "children": [child],
+    }
+    return [root]
+
+
+def test_trimming_the_copied_tree_keeps_the_source_tree() -> None:
+    element_tree = _build_element_tree()
+    source = copy.deepcopy(element_tree)
+
+    trimmed = trim_element_tree(copy_element_tree(element_tree))
+
+    assert element_tree == source
+    assert trimmed == trim_element_tree(copy.deepcopy(source))
+    # the untouched values are shared instead of copied
+    copied = copy_element_tree(element_tree)
+    assert copied[0] is not element_tree[0]
+    assert copied[0]["children"][0]["rect"] is element_tree[0]["children"][0]["rect"]
+
+
+def test_estimate_memory_size_counts_shared_objects_once() -> None:
+    element_tree = _build_element_tree()
+    tree_size, copied_size = estimate_memory_size(element_tree, copy_element_tree(element_tree))
+    _, deep_copied_size = estimate_memory_size(element_tree, copy.deepcopy(element_tree))
+    assert 0 < copied_size < deep_copied_size < tree_size
@@ -0,0 +1,42 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from skyvern.config import settings
+from skyvern.webeye.scraper.scraper import get_frame_text
+
+
+class FakeFrameElement:
+    async def is_visible(self) -> bool:
+        return True
+
+
+class FakeFrame:
+    def __init__(self, text: str, child_frames: list["FakeFrame"] | None = None, hang: bool = False) -> None:
+        self.text = text
+        self.child_frames = child_frames or []
+        self.hang = hang
+
+    def is_detached(self) -> bool:
+        return False
+
+    async def frame_element(self) -> FakeFrameElement:
+        return FakeFrameElement()
+
+    async def evaluate(self, expression: str, arg: Any | None = None) -> str:
+        if self.hang:
+            await asyncio.Event().wait()
+        return self.text
+
+
+@pytest.mark.asyncio
+async def test_a_hung_child_frame_is_given_up_after_the_frame_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "BROWSER_SCRAPING_FRAME_TIMEOUT_MS", 100)
+    monkeypatch.setattr(settings, "BROWSER_SCRAPING_FRAME_CONCURRENCY", 1)
+    frame = FakeFrame("main ", child_frames=[FakeFrame("hung ", hang=True), FakeFrame("child")])
+
+    # the hung frame releases the only slot after the frame timeout, so the other child frame is still read
+    text = await asyncio.wait_for(get_frame_text(frame), timeout=5)  # type: ignore[arg-type]
+
+    assert text == "main child"
@@ -0,0 +1,39 @@
+from io import BytesIO
+
+from PIL import Image
+
+from skyvern.webeye.utils.page import _get_scroll_positions, _slice_full_page_capture
+
+
+def test_scroll_positions_match_the_scrolling_loop() -> None:
+    assert _get_scroll_positions(viewport_height=1080, scroll_height=5000, max_number=10, need_overlap=True) == [
+        0,
+        880,
+        1760,
+        2640,
+        3520,
+        3920,
+    ]
+    assert _get_scroll_positions(viewport_height=1080, scroll_height=50000, max_number=3, need_overlap=False) == [
+        0,
+        1080,
+        2160,
+    ]
+    assert _get_scroll_positions(viewport_height=1080, scroll_height=1000, max_number=10, need_overlap=True) == [0]
+
+
+def test_slice_full_page_capture_scales_to_device_pixels() -> None:
+    positions = [0, 800, 1200]
+    capture = Image.new("RGB", (100, (1200 + 1000) * 2))
+    for position in positions:
+        capture.putpixel((0, position * 2), (255, 0, 0))
+    buffer = BytesIO()
+    capture.save(buffer, format="PNG")
+
+    screenshots = _slice_full_page_capture(buffer.getvalue(), positions, viewport_height=1000)
+
+    assert len(screenshots) == len(positions)
+    for screenshot in screenshots:
+        with Image.open(BytesIO(screenshot)) as img:
+            assert img.size == (100, 2000)
+            assert img.getpixel((0, 0)) == (255, 0, 0)
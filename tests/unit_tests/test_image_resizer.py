@@ -0,0 +1,30 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from skyvern.utils.image_resizer import ImageFormat, Resolution, get_image_media_type, resize_screenshots
+
+
+def _png(width: int, height: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), (200, 100, 50)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    "image_format, media_type",
+    [(ImageFormat.PNG, "image/png"), (ImageFormat.JPEG, "image/jpeg"), (ImageFormat.WEBP, "image/webp")],
+)
+def test_resize_screenshots_encodes_in_the_format(image_format: ImageFormat, media_type: str) -> None:
+    resized = resize_screenshots([_png(1920, 1080)], Resolution(width=1366, height=768), image_format=image_format)
+
+    assert get_image_media_type(resized[0]) == media_type
+    with Image.open(BytesIO(resized[0])) as img:
+        assert img.size == (1366, 768)
+
+
+def test_resize_screenshots_keeps_the_screenshots_in_the_target_dimension() -> None:
+    screenshot = _png(1366, 768)
+
+    assert resize_screenshots([screenshot], Resolution(width=1366, height=768))[0] is screenshot
@@ -0,0 +1,54 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from skyvern.forge.sdk.api.llm.image_policy import apply_image_policy
+from skyvern.forge.sdk.api.llm.models import LLMImagePolicy
+from skyvern.forge.sdk.settings_manager import SettingsManager
+from skyvern.utils.image_resizer import ImageFormat, get_image_media_type
+
+
+def _screenshot() -> bytes:
+    buffer = BytesIO()
+    Image.effect_noise((1920, 1080), 40).convert("RGB").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_apply_image_policy_downscales_and_reuses_the_encoded_screenshots() -> None:
+    screenshot = _screenshot()
+    policy = LLMImagePolicy(max_edge=1024, image_format=ImageFormat.JPEG, quality=70, grayscale=True)
+
+    encoded = await apply_image_policy([screenshot], policy, "gpt-4o")
+
+    assert encoded.screenshots is not None
+    assert get_image_media_type(encoded.screenshots[0]) == "image/jpeg"
+    with Image.open(BytesIO(encoded.screenshots[0])) as img:
+        assert img.size == (1024, 576)
+        assert img.mode == "L"
+    assert encoded.bytes_saved == len(screenshot) - len(encoded.screenshots[0])
+    assert encoded.image_tokens_saved > 0
+
+    retried = await apply_image_policy([screenshot], policy, "gpt-4o")
+    assert retried.screenshots is not None
+    assert retried.screenshots[0] is encoded.screenshots[0]
+
+
+@pytest.mark.asyncio
+async def test_apply_noop_image_policy_sends_the_screenshots_as_they_are() -> None:
+    screenshots = [_screenshot()]
+    policy = LLMImagePolicy(max_edge=None, image_format=ImageFormat.PNG, grayscale=False)
+
+    encoded = await apply_image_policy(screenshots, policy, "gpt-4o")
+
+    assert encoded.screenshots is screenshots
+    assert encoded.bytes_saved == 0
+
+
+def test_unknown_image_format_setting_falls_back_to_png(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(SettingsManager.get_settings(), "LLM_CONFIG_IMAGE_FORMAT", "jpg")
+    assert LLMImagePolicy().image_format == ImageFormat.PNG
+
+    monkeypatch.setattr(SettingsManager.get_settings(), "LLM_CONFIG_IMAGE_FORMAT", "WEBP")
+    assert LLMImagePolicy().image_format == ImageFormat.WEBP
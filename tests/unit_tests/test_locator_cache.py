@@ -0,0 +1,51 @@
+from typing import Any, Callable
+
+from skyvern.webeye.utils.locator_cache import LocatorCache, track_page_changes
+
+
+class FakePage:
+    def __init__(self) -> None:
+        self.listeners: dict[str, list[Callable[[Any], None]]] = {}
+
+    def on(self, event: str, listener: Callable[[Any], None]) -> None:
+        self.listeners.setdefault(event, []).append(listener)
+
+    def navigate(self) -> None:
+        for listener in self.listeners.get("framenavigated", []):
+            listener(self)
+
+
+class FakeFrame:
+    def __init__(self) -> None:
+        self.detached = False
+
+    def is_detached(self) -> bool:
+        return self.detached
+
+
+def test_elements_are_dropped_on_dom_change_and_frames_on_navigation() -> None:
+    page = FakePage()
+    cache = LocatorCache()
+    frame = FakeFrame()
+    cache.set_frame(page, "iframe_1", "frame_locator", frame)  # type: ignore[arg-type]
+    cache.set_element(page, "AAA1", "locator", page)  # type: ignore[arg-type]
+
+    assert cache.get_frame(page, "iframe_1") == ("frame_locator", frame)  # type: ignore[arg-type]
+    assert cache.get_element(page, "AAA1") == ("locator", page)  # type: ignore[arg-type]
+
+    track_page_changes(page).dom_changes += 1  # type: ignore[arg-type]
+    assert cache.get_element(page, "AAA1") is None  # type: ignore[arg-type]
+    assert cache.get_frame(page, "iframe_1") == ("frame_locator", frame)  # type: ignore[arg-type]
+
+    frame.detached = True
+    assert cache.get_frame(page, "iframe_1") is None  # type: ignore[arg-type]
+
+    frame.detached = False
+    cache.set_element(page, "AAA1", "locator", page)  # type: ignore[arg-type]
+    page.navigate()
+    assert cache.get_frame(page, "iframe_1") is None  # type: ignore[arg-type]
+    assert cache.get_element(page, "AAA1") is None  # type: ignore[arg-type]
+
+    # a new page doesn't see the locators of the old one
+    cache.set_element(page, "AAA1", "locator", page)  # type: ignore[arg-type]
+    assert cache.get_element(FakePage(), "AAA1") is None  # type: ignore[arg-type]
@@ -0,0 +1,48 @@
+from typing import Any
+
+import pytest
+
+from skyvern.webeye.utils.page import SkyvernFrame
+
+
+class FakeFrame:
+    def __init__(self, dom_version: str | None) -> None:
+        self.dom_version = dom_version
+        self.html = "<html><body>page</body></html>"
+        self.content_calls = 0
+
+    async def evaluate(self, expression: str, arg: Any | None = None) -> Any:
+        assert expression == "() => SkyvernDomUtils.getDomVersion()"
+        return self.dom_version
+
+    async def content(self) -> str:
+        self.content_calls += 1
+        return self.html
+
+
+@pytest.mark.asyncio
+async def test_content_snapshot_is_reused_until_the_dom_version_changes() -> None:
+    frame = FakeFrame(dom_version="abc:1")
+    skyvern_frame = SkyvernFrame(frame=frame)  # type: ignore[arg-type]
+
+    snapshot = await skyvern_frame.get_content_snapshot()
+    assert await skyvern_frame.get_content_snapshot() is snapshot
+    assert frame.content_calls == 1
+
+    frame.dom_version = "abc:2"
+    frame.html = "<html><body>changed</body></html>"
+    changed_snapshot = await skyvern_frame.get_content_snapshot()
+    assert changed_snapshot.content == frame.html
+    assert changed_snapshot.content_hash != snapshot.content_hash
+    assert frame.content_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_content_snapshot_without_dom_version_is_always_serialized() -> None:
+    frame = FakeFrame(dom_version=None)
+    skyvern_frame = SkyvernFrame(frame=frame)  # type: ignore[arg-type]
+
+    await skyvern_frame.get_content_snapshot()
+    await skyvern_frame.get_content_snapshot()
+
+    assert frame.content_calls == 2
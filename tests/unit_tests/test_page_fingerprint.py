@@ -0,0 +1,62 @@
+from typing import Any
+
+import pytest
+
+from skyvern.webeye.scraper.scraper import get_page_fingerprint
+
+
+class FakeFrameElement:
+    def __init__(self, visible: bool) -> None:
+        self.visible = visible
+
+    async def is_visible(self) -> bool:
+        return self.visible
+
+
+class FakeFrame:
+    def __init__(self, url: str, fingerprint: str | None, visible: bool = True) -> None:
+        self.url = url
+        self.fingerprint = fingerprint
+        self.visible = visible
+        self.child_frames: list[FakeFrame] = []
+
+    def is_detached(self) -> bool:
+        return False
+
+    async def frame_element(self) -> FakeFrameElement:
+        return FakeFrameElement(self.visible)
+
+    async def evaluate(self, expression: str, arg: Any | None = None) -> Any:
+        if not self.visible:
+            raise AssertionError("an invisible iframe must not be evaluated")
+        return self.fingerprint
+
+
+class FakePage(FakeFrame):
+    def __init__(self, fingerprint: str | None, child_frames: list[FakeFrame]) -> None:
+        super().__init__("https://example.com", fingerprint)
+        self.main_frame = self
+        self.child_frames = child_frames
+
+
+@pytest.mark.asyncio
+async def test_page_fingerprint_covers_the_iframes() -> None:
+    iframe = FakeFrame("https://example.com/frame", "frame:1")
+    hidden_iframe = FakeFrame("https://ads.example.com", None, visible=False)
+    page = FakePage("main:1", [iframe, hidden_iframe])
+
+    fingerprint = await get_page_fingerprint(page)  # type: ignore[arg-type]
+    assert fingerprint == await get_page_fingerprint(page)  # type: ignore[arg-type]
+
+    iframe.fingerprint = "frame:2"
+    assert await get_page_fingerprint(page) != fingerprint  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_page_changed_since_the_tree_building_has_no_fingerprint() -> None:
+    iframe = FakeFrame("https://example.com/frame", "frame:1")
+
+    assert await get_page_fingerprint(FakePage(None, [iframe])) is None  # type: ignore[arg-type]
+
+    iframe.fingerprint = None
+    assert await get_page_fingerprint(FakePage("main:1", [iframe])) is None  # type: ignore[arg-type]
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from typing import Any, Callable
+
+import pytest
+
+from skyvern.webeye.utils.page_settle import PageNetworkTracker, track_page_network, wait_for_page_settled
+
+
+class FakeRequest:
+    def __init__(self, resource_type: str = "fetch") -> None:
+        self.resource_type = resource_type
+
+
+class FakePage:
+    def __init__(self) -> None:
+        self.listeners: dict[str, list[Callable[[Any], None]]] = {}
+        self.dom_quiet_calls = 0
+
+    def on(self, event: str, listener: Callable[[Any], None]) -> None:
+        self.listeners.setdefault(event, []).append(listener)
+
+    def emit(self, event: str, request: FakeRequest) -> None:
+        for listener in self.listeners.get(event, []):
+            listener(request)
+
+    async def evaluate(self, expression: str, arg: Any | None = None) -> Any:
+        if "waitForDomQuiet" in expression:
+            self.dom_quiet_calls += 1
+            return {"settled": True, "waited_ms": 0}
+        # the domUtils.js sentinel check and the flags
+        return True
+
+
+def test_network_tracker_counts_the_requests_sent_since() -> None:
+    tracker = PageNetworkTracker()
+    old_request = FakeRequest()
+    tracker.on_request(old_request)  # type: ignore[arg-type]
+    since = time.monotonic()
+    new_request = FakeRequest()
+    tracker.on_request(new_request)  # type: ignore[arg-type]
+    tracker.on_request(FakeRequest(resource_type="websocket"))  # type: ignore[arg-type]
+
+    assert tracker.pending_requests(since) == 1
+    tracker.on_request_done(new_request)  # type: ignore[arg-type]
+    assert tracker.pending_requests(since) == 0
+    assert tracker.pending_requests(0) == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_when_the_requests_of_the_action_finished() -> None:
+    page = FakePage()
+    since = time.monotonic()
+    result = await wait_for_page_settled(page, since=since, quiet_ms=0, timeout_ms=1000)  # type: ignore[arg-type]
+    assert result.settled
+    assert page.dom_quiet_calls == 1
+
+    request = FakeRequest()
+    page.emit("request", request)
+
+    async def finish_request() -> None:
+        await asyncio.sleep(0.1)
+        page.emit("requestfinished", request)
+
+    finishing = asyncio.create_task(finish_request())
+    result = await wait_for_page_settled(page, since=since, quiet_ms=0, timeout_ms=1000)  # type: ignore[arg-type]
+    await finishing
+    assert result.settled
+    assert result.pending_requests == 0
+    assert 100 <= result.waited_ms < 1000
+    # the DOM is checked again after the requests finished
+    assert page.dom_quiet_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_wait_gives_up_at_the_timeout_with_pending_requests() -> None:
+    page = FakePage()
+    since = time.monotonic()
+    # the tracking starts at the first wait
+    await wait_for_page_settled(page, since=since, quiet_ms=0, timeout_ms=100)  # type: ignore[arg-type]
+    page.emit("request", FakeRequest())
+
+    result = await wait_for_page_settled(page, since=since, quiet_ms=0, timeout_ms=100)  # type: ignore[arg-type]
+    assert not result.settled
+    assert result.pending_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_request_that_never_finishes_stops_blocking_after_the_cap() -> None:
+    page = FakePage()
+    since = time.monotonic()
+    await wait_for_page_settled(page, since=since, quiet_ms=0, timeout_ms=100)  # type: ignore[arg-type]
+    # e.g. a long poll started by the action
+    page.emit("request", FakeRequest())
+
+    result = await wait_for_page_settled(
+        page,  # type: ignore[arg-type]
+        since=since,
+        quiet_ms=0,
+        timeout_ms=2000,
+        max_request_ms=200,
+    )
+    assert result.settled
+    assert result.pending_requests == 0
+    assert result.waited_ms < 1000
+    tracker = track_page_network(page)  # type: ignore[arg-type]
+    assert tracker.pending_requests(since) == 1
+
+
+class BlockedEvaluationPage(FakePage):
+    """
+    The page is loaded, but the DOM wait can't be evaluated in it.
+    """
+
+    async def evaluate(self, expression: str, arg: Any | None = None) -> Any:
+        if "waitForDomQuiet" in expression:
+            self.dom_quiet_calls += 1
+            raise RuntimeError("Execution context was destroyed")
+        return True
+
+    async def wait_for_load_state(self, state: str, timeout: float) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_wait_polls_when_the_dom_wait_keeps_failing_on_a_loaded_page() -> None:
+    page = BlockedEvaluationPage()
+    result = await wait_for_page_settled(page, since=time.monotonic(), quiet_ms=0, timeout_ms=200)  # type: ignore[arg-type]
+
+    assert not result.settled
+    # about one attempt per poll interval instead of a busy loop until the timeout
+    assert 1 <= page.dom_quiet_calls <= 5
@@ -0,0 +1,50 @@
+from io import BytesIO
+
+from PIL import Image
+
+from skyvern.webeye.utils.screenshot_annotation import (
+    BOUNDING_BOX_COLOR,
+    BoundingBoxRects,
+    ElementRect,
+    annotate_screenshot,
+    group_overlapping_rects,
+)
+
+
+def _rect(
+    element_id: str, left: float, top: float, right: float, bottom: float, interactable: bool = True
+) -> ElementRect:
+    return ElementRect(id=element_id, interactable=interactable, left=left, top=top, right=right, bottom=bottom)
+
+
+def test_group_overlapping_rects_groups_transitively() -> None:
+    rects = [
+        _rect("AAAa", 0, 0, 10, 10, interactable=False),
+        _rect("AAAb", 50, 50, 60, 60),
+        _rect("AAAc", 5, 5, 20, 20),
+        _rect("AAAd", 19, 19, 30, 30),
+        # touching the edge of AAAd is not overlapping
+        _rect("AAAe", 30, 0, 40, 10),
+    ]
+
+    groups = group_overlapping_rects(rects)
+
+    assert [[rect["id"] for rect in group.rects] for group in groups] == [["AAAa", "AAAc", "AAAd"], ["AAAb"], ["AAAe"]]
+    assert [group.label for group in groups] == ["AAAc", "AAAb", "AAAe"]
+    assert (groups[0].left, groups[0].top, groups[0].right, groups[0].bottom) == (0, 0, 30, 30)
+
+
+def test_annotate_screenshot_skips_groups_without_interactable_elements() -> None:
+    buffer = BytesIO()
+    Image.new("RGB", (200, 200), (255, 255, 255)).save(buffer, format="PNG")
+    bounding_boxes = BoundingBoxRects(
+        visibleHeight=100,
+        rects=[_rect("AAAb", 10, 10, 50, 50), _rect("AAAc", 60, 60, 90, 90, interactable=False)],
+    )
+
+    annotated = annotate_screenshot(buffer.getvalue(), bounding_boxes)
+
+    with Image.open(BytesIO(annotated)) as img:
+        # the rects are scaled by the device pixel ratio of the screenshot
+        assert img.getpixel((20, 99)) == BOUNDING_BOX_COLOR
+        assert img.getpixel((120, 179)) == (255, 255, 255)
@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
+from skyvern.forge.sdk.core.step_profiler import (
+    finish_step_profiler,
+    profile_phase,
+    start_step_profiler,
+    to_collapsed_stacks,
+)
+from skyvern.forge.sdk.models import Step, StepPhaseTiming, StepProfile, StepStatus
+
+
+def _build_step(profile: StepProfile | None) -> Step:
+    now = datetime.utcnow()
+    return Step(
+        created_at=now,
+        modified_at=now,
+        task_id="tsk_1",
+        step_id="stp_1",
+        status=StepStatus.completed,
+        order=2,
+        is_last=False,
+        retry_index=1,
+        organization_id="o_1",
+        profile=profile,
+    )
+
+
+@pytest.mark.asyncio
+async def test_phases_nest_by_the_call_stack_and_concurrent_tasks() -> None:
+    skyvern_context.set(SkyvernContext())
+    try:
+        start_step_profiler("stp_1")
+
+        async def scrape_frame() -> None:
+            with profile_phase("scrape_frame"):
+                await asyncio.sleep(0)
+
+        with profile_phase("scrape"):
+            await asyncio.gather(scrape_frame(), scrape_frame())
+        with profile_phase("llm"):
+            with profile_phase("request"):
+                pass
+
+        assert finish_step_profiler("other_step") is None
+        profile = finish_step_profiler("stp_1")
+        assert profile is not None
+        assert [phase.path for phase in profile.phases] == [
+            ["scrape"],
+            ["scrape", "scrape_frame"],
+            ["scrape", "scrape_frame"],
+            ["llm"],
+            ["llm", "request"],
+        ]
+        assert skyvern_context.ensure_context().step_profiler is None
+
+        # out of a profiled step, the phases are ignored
+        with profile_phase("scrape"):
+            pass
+        assert finish_step_profiler("stp_1") is None
+    finally:
+        skyvern_context.reset()
+
+
+def test_collapsed_stacks_merge_the_phases_by_path_with_self_time() -> None:
+    profile = StepProfile(
+        duration_ms=100,
+        phases=[
+            StepPhaseTiming(path=["action_0:click"], start_ms=0, duration_ms=30),
+            StepPhaseTiming(path=["action_0:click", "wait"], start_ms=10, duration_ms=10),
+            StepPhaseTiming(path=["llm"], start_ms=30, duration_ms=40),
+            StepPhaseTiming(path=["llm", "request"], start_ms=35, duration_ms=20),
+            StepPhaseTiming(path=["llm", "request"], start_ms=55, duration_ms=15),
+        ],
+    )
+    steps = [_build_step(profile), _build_step(None)]
+
+    assert to_collapsed_stacks(steps).splitlines() == [
+        "step_2_retry_1 30",
+        "step_2_retry_1;action_0:click 20",
+        "step_2_retry_1;action_0:click;wait 10",
+        "step_2_retry_1;llm 5",
+        "step_2_retry_1;llm;request 35",
+    ]
+    assert to_collapsed_stacks(steps, root_frame="tsk 1").splitlines()[0] == "tsk_1;step_2_retry_1 30"
+    assert to_collapsed_stacks([_build_step(None)]) == ""
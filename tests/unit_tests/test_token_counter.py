@@ -0,0 +1,63 @@
+import pytest
+
+from skyvern.utils import token_counter
+
+
+def _count_words(text: str) -> int:
+    return len(text.split())
+
+
+def _fail_to_count(text: str) -> int:
+    raise AssertionError("the text shouldn't be encoded")
+
+
+def test_count_tokens_cached_evicts_the_least_recently_used(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(token_counter, "count_tokens", _count_words)
+    monkeypatch.setattr(token_counter, "FRAGMENT_TOKENS_CACHE_SIZE", 2)
+    monkeypatch.setattr(token_counter, "_fragment_tokens_cache", token_counter.OrderedDict())
+    texts = ["<div> one </div>", "<div> two </div>", "<div> three </div>"]
+    keys = [(hash(text), len(text)) for text in texts]
+
+    assert token_counter.count_tokens_cached(texts[0]) == 3
+    token_counter.count_tokens_cached(texts[1])
+    # the hit makes the first text the most recently used, so the second one is evicted
+    monkeypatch.setattr(token_counter, "count_tokens", _fail_to_count)
+    assert token_counter.count_tokens_cached(texts[0]) == 3
+    monkeypatch.setattr(token_counter, "count_tokens", _count_words)
+    token_counter.count_tokens_cached(texts[2])
+
+    assert list(token_counter._fragment_tokens_cache) == [keys[0], keys[2]]
+
+
+def test_exceeds_token_limit_only_counts_the_texts_which_can_exceed_the_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(token_counter, "_fragment_tokens_cache", token_counter.OrderedDict())
+    max_tokens = 10
+
+    monkeypatch.setattr(token_counter, "count_tokens", _fail_to_count)
+    # a token is at least one byte
+    assert not token_counter.exceeds_token_limit("a" * max_tokens, max_tokens)
+    assert not token_counter.exceeds_token_limit("\u4e2d" * 3, max_tokens)
+
+    # dense texts are counted, whatever the chars per token estimate says
+    monkeypatch.setattr(token_counter, "count_tokens", len)
+    assert token_counter.exceeds_token_limit("\u4e2d" * (max_tokens + 1), max_tokens)
+    monkeypatch.setattr(token_counter, "count_tokens", lambda text: max_tokens)
+    assert not token_counter.exceeds_token_limit("a" * (max_tokens * 10), max_tokens)
+
+
+@pytest.mark.asyncio
+async def test_async_variants_match_the_sync_ones(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(token_counter, "count_tokens", _count_words)
+    monkeypatch.setattr(token_counter, "_fragment_tokens_cache", token_counter.OrderedDict())
+    long_text = "abc " * token_counter.ASYNC_COUNT_TOKENS_MIN_LENGTH
+    token_count = _count_words(long_text)
+    assert await token_counter.count_tokens_async(long_text) == token_count
+    assert await token_counter.count_tokens_async("hello world") == 2
+
+    assert await token_counter.exceeds_token_limit_async(long_text, token_count - 1)
+    assert not await token_counter.exceeds_token_limit_async(long_text, token_count)
+    assert await token_counter.exceeds_token_limit_async("hello world", 1)
+
+    # the text can't have more tokens than bytes, so it isn't counted
+    monkeypatch.setattr(token_counter, "count_tokens", _fail_to_count)
+    assert not await token_counter.exceeds_token_limit_async(long_text, len(long_text))